@@ -2,16 +2,61 @@
 """
 Database Schema Analysis Script
 Checks the current database structure and compares with application requirements
+
+Everything comes from information_schema in a handful of bulk queries, so
+the report takes about the same time on a 1k-row and a 100M-row database.
+Row counts are InnoDB's estimates unless --exact is given.
+
+    python analyze_database.py
+    python analyze_database.py --exact --workers 8          # COUNT(*) every table in parallel
+    python analyze_database.py --columns --integrity        # column listing, orphan row checks
+    python analyze_database.py --json schema.json --history schema_history.jsonl
 """
 
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
 import mysql.connector
 from mysql.connector import Error
-import os
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Required tables for the application
+REQUIRED_TABLES = [
+    'users',
+    'rooms',
+    'user_gaming_ids',
+    'user_gaming_id_stats',
+    'room_user_enrollments',
+    'room_gaming_ids',
+    'gaming_id_room_stats',
+    'room_team_enrollments',
+    'user_teams',
+    'transactions',
+    'withdrawals',
+    'room_winners',
+    'room_reward_settings',
+    'winner_selection_history',
+    'blocked_users',
+    'blocked_teams'
+]
+
+# (child table, column, parent table) pairs checked by --integrity
+RELATIONSHIPS = [
+    ('user_gaming_ids', 'user_id', 'users'),
+    ('room_user_enrollments', 'room_id', 'rooms'),
+    ('room_user_enrollments', 'user_id', 'users'),
+    ('room_gaming_ids', 'user_gaming_id', 'user_gaming_ids'),
+    ('transactions', 'user_id', 'users'),
+]
+
+
 def get_db_connection():
     """Create database connection"""
     try:
@@ -26,147 +71,347 @@ def get_db_connection():
         print(f"Error connecting to MySQL: {e}")
         return None
 
-def analyze_database_schema():
-    """Analyze current database schema"""
-    connection = get_db_connection()
-    if not connection:
-        print("❌ Could not connect to database")
-        return
-    
-    cursor = connection.cursor()
-    
+
+def load_catalog(cursor):
+    """Tables, columns and indexes of the current database in three queries"""
+    cursor.execute("""
+        SELECT TABLE_NAME, ENGINE, TABLE_ROWS, DATA_LENGTH, INDEX_LENGTH, AUTO_INCREMENT
+        FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'
+        ORDER BY TABLE_NAME
+    """)
+    tables = {
+        name: {
+            'engine': engine,
+            'rows_estimate': int(rows or 0),
+            'data_bytes': int(data or 0),
+            'index_bytes': int(index or 0),
+            'auto_increment': auto_increment,
+            'columns': [],
+            'indexes': {},
+        }
+        for name, engine, rows, data, index, auto_increment in cursor.fetchall()
+    }
+
+    cursor.execute("""
+        SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY, COLUMN_DEFAULT, EXTRA
+        FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, ORDINAL_POSITION
+    """)
+    for table, column, column_type, nullable, key, default, extra in cursor.fetchall():
+        if table in tables:
+            tables[table]['columns'].append({
+                'name': column, 'type': column_type, 'nullable': nullable == 'YES',
+                'key': key, 'default': default, 'extra': extra,
+            })
+
+    cursor.execute("""
+        SELECT TABLE_NAME, INDEX_NAME, NON_UNIQUE, SEQ_IN_INDEX, COLUMN_NAME, CARDINALITY
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+        ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+    """)
+    for table, index, non_unique, _, column, cardinality in cursor.fetchall():
+        if table in tables:
+            entry = tables[table]['indexes'].setdefault(index, {
+                'columns': [], 'unique': not int(non_unique), 'cardinality': None,
+            })
+            entry['columns'].append(column)
+            entry['cardinality'] = cardinality
+    return tables
+
+
+def load_foreign_keys(cursor):
+    """[(table, constraint, [columns], referenced table)]"""
+    cursor.execute("""
+        SELECT TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME, REFERENCED_TABLE_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = DATABASE() AND REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
+    """)
+    keys = {}
+    for table, constraint, column, referenced in cursor.fetchall():
+        keys.setdefault((table, constraint), ([], referenced))[0].append(column)
+    return [(table, constraint, columns, referenced)
+            for (table, constraint), (columns, referenced) in keys.items()]
+
+
+def exact_counts(tables, workers=4):
+    """SELECT COUNT(*) per table, several tables at a time on separate connections.
+    A table whose connection fails is counted as None (unavailable)."""
+    def count(table):
+        connection = get_db_connection()
+        if connection is None:
+            print(f"⚠️  No connection to count {table}; keeping its estimate")
+            return table, None
+        try:
+            cursor = connection.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM `{table}`")
+            return table, cursor.fetchone()[0]
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(count, tables))
+
+
+def find_duplicate_indexes(tables):
+    """Indexes made redundant by another index on the same table.
+
+    An index is redundant when its columns are a left prefix of another
+    index's columns (the longer one serves the same lookups) or identical to
+    them. A unique index also enforces a constraint, so it is only redundant
+    next to an identical unique index or PRIMARY; PRIMARY is never reported.
+    """
+    duplicates = []
+    for table, info in tables.items():
+        indexes = info['indexes']
+        for name, index in indexes.items():
+            if name == 'PRIMARY':
+                continue
+            for other_name, other in indexes.items():
+                columns, other_columns = index['columns'], other['columns']
+                if other_name == name or other_columns[:len(columns)] != columns:
+                    continue
+                if len(columns) == len(other_columns):
+                    # Of two identical indexes keep PRIMARY, then unique, then the first name
+                    redundant = (other_name == 'PRIMARY' or (other['unique'] and not index['unique'])
+                                 or (other['unique'] == index['unique'] and name > other_name))
+                else:
+                    redundant = not index['unique']
+                if not redundant:
+                    continue
+                duplicates.append({'table': table, 'index': name, 'columns': columns,
+                                   'covered_by': other_name, 'covered_columns': other_columns})
+                break
+    return duplicates
+
+
+def find_unused_indexes(cursor):
+    """Indexes with no reads since the server started (needs performance_schema)"""
     try:
-        print("🔍 ANALYZING DATABASE SCHEMA")
-        print("=" * 50)
-        
-        # Get all tables
-        cursor.execute("SHOW TABLES")
-        tables = cursor.fetchall()
-        
-        if not tables:
-            print("❌ No tables found in database!")
-            return
-        
-        print(f"📊 Found {len(tables)} tables:")
-        for table in tables:
-            print(f"  ✅ {table[0]}")
-        
-        print("\n" + "=" * 50)
-        
-        # Analyze each table structure
-        for table in tables:
-            table_name = table[0]
-            print(f"\n📋 Table: {table_name}")
+        cursor.execute("""
+            SELECT OBJECT_NAME, INDEX_NAME
+            FROM performance_schema.table_io_waits_summary_by_index_usage
+            WHERE OBJECT_SCHEMA = DATABASE()
+              AND INDEX_NAME IS NOT NULL AND INDEX_NAME <> 'PRIMARY'
+              AND COUNT_READ = 0
+            ORDER BY OBJECT_NAME, INDEX_NAME
+        """)
+        unused = [{'table': table, 'index': index} for table, index in cursor.fetchall()]
+        cursor.execute("SELECT VARIABLE_VALUE FROM performance_schema.global_status WHERE VARIABLE_NAME = 'Uptime'")
+        row = cursor.fetchone()
+        return unused, int(row[0]) if row else None
+    except Error:
+        return None, None
+
+
+def find_unindexed_foreign_keys(tables, foreign_keys):
+    """Foreign keys whose columns are not the left prefix of any index"""
+    missing = []
+    for table, constraint, columns, referenced in foreign_keys:
+        indexes = tables.get(table, {}).get('indexes', {})
+        if not any(index['columns'][:len(columns)] == columns for index in indexes.values()):
+            missing.append({'table': table, 'constraint': constraint, 'columns': columns,
+                            'references': referenced})
+    return missing
+
+
+def check_relationships(cursor, existing_tables):
+    """Count orphaned child rows (full scans; only with --integrity)"""
+    orphans = []
+    for child, column, parent in RELATIONSHIPS:
+        if child in existing_tables and parent in existing_tables:
+            cursor.execute(f"""
+                SELECT COUNT(*) FROM `{child}` c
+                LEFT JOIN `{parent}` p ON c.`{column}` = p.id
+                WHERE p.id IS NULL AND c.`{column}` IS NOT NULL
+            """)
+            orphans.append({'table': child, 'column': column, 'parent': parent,
+                            'orphans': cursor.fetchone()[0]})
+    return orphans
+
+
+def human_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def print_report(report, show_columns=False):
+    tables = report['tables']
+    print("🔍 ANALYZING DATABASE SCHEMA")
+    print("=" * 50)
+    if not tables:
+        print("❌ No tables found in database!")
+        return
+
+    exact = any('rows_exact' in info for info in tables.values())
+    print(f"📊 Found {len(tables)} tables ({'exact' if exact else 'estimated'} rows):")
+    print(f"  {'table':<30}{'rows':>14}{'data':>12}{'indexes':>12}{'#idx':>6}")
+    for name, info in tables.items():
+        rows = info.get('rows_exact', info['rows_estimate'])
+        prefix = '' if 'rows_exact' in info else '~'
+        print(f"  {name:<30}{prefix + format(rows, ','):>14}{human_bytes(info['data_bytes']):>12}"
+              f"{human_bytes(info['index_bytes']):>12}{len(info['indexes']):>6}")
+
+    if show_columns:
+        for name, info in tables.items():
+            print(f"\n📋 Table: {name}")
             print("-" * 30)
-            
-            # Get table structure
-            cursor.execute(f"DESCRIBE {table_name}")
-            columns = cursor.fetchall()
-            
             print("Columns:")
-            for col in columns:
-                field, type_info, null, key, default, extra = col
-                key_info = f" ({key})" if key else ""
-                null_info = "NULL" if null == "YES" else "NOT NULL"
-                default_info = f" DEFAULT {default}" if default else ""
-                extra_info = f" {extra}" if extra else ""
-                print(f"  - {field}: {type_info}{key_info} {null_info}{default_info}{extra_info}")
-            
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            count = cursor.fetchone()[0]
-            print(f"  📊 Rows: {count}")
-        
-        print("\n" + "=" * 50)
-        print("🔍 CHECKING FOR REQUIRED TABLES")
-        print("=" * 50)
-        
-        # Required tables for the application
-        required_tables = [
-            'users',
-            'rooms', 
-            'user_gaming_ids',
-            'user_gaming_id_stats',
-            'room_user_enrollments',
-            'room_gaming_ids',
-            'gaming_id_room_stats',
-            'room_team_enrollments',
-            'user_teams',
-            'transactions',
-            'withdrawals',
-            'room_winners',
-            'room_reward_settings',
-            'winner_selection_history',
-            'blocked_users',
-            'blocked_teams'
-        ]
-        
-        existing_tables = [table[0] for table in tables]
-        
-        missing_tables = []
-        for required in required_tables:
-            if required in existing_tables:
-                print(f"  ✅ {required}")
-            else:
-                print(f"  ❌ {required} - MISSING")
-                missing_tables.append(required)
-        
-        if missing_tables:
-            print(f"\n⚠️  MISSING TABLES: {len(missing_tables)}")
-            for table in missing_tables:
-                print(f"  - {table}")
-            print("\nYou need to run the complete database.sql file to create missing tables.")
-        else:
-            print("\n✅ All required tables are present!")
-        
+            for col in info['columns']:
+                key_info = f" ({col['key']})" if col['key'] else ""
+                null_info = "NULL" if col['nullable'] else "NOT NULL"
+                default_info = f" DEFAULT {col['default']}" if col['default'] else ""
+                extra_info = f" {col['extra']}" if col['extra'] else ""
+                print(f"  - {col['name']}: {col['type']}{key_info} {null_info}{default_info}{extra_info}")
+            print("Indexes:")
+            for index_name, index in info['indexes'].items():
+                unique = 'UNIQUE ' if index['unique'] else ''
+                print(f"  - {unique}{index_name} ({', '.join(index['columns'])})")
+
+    print("\n" + "=" * 50)
+    print("🔍 CHECKING FOR REQUIRED TABLES")
+    print("=" * 50)
+    for required in REQUIRED_TABLES:
+        print(f"  {'✅' if required not in report['missing_tables'] else '❌'} {required}"
+              f"{' - MISSING' if required in report['missing_tables'] else ''}")
+    if report['missing_tables']:
+        print(f"\n⚠️  MISSING TABLES: {len(report['missing_tables'])}")
+        print("\nRun `python migrate.py up` (or import complete_database_schema.sql) to create them.")
+    else:
+        print("\n✅ All required tables are present!")
+
+    print("\n" + "=" * 50)
+    print("🔍 INDEX COVERAGE")
+    print("=" * 50)
+    no_primary = [name for name, info in tables.items() if 'PRIMARY' not in info['indexes']]
+    for name in no_primary:
+        print(f"  ⚠️  {name} has no primary key")
+    for fk in report['unindexed_foreign_keys']:
+        print(f"  ⚠️  {fk['table']}.{','.join(fk['columns'])} → {fk['references']} has no index "
+              f"(every parent update/delete scans {fk['table']})")
+    if not no_primary and not report['unindexed_foreign_keys']:
+        print("  ✅ Every table has a primary key and every foreign key is indexed")
+
+    for dup in report['duplicate_indexes']:
+        print(f"  🔁 {dup['table']}.{dup['index']} ({', '.join(dup['columns'])}) is covered by "
+              f"{dup['covered_by']} ({', '.join(dup['covered_columns'])})")
+    if not report['duplicate_indexes']:
+        print("  ✅ No duplicate or prefix-redundant indexes")
+
+    unused = report['unused_indexes']
+    if unused is None:
+        print("  ℹ️  Unused index check skipped (performance_schema not available)")
+    else:
+        uptime = report.get('uptime_seconds')
+        since = f" in {uptime / 86400:.1f} days of uptime" if uptime else ""
+        for index in unused:
+            print(f"  💤 {index['table']}.{index['index']} has not been read{since}")
+        if not unused:
+            print(f"  ✅ Every index has been used{since}")
+
+    if report.get('orphans') is not None:
         print("\n" + "=" * 50)
         print("🔍 CHECKING CRITICAL RELATIONSHIPS")
         print("=" * 50)
-        
-        # Check foreign key relationships
-        if 'user_gaming_ids' in existing_tables and 'users' in existing_tables:
-            cursor.execute("""
-                SELECT COUNT(*) FROM user_gaming_ids ugi 
-                LEFT JOIN users u ON ugi.user_id = u.id 
-                WHERE u.id IS NULL
-            """)
-            orphaned_gaming_ids = cursor.fetchone()[0]
-            if orphaned_gaming_ids > 0:
-                print(f"  ⚠️  {orphaned_gaming_ids} orphaned gaming IDs (no matching user)")
+        for orphan in report['orphans']:
+            if orphan['orphans']:
+                print(f"  ⚠️  {orphan['orphans']} {orphan['table']} rows with no matching {orphan['parent']}")
             else:
-                print("  ✅ All gaming IDs have valid users")
-        
-        if 'room_user_enrollments' in existing_tables and 'rooms' in existing_tables:
-            cursor.execute("""
-                SELECT COUNT(*) FROM room_user_enrollments rue 
-                LEFT JOIN rooms r ON rue.room_id = r.id 
-                WHERE r.id IS NULL
-            """)
-            orphaned_enrollments = cursor.fetchone()[0]
-            if orphaned_enrollments > 0:
-                print(f"  ⚠️  {orphaned_enrollments} orphaned room enrollments")
-            else:
-                print("  ✅ All room enrollments have valid rooms")
-        
-        print("\n" + "=" * 50)
-        print("📊 DATA SUMMARY")
-        print("=" * 50)
-        
-        # Show data counts for important tables
-        summary_tables = ['users', 'rooms', 'user_gaming_ids', 'room_user_enrollments']
-        for table_name in summary_tables:
-            if table_name in existing_tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                count = cursor.fetchone()[0]
-                print(f"  {table_name}: {count} records")
-        
+                print(f"  ✅ All {orphan['table']}.{orphan['column']} values have a {orphan['parent']} row")
+
+
+def analyze_database_schema(exact=False, workers=4, integrity=False):
+    """Analyze current database schema; returns the report as a dict"""
+    connection = get_db_connection()
+    if not connection:
+        print("❌ Could not connect to database")
+        return None
+
+    cursor = connection.cursor()
+    started = time.time()
+    try:
+        tables = load_catalog(cursor)
+        foreign_keys = load_foreign_keys(cursor)
+        if exact:
+            for table, count in exact_counts(list(tables), workers).items():
+                if count is not None:
+                    tables[table]['rows_exact'] = count
+        unused, uptime = find_unused_indexes(cursor)
+        if unused is not None:
+            # Unique indexes enforce constraints even when no query reads them
+            unused = [index for index in unused
+                      if not tables.get(index['table'], {}).get('indexes', {}).get(index['index'], {}).get('unique')]
+
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'database': os.getenv('MYSQL_DB', 'gaming_platform'),
+            'tables': tables,
+            'missing_tables': [name for name in REQUIRED_TABLES if name not in tables],
+            'unindexed_foreign_keys': find_unindexed_foreign_keys(tables, foreign_keys),
+            'duplicate_indexes': find_duplicate_indexes(tables),
+            'unused_indexes': unused,
+            'uptime_seconds': uptime,
+            'orphans': check_relationships(cursor, tables) if integrity else None,
+        }
+        report['elapsed_seconds'] = round(time.time() - started, 2)
+        return report
     except Error as e:
         print(f"❌ Error analyzing database: {e}")
+        return None
     finally:
-        if connection.is_connected():
-            cursor.close()
-            connection.close()
-            print(f"\n🔌 Database connection closed")
+        cursor.close()
+        connection.close()
+
+
+def history_entry(report):
+    """One compact line per run for tracking growth over time"""
+    return {
+        'generated_at': report['generated_at'],
+        'database': report['database'],
+        'tables': {
+            name: {
+                'rows': info.get('rows_exact', info['rows_estimate']),
+                'data_bytes': info['data_bytes'],
+                'index_bytes': info['index_bytes'],
+            }
+            for name, info in report['tables'].items()
+        },
+        'duplicate_indexes': len(report['duplicate_indexes']),
+        'unused_indexes': None if report['unused_indexes'] is None else len(report['unused_indexes']),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read-only analysis of the database schema')
+    parser.add_argument('--exact', action='store_true', help='COUNT(*) every table instead of estimates')
+    parser.add_argument('--workers', type=int, default=4, help='parallel connections for --exact')
+    parser.add_argument('--columns', action='store_true', help='list columns and indexes per table')
+    parser.add_argument('--integrity', action='store_true', help='count orphaned rows (scans tables)')
+    parser.add_argument('--json', help='write the full report to this file')
+    parser.add_argument('--history', help='append a one-line summary to this JSON-lines file')
+    args = parser.parse_args()
+
+    report = analyze_database_schema(exact=args.exact, workers=args.workers, integrity=args.integrity)
+    if report is None:
+        raise SystemExit(1)
+    print_report(report, show_columns=args.columns)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\n💾 Report written to {args.json}")
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(history_entry(report), default=str) + '\n')
+        print(f"📈 Summary appended to {args.history}")
+    print(f"\n⏱️  Analysis took {report['elapsed_seconds']}s")
+
 
 if __name__ == "__main__":
-    analyze_database_schema()
\ No newline at end of file
+    main()
@@ -1,12 +1,27 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
-from flask_mysqldb import MySQL
+from flask import Flask, Response, g, render_template, request, redirect, url_for, session, flash, jsonify
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
 import os
-from datetime import datetime
 from functools import wraps
 from dotenv import load_dotenv
 import logging
+import refunds
+import app_logging
+import assets
+import compression
+import coin_feed
+import db_router
+import fragment_cache
+import http_cache
+import instrumentation
+import live_feed
+import migrate
+import room_feed
+import session_store
+import template_warmup
+import upload_storage
+import uploads
+from db_router import read_only
+from slow_query_log import slow_query_log
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,30 +42,128 @@ app.config['MYSQL_DB'] = os.getenv('MYSQL_DB', 'gaming_platform')
 # Production settings
 if os.getenv('FLASK_ENV') == 'production':
     app.config['DEBUG'] = False
-    # Set up logging for production
-    logging.basicConfig(level=logging.INFO)
 else:
     app.config['DEBUG'] = True
 
-mysql = MySQL(app)
+# Structured logging through a background queue, tagged with request IDs
+app_logging.init_app(app, production=not app.config['DEBUG'])
+log = app_logging.get_logger()
+enrollment_log = app_logging.get_logger('enrollments')
+
+# Read-only views may be served from MYSQL_REPLICA_HOSTS (see db_router.py)
+mysql = db_router.RoutedMySQL(app)
+db_router.init_app(app)
+
+# Count queries/rows per request and track endpoint latency percentiles
+instrumentation.init_app(app)
+
+# Sessions and cached user state live server-side (see session_store.py)
+app.config['SESSION_STORE'] = os.getenv('SESSION_STORE', 'file').lower()
+app.config['SESSION_FILE_DIR'] = os.getenv('SESSION_FILE_DIR', '')
+app.config['SESSION_REDIS_URL'] = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0')
+app.config['SESSION_TTL'] = int(os.getenv('SESSION_TTL', 604800))
+app.config['USER_STATE_TTL'] = int(os.getenv('USER_STATE_TTL', 60))
+session_store.init_app(app)
+
+# Refuse to serve against a schema that is behind migrations/ (SCHEMA_CHECK)
+migrate.check_app_schema(app)
+
+# Rendered template sections cached per worker by {% cache %} (see fragment_cache.py)
+app.config['FRAGMENT_CACHE_MAX_ENTRIES'] = int(os.getenv('FRAGMENT_CACHE_MAX_ENTRIES', 256))
+app.config['FRAGMENT_CACHE_MAX_BYTES'] = int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', 8388608))
+fragment_cache.init_app(app)
+
+# gzip/brotli for HTML and JSON responses (see compression.py)
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+app.config['COMPRESS_MIMETYPES'] = os.getenv('COMPRESS_MIMETYPES', '')
+app.config['COMPRESS_ALGORITHMS'] = os.getenv('COMPRESS_ALGORITHMS', 'br,gzip')
+app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', 6))
+compression.init_app(app)
+
+# Compiled templates are shared through a bytecode cache on disk (see template_warmup.py)
+app.config['JINJA_CACHE_DIR'] = os.getenv('JINJA_CACHE_DIR', '.jinja_cache')
+app.config['TEMPLATE_WARMUP'] = os.getenv('TEMPLATE_WARMUP', 'true').lower() == 'true'
+
+# Live coin balance and room occupancy streams (see live_feed.py)
+app.config['LIVE_STREAM_MAX_CLIENTS'] = int(os.getenv('LIVE_STREAM_MAX_CLIENTS', 2))
+app.config['LIVE_STREAM_MAX_SECONDS'] = int(os.getenv('LIVE_STREAM_MAX_SECONDS', 300))
 
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Uploads are served by /uploads/<name> to their owner and admins (see uploads.py)
+app.config['UPLOAD_SEND_MODE'] = os.getenv('UPLOAD_SEND_MODE', 'sendfile').lower()
+app.config['UPLOAD_ACCEL_PREFIX'] = os.getenv('UPLOAD_ACCEL_PREFIX', '/protected-uploads/')
+app.config['UPLOAD_MAX_AGE'] = int(os.getenv('UPLOAD_MAX_AGE', 86400))
+uploads.init_app(app)
+
+# Screenshots are stored by content hash, with reference counts (see upload_storage.py)
+app.config['UPLOAD_STORAGE'] = os.getenv('UPLOAD_STORAGE', 'local')
+upload_store = upload_storage.from_config(app.config)
+
 # Context processor to make user_coins available in all templates
-@app.context_processor
-def inject_user_coins():
-    if 'user_id' in session:
+def load_user_state(cur, user_id):
+    """Coins, admin flag and active gaming IDs of a user, or None if the user is gone"""
+    cur.execute("SELECT coins, is_admin FROM users WHERE id = %s", (user_id,))
+    user = cur.fetchone()
+    if not user:
+        return None
+    cur.execute("""
+        SELECT id, gaming_platform, gaming_username, display_name, is_primary
+        FROM user_gaming_ids
+        WHERE user_id = %s AND is_active = TRUE
+        ORDER BY is_primary DESC, gaming_platform, display_name
+    """, (user_id,))
+    return {
+        'coins': user[0],
+        'is_admin': bool(user[1]),
+        'gaming_ids': [list(row) for row in cur.fetchall()],
+    }
+
+def current_user_state():
+    """The logged-in user's state, from the session store when cached (see session_store.py)"""
+    if 'user_state' in g:
+        return g.user_state
+    user_id = session['user_id']
+    state = session_store.users.get(user_id)
+    if state is None:
         cur = mysql.connection.cursor()
         try:
-            cur.execute("SELECT coins FROM users WHERE id = %s", (session['user_id'],))
-            result = cur.fetchone()
-            user_coins = result[0] if result else 0
-        except:
-            user_coins = 0
+            state = load_user_state(cur, user_id)
         finally:
             cur.close()
-        return {'user_coins': user_coins}
+        # A lagging replica must not fill the cache every worker reads from
+        if state is not None and g.get('db_route') != 'replica':
+            session_store.users.put(user_id, state)
+    g.user_state = state
+    return state
+
+def refresh_user_state(*user_ids):
+    """Write-through after a commit that changed these users' coins or gaming IDs"""
+    g.pop('user_state', None)
+    cur = mysql.connection.cursor()
+    try:
+        for user_id in user_ids:
+            state = load_user_state(cur, user_id)
+            if state is None:
+                session_store.users.invalidate(user_id)
+            else:
+                session_store.users.put(user_id, state)
+    except Exception as e:
+        # The change is committed; a stale entry must not outlive it
+        log.warning("Could not refresh cached user state, dropping it: %s", e)
+        session_store.users.invalidate(*user_ids)
+    finally:
+        cur.close()
+
+@app.context_processor
+def inject_user_coins():
+    if 'user_id' in session:
+        try:
+            state = current_user_state()
+        except Exception:
+            state = None
+        return {'user_coins': state['coins'] if state else 0}
     return {'user_coins': 0}
 
 # Login required decorator
@@ -67,7 +180,8 @@ def login_required(f):
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session or not session.get('is_admin'):
+        # The cached flag, so a revoked admin loses access within USER_STATE_TTL
+        if 'user_id' not in session or not (current_user_state() or {}).get('is_admin'):
             flash('Admin access required', 'danger')
             return redirect(url_for('home'))
         return f(*args, **kwargs)
@@ -141,10 +255,14 @@ def login():
         cur.close()
         
         if user and user[2] == password:
-            print(user)
+            log.info("User logged in", extra={'user_id': user[0], 'is_admin': bool(user[3])})
+            # A new session id at login, so one planted before it is useless
+            session.clear()
+            session.rotate()
             session['user_id'] = user[0]
             session['username'] = user[1]
             session['is_admin'] = user[3]
+            refresh_user_state(user[0])
             flash('Login successful!', 'success')
             if user[3]:
                 return redirect(url_for('admin_dashboard'))
@@ -162,6 +280,7 @@ def logout():
 
 @app.route('/home')
 @login_required
+@read_only
 def home():
     cur = mysql.connection.cursor()
     # Temporary fix - use old query structure until new tables are created
@@ -178,15 +297,13 @@ def home():
         ORDER BY r.created_at DESC
     """)
     rooms = cur.fetchall()
-    
-    cur.execute("SELECT coins FROM users WHERE id = %s", (session['user_id'],))
-    user_coins = cur.fetchone()[0]
     cur.close()
     
-    return render_template('home.html', rooms=rooms, user_coins=user_coins)
+    return render_template('home.html', rooms=rooms, user_coins=current_user_state()['coins'])
 
 @app.route('/room/<int:room_id>', methods=['GET', 'POST'])
 @login_required
+@read_only
 def room_details(room_id):
     cur = mysql.connection.cursor()
     
@@ -195,7 +312,7 @@ def room_details(room_id):
         cur.execute("SELECT * FROM rooms WHERE id = %s", (room_id,))
         room = cur.fetchone()
     except Exception as e:
-        print(f"Error in room details query: {e}")
+        log.warning("Room details query failed for room %s: %s", room_id, e)
         room = None
     
     if not room:
@@ -210,16 +327,10 @@ def room_details(room_id):
     
     user_already_enrolled = cur.fetchone()[0] > 0
     
-    # Get user's active gaming IDs count
-    cur.execute("""
-        SELECT COUNT(*) FROM user_gaming_ids
-        WHERE user_id = %s AND is_active = TRUE
-    """, (session['user_id'],))
-    user_gaming_ids_count = cur.fetchone()[0]
-    
-    # Get user coins
-    cur.execute("SELECT coins FROM users WHERE id = %s", (session['user_id'],))
-    user_coins = cur.fetchone()[0]
+    # User's coins and active gaming IDs, usually from the session store
+    user_state = current_user_state()
+    user_gaming_ids_count = len(user_state['gaming_ids'])
+    user_coins = user_state['coins']
     
     # Check if user is blocked from this room
     cur.execute("SELECT id FROM blocked_users WHERE room_id = %s AND user_id = %s", (room_id, session['user_id']))
@@ -241,8 +352,35 @@ def room_details(room_id):
                          user_is_blocked=user_is_blocked, user_already_enrolled=user_already_enrolled,
                          user_gaming_ids_count=user_gaming_ids_count)
 
+@app.route('/api/room/<int:room_id>/occupancy/stream')
+@login_required
+def room_occupancy_stream(room_id):
+    """Server-Sent Events: the room's player and slot counts, then every change (see room_feed.py)"""
+    cur = mysql.connection.cursor()
+    try:
+        occupancy = room_feed.load_occupancy(cur, [room_id]).get(room_id)
+    finally:
+        cur.close()
+    if occupancy is None:
+        return jsonify({'error': 'Room not found'}), 404
+
+    return live_stream_response(room_feed.room_stream(occupancy, app.config))
+
+@app.route('/api/rooms/occupancy/stream')
+@login_required
+def lobby_occupancy_stream():
+    """Server-Sent Events: player and slot counts of every open room, then every change"""
+    cur = mysql.connection.cursor()
+    try:
+        rooms = room_feed.load_occupancy(cur)
+    finally:
+        cur.close()
+
+    return live_stream_response(room_feed.lobby_stream(rooms, app.config))
+
 @app.route('/room/<int:room_id>/enrollments')
 @login_required
+@read_only
 def room_enrollments(room_id):
     cur = mysql.connection.cursor()
     
@@ -268,7 +406,7 @@ def room_enrollments(room_id):
     cur.execute("""
         SELECT rte.id, ut.team_name, ut.team_email, u.username as leader, 
                rte.total_entry_fee, rte.enrolled_at as created_at, rte.payment_status,
-               COUNT(utm.id) as member_count
+               COUNT(utm.id) as member_count, ut.id as user_team_id
         FROM room_team_enrollments rte
         JOIN user_teams ut ON rte.user_team_id = ut.id
         JOIN users u ON ut.user_id = u.id
@@ -284,48 +422,46 @@ def room_enrollments(room_id):
     total_players_teams = sum(team[7] for team in team_enrollments if team[6] == 'paid')
     total_players = total_players_gaming_ids + total_players_teams
     
-    # Get team members for old team enrollments
-    team_members = {}
-    for team in team_enrollments:
-        cur.execute("SELECT user_team_id FROM room_team_enrollments WHERE id = %s", (team[0],))
-        user_team_result = cur.fetchone()
-        if user_team_result:
-            user_team_id = user_team_result[0]
-            cur.execute("""
-                SELECT utm.member_username, utm.gaming_id, utm.joined_at
-                FROM user_team_members utm
-                WHERE utm.user_team_id = %s
-                ORDER BY utm.joined_at ASC
-            """, (user_team_id,))
-            team_members[team[0]] = cur.fetchall()
-    
-    # Get detailed gaming IDs for each enrollment
-    gaming_id_details = {}
-    for enrollment in gaming_id_enrollments:
-        cur.execute("""
-            SELECT ug.gaming_platform, ug.gaming_username, ug.display_name, rg.kills_count, rg.reward_earned, rg.status
+    # Get team members for old team enrollments (one query for all teams)
+    team_members = {team[0]: [] for team in team_enrollments}
+    if team_enrollments:
+        enrollment_by_team = {team[8]: team[0] for team in team_enrollments}
+        placeholders = ', '.join(['%s'] * len(enrollment_by_team))
+        cur.execute(f"""
+            SELECT utm.user_team_id, utm.member_username, utm.gaming_id, utm.joined_at
+            FROM user_team_members utm
+            WHERE utm.user_team_id IN ({placeholders})
+            ORDER BY utm.joined_at ASC
+        """, tuple(enrollment_by_team))
+        for member in cur.fetchall():
+            team_members[enrollment_by_team[member[0]]].append(member[1:])
+    
+    # Get detailed gaming IDs for all enrollments (one query)
+    gaming_id_details = {enrollment[0]: [] for enrollment in gaming_id_enrollments}
+    if gaming_id_enrollments:
+        placeholders = ', '.join(['%s'] * len(gaming_id_details))
+        cur.execute(f"""
+            SELECT rg.room_user_enrollment_id, ug.gaming_platform, ug.gaming_username, ug.display_name,
+                   rg.kills_count, rg.reward_earned, rg.status
             FROM room_gaming_ids rg
             JOIN user_gaming_ids ug ON rg.user_gaming_id = ug.id
-            WHERE rg.room_user_enrollment_id = %s
+            WHERE rg.room_user_enrollment_id IN ({placeholders})
             ORDER BY ug.gaming_platform, ug.display_name
-        """, (enrollment[0],))
-        gaming_id_details[enrollment[0]] = cur.fetchall()
-    
-    # Print debug info
-    print(f"=== UPDATED ROOM ENROLLMENTS DEBUG ===")
-    print(f"Room ID: {room_id}")
-    print(f"Room Name: {room[1] if room else 'Unknown'}")
-    print(f"Gaming ID Enrollments: {len(gaming_id_enrollments)}")
-    print(f"Team Enrollments: {len(team_enrollments)}")
-    print(f"Total Players (Gaming IDs): {total_players_gaming_ids}")
-    print(f"Total Players (Teams): {total_players_teams}")
-    print(f"Total Players (Combined): {total_players}")
-    print(f"Max Players: {room[5] if room else 'Unknown'}")
-    print("=== Gaming ID Enrollments ===")
-    for i, enrollment in enumerate(gaming_id_enrollments, 1):
-        status = "✅ Paid" if enrollment[6] == 'paid' else "⚠️ Pending"
-        print(f"Enrollment {i}: {enrollment[2]} - {enrollment[3]} gaming IDs ({status})")
-    print("===============================")
+        """, tuple(gaming_id_details))
+        for detail in cur.fetchall():
+            gaming_id_details[detail[0]].append(detail[1:])
+    
+    # Debug summary (sampled via LOG_DEBUG_SAMPLE_RATE)
+    if enrollment_log.isEnabledFor(logging.DEBUG):
+        enrollment_log.debug("Room enrollments loaded", extra={
+            'room_id': room_id,
+            'gaming_id_enrollments': len(gaming_id_enrollments),
+            'team_enrollments': len(team_enrollments),
+            'players_gaming_ids': total_players_gaming_ids,
+            'players_teams': total_players_teams,
+            'players_total': total_players,
+            'max_players': room[5] if room else None,
+        })
     
     cur.close()
     
@@ -341,6 +477,7 @@ def room_enrollments(room_id):
 
 @app.route('/profile')
 @login_required
+@read_only
 def profile():
     cur = mysql.connection.cursor()
     
@@ -364,6 +501,7 @@ def profile():
 
 @app.route('/my_teams')
 @login_required
+@read_only
 def my_teams():
     cur = mysql.connection.cursor()
     
@@ -379,16 +517,18 @@ def my_teams():
     """, (session['user_id'],))
     teams = cur.fetchall()
     
-    # Get team members for each team
-    team_members = {}
-    for team in teams:
-        cur.execute("""
-            SELECT member_username, gaming_id, email, is_leader
+    # Get team members for all teams in one query
+    team_members = {team[0]: [] for team in teams}
+    if teams:
+        placeholders = ', '.join(['%s'] * len(team_members))
+        cur.execute(f"""
+            SELECT user_team_id, member_username, gaming_id, email, is_leader
             FROM user_team_members
-            WHERE user_team_id = %s
+            WHERE user_team_id IN ({placeholders})
             ORDER BY is_leader DESC, member_username ASC
-        """, (team[0],))
-        team_members[team[0]] = cur.fetchall()
+        """, tuple(team_members))
+        for member in cur.fetchall():
+            team_members[member[0]].append(member[1:])
     
     cur.close()
     
@@ -562,11 +702,8 @@ def add_coins():
         return redirect(url_for('profile'))
     
     try:
-        # Save screenshot with unique filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = secure_filename(f"payment_{session['user_id']}_{timestamp}_{file.filename}")
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        # Stored by content hash; an identical screenshot is kept once
+        filename = upload_store.save(file.stream, upload_storage.extension_of(file.filename))
         
         cur = mysql.connection.cursor()
         try:
@@ -575,14 +712,14 @@ def add_coins():
                 INSERT INTO transactions (user_id, type, amount, payment_screenshot, status)
                 VALUES (%s, 'credit_pending', %s, %s, 'pending')
             """, (session['user_id'], amount, filename))
+            upload_storage.add_ref(cur, filename)
             
+            fragment_cache.bump(cur, 'finance')
             mysql.connection.commit()
             flash(f'Payment screenshot uploaded! Your request for {amount} coins is pending admin approval.', 'info')
         except Exception as e:
+            # The unreferenced file is removed by `upload_storage.py cleanup`
             mysql.connection.rollback()
-            # Delete uploaded file if database insert fails
-            if os.path.exists(file_path):
-                os.remove(file_path)
             flash(f'Failed to submit payment request: {str(e)}', 'danger')
         finally:
             cur.close()
@@ -592,14 +729,65 @@ def add_coins():
     
     return redirect(url_for('profile'))
 
+@app.route('/uploads/<path:filename>')
+@login_required
+@read_only
+def uploaded_file(filename):
+    """A payment or kill screenshot, for its owner and admins (see uploads.py)"""
+    if not (current_user_state() or {}).get('is_admin'):
+        cur = mysql.connection.cursor()
+        try:
+            allowed = uploads.can_view(cur, filename, session['user_id'])
+        finally:
+            cur.close()
+        if not allowed:
+            # Same answer as a missing file, so upload names can't be probed
+            return 'Not Found', 404
+    return uploads.send_upload(filename)
+
 @app.route('/api/user_coins')
 @login_required
+@read_only
 def get_user_coins():
+    try:
+        return jsonify({'coins': current_user_state()['coins']})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/user_coins/stream')
+@login_required
+def user_coins_stream():
+    """Server-Sent Events: the current balance, then every change (see coin_feed.py)"""
     cur = mysql.connection.cursor()
-    cur.execute("SELECT coins FROM users WHERE id = %s", (session['user_id'],))
-    user_coins = cur.fetchone()[0]
-    cur.close()
-    return jsonify({'coins': user_coins})
+    try:
+        # Read from the primary so the first event is never older than the feed
+        cur.execute("SELECT coins FROM users WHERE id = %s", (session['user_id'],))
+        coins = cur.fetchone()[0]
+    finally:
+        cur.close()
+
+    return live_stream_response(coin_feed.event_stream(session['user_id'], coins, app.config))
+
+def live_stream_busy():
+    return Response('Too many live streams, retry later', status=503, headers={'Retry-After': '30'})
+
+def live_stream_response(stream):
+    """The text/event-stream response for a live_feed stream, or 503 if this worker has no free slot.
+
+    The slot is reserved here, after the view's own queries, so no early
+    return can leak it, and released when the server closes the response,
+    which it does even if the client left before the stream started. When
+    busy the page falls back to what it did before (refreshing on focus).
+    """
+    if not live_feed.reserve_slot(app.config):
+        stream.close()
+        return live_stream_busy()
+    # Not wrapped in stream_with_context: the request's DB connection is released
+    # at teardown instead of being held for the life of the stream
+    response = Response(stream, mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(live_feed.release_slot)
+    return response
 
 
 
@@ -629,7 +817,10 @@ def withdraw():
             INSERT INTO withdrawals (user_id, amount, gpay_number, status)
             VALUES (%s, %s, %s, 'pending')
         """, (session['user_id'], amount, gpay_number))
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        refresh_user_state(session['user_id'])
         flash('Withdrawal request submitted!', 'success')
     except Exception as e:
         mysql.connection.rollback()
@@ -639,8 +830,120 @@ def withdraw():
     
     return redirect(url_for('profile'))
 
+def load_financial_stats():
+    """Financial overview of the admin dashboard; queried once per request, and
+    only when one of its fragment-cached sections missed"""
+    if 'financial_stats' not in g:
+        g.financial_stats = query_financial_stats()
+    return g.financial_stats
+
+def query_financial_stats():
+    cur = mysql.connection.cursor()
+    try:
+        # Get financial statistics
+        # 1. Total money collected from room enrollments
+        cur.execute("""
+            SELECT COALESCE(SUM(total_entry_fee), 0) as total_collected
+            FROM room_team_enrollments 
+            WHERE payment_status = 'paid'
+        """)
+        total_collected = cur.fetchone()[0]
+
+        # 2. Total player coins across all users
+        cur.execute("SELECT COALESCE(SUM(coins), 0) as total_player_coins FROM users")
+        total_player_coins = cur.fetchone()[0]
+
+        # 3. Withdrawal statistics
+        cur.execute("""
+            SELECT 
+                COUNT(*) as total_requests,
+                COALESCE(SUM(amount), 0) as total_amount_requested,
+                COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending_count,
+                COALESCE(SUM(CASE WHEN status = 'pending' THEN amount END), 0) as pending_amount,
+                COUNT(CASE WHEN status = 'approved' THEN 1 END) as approved_count,
+                COALESCE(SUM(CASE WHEN status = 'approved' THEN amount END), 0) as approved_amount,
+                COUNT(CASE WHEN status = 'rejected' THEN 1 END) as rejected_count,
+                COALESCE(SUM(CASE WHEN status = 'rejected' THEN amount END), 0) as rejected_amount
+            FROM withdrawals
+        """)
+        withdrawal_stats = cur.fetchone()
+
+        # 4. Room enrollment statistics
+        cur.execute("""
+            SELECT 
+                COUNT(DISTINCT r.id) as total_rooms,
+                COUNT(rte.id) as total_enrollments,
+                COUNT(CASE WHEN rte.payment_status = 'paid' THEN 1 END) as paid_enrollments,
+                COUNT(CASE WHEN rte.payment_status = 'pending' THEN 1 END) as pending_enrollments
+            FROM rooms r
+            LEFT JOIN room_team_enrollments rte ON r.id = rte.room_id
+        """)
+        enrollment_stats = cur.fetchone()
+
+        # 5. Recent transactions summary
+        cur.execute("""
+            SELECT 
+                COUNT(CASE WHEN type = 'credit' THEN 1 END) as total_credits,
+                COALESCE(SUM(CASE WHEN type = 'credit' THEN amount END), 0) as total_credit_amount,
+                COUNT(CASE WHEN type = 'debit' THEN 1 END) as total_debits,
+                COALESCE(SUM(CASE WHEN type = 'debit' THEN amount END), 0) as total_debit_amount
+            FROM transactions
+        """)
+        transaction_stats = cur.fetchone()
+
+        # Compile financial data
+        financial_stats = {
+            'total_collected': total_collected,
+            'total_player_coins': total_player_coins,
+            'withdrawal_stats': {
+                'total_requests': withdrawal_stats[0],
+                'total_amount_requested': withdrawal_stats[1],
+                'pending_count': withdrawal_stats[2],
+                'pending_amount': withdrawal_stats[3],
+                'approved_count': withdrawal_stats[4],
+                'approved_amount': withdrawal_stats[5],
+                'rejected_count': withdrawal_stats[6],
+                'rejected_amount': withdrawal_stats[7]
+            },
+            'enrollment_stats': {
+                'total_rooms': enrollment_stats[0],
+                'total_enrollments': enrollment_stats[1],
+                'paid_enrollments': enrollment_stats[2],
+                'pending_enrollments': enrollment_stats[3]
+            },
+            'transaction_stats': {
+                'total_credits': transaction_stats[0],
+                'total_credit_amount': transaction_stats[1],
+                'total_debits': transaction_stats[2],
+                'total_debit_amount': transaction_stats[3]
+            }
+        }
+
+        # 6. Top performing rooms by revenue
+        cur.execute("""
+            SELECT 
+                r.room_name,
+                r.game_type,
+                COUNT(rte.id) as total_enrollments,
+                COUNT(CASE WHEN rte.payment_status = 'paid' THEN 1 END) as paid_enrollments,
+                COALESCE(SUM(CASE WHEN rte.payment_status = 'paid' THEN rte.total_entry_fee END), 0) as total_revenue
+            FROM rooms r
+            LEFT JOIN room_team_enrollments rte ON r.id = rte.room_id
+            GROUP BY r.id, r.room_name, r.game_type
+            HAVING total_revenue > 0
+            ORDER BY total_revenue DESC
+            LIMIT 5
+        """)
+        top_rooms = cur.fetchall()
+
+        financial_stats['top_rooms'] = top_rooms
+        return financial_stats
+    finally:
+        cur.close()
+
 @app.route('/admin')
 @admin_required
+@read_only
 def admin_dashboard():
     cur = mysql.connection.cursor()
     
@@ -664,104 +967,11 @@ def admin_dashboard():
     """)
     processed_withdrawals = cur.fetchall()
     
-    # Get financial statistics
-    # 1. Total money collected from room enrollments
-    cur.execute("""
-        SELECT COALESCE(SUM(total_entry_fee), 0) as total_collected
-        FROM room_team_enrollments 
-        WHERE payment_status = 'paid'
-    """)
-    total_collected = cur.fetchone()[0]
-    
-    # 2. Total player coins across all users
-    cur.execute("SELECT COALESCE(SUM(coins), 0) as total_player_coins FROM users")
-    total_player_coins = cur.fetchone()[0]
-    
-    # 3. Withdrawal statistics
-    cur.execute("""
-        SELECT 
-            COUNT(*) as total_requests,
-            COALESCE(SUM(amount), 0) as total_amount_requested,
-            COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending_count,
-            COALESCE(SUM(CASE WHEN status = 'pending' THEN amount END), 0) as pending_amount,
-            COUNT(CASE WHEN status = 'approved' THEN 1 END) as approved_count,
-            COALESCE(SUM(CASE WHEN status = 'approved' THEN amount END), 0) as approved_amount,
-            COUNT(CASE WHEN status = 'rejected' THEN 1 END) as rejected_count,
-            COALESCE(SUM(CASE WHEN status = 'rejected' THEN amount END), 0) as rejected_amount
-        FROM withdrawals
-    """)
-    withdrawal_stats = cur.fetchone()
-    
-    # 4. Room enrollment statistics
-    cur.execute("""
-        SELECT 
-            COUNT(DISTINCT r.id) as total_rooms,
-            COUNT(rte.id) as total_enrollments,
-            COUNT(CASE WHEN rte.payment_status = 'paid' THEN 1 END) as paid_enrollments,
-            COUNT(CASE WHEN rte.payment_status = 'pending' THEN 1 END) as pending_enrollments
-        FROM rooms r
-        LEFT JOIN room_team_enrollments rte ON r.id = rte.room_id
-    """)
-    enrollment_stats = cur.fetchone()
-    
-    # 5. Recent transactions summary
-    cur.execute("""
-        SELECT 
-            COUNT(CASE WHEN type = 'credit' THEN 1 END) as total_credits,
-            COALESCE(SUM(CASE WHEN type = 'credit' THEN amount END), 0) as total_credit_amount,
-            COUNT(CASE WHEN type = 'debit' THEN 1 END) as total_debits,
-            COALESCE(SUM(CASE WHEN type = 'debit' THEN amount END), 0) as total_debit_amount
-        FROM transactions
-    """)
-    transaction_stats = cur.fetchone()
-    
-    # Compile financial data
-    financial_stats = {
-        'total_collected': total_collected,
-        'total_player_coins': total_player_coins,
-        'withdrawal_stats': {
-            'total_requests': withdrawal_stats[0],
-            'total_amount_requested': withdrawal_stats[1],
-            'pending_count': withdrawal_stats[2],
-            'pending_amount': withdrawal_stats[3],
-            'approved_count': withdrawal_stats[4],
-            'approved_amount': withdrawal_stats[5],
-            'rejected_count': withdrawal_stats[6],
-            'rejected_amount': withdrawal_stats[7]
-        },
-        'enrollment_stats': {
-            'total_rooms': enrollment_stats[0],
-            'total_enrollments': enrollment_stats[1],
-            'paid_enrollments': enrollment_stats[2],
-            'pending_enrollments': enrollment_stats[3]
-        },
-        'transaction_stats': {
-            'total_credits': transaction_stats[0],
-            'total_credit_amount': transaction_stats[1],
-            'total_debits': transaction_stats[2],
-            'total_debit_amount': transaction_stats[3]
-        }
-    }
-    
-    # 6. Top performing rooms by revenue
-    cur.execute("""
-        SELECT 
-            r.room_name,
-            r.game_type,
-            COUNT(rte.id) as total_enrollments,
-            COUNT(CASE WHEN rte.payment_status = 'paid' THEN 1 END) as paid_enrollments,
-            COALESCE(SUM(CASE WHEN rte.payment_status = 'paid' THEN rte.total_entry_fee END), 0) as total_revenue
-        FROM rooms r
-        LEFT JOIN room_team_enrollments rte ON r.id = rte.room_id
-        GROUP BY r.id, r.room_name, r.game_type
-        HAVING total_revenue > 0
-        ORDER BY total_revenue DESC
-        LIMIT 5
-    """)
-    top_rooms = cur.fetchall()
-    
-    financial_stats['top_rooms'] = top_rooms
-    
+    # The financial overview is a fragment-cached section of the template:
+    # its aggregates only run when a view changed rooms, coins, withdrawals,
+    # transactions or team enrollments since (see fragment_cache.py)
+    dashboard_snapshot = fragment_cache.versions(cur, 'rooms', 'finance')
+
     # Get pending payment requests
     cur.execute("""
         SELECT t.id, u.username, t.amount, t.payment_screenshot, t.created_at
@@ -778,84 +988,42 @@ def admin_dashboard():
                          pending_withdrawals=pending_withdrawals, 
                          processed_withdrawals=processed_withdrawals, 
                          pending_payments=pending_payments,
-                         financial_stats=financial_stats)
+                         dashboard_snapshot=dashboard_snapshot,
+                         load_financial_stats=load_financial_stats)
+
+def load_rooms():
+    """Every room for the admin rooms page, queried once per request on a fragment cache miss"""
+    if 'admin_rooms' not in g:
+        cur = mysql.connection.cursor()
+        try:
+            # Column order is fixed; migrate.py guarantees every column exists
+            cur.execute("""
+                SELECT id, room_name, game_type, entry_fee, prize_pool, max_players,
+                       room_id_game, room_password, event_timing, is_multiplayer,
+                       min_team_size, max_team_size, status, kill_rewards_enabled, is_active
+                FROM rooms ORDER BY created_at DESC
+            """)
+            g.admin_rooms = cur.fetchall()
+        finally:
+            cur.close()
+    return g.admin_rooms
 
 @app.route('/admin/rooms')
 @admin_required
+@read_only
 def admin_rooms():
     cur = mysql.connection.cursor()
     
-    # Get rooms with consistent column order regardless of schema
-    try:
-        # Check what columns exist
-        cur.execute("SHOW COLUMNS FROM rooms")
-        columns = [col[0] for col in cur.fetchall()]
-        
-        # Build query based on available columns
-        base_columns = ['id', 'room_name', 'game_type', 'entry_fee', 'prize_pool', 'max_players', 'room_id_game', 'room_password']
-        optional_columns = []
-        
-        if 'event_timing' in columns:
-            optional_columns.append('event_timing')
-        else:
-            optional_columns.append('created_at as event_timing')
-            
-        if 'is_multiplayer' in columns:
-            optional_columns.append('is_multiplayer')
-        else:
-            optional_columns.append('1 as is_multiplayer')
-            
-        if 'min_team_size' in columns:
-            optional_columns.append('min_team_size')
-        else:
-            optional_columns.append('1 as min_team_size')
-            
-        if 'max_team_size' in columns:
-            optional_columns.append('max_team_size')
-        else:
-            optional_columns.append('4 as max_team_size')
-            
-        if 'status' in columns:
-            optional_columns.append('status')
-        else:
-            optional_columns.append("'open' as status")
-            
-        if 'kill_rewards_enabled' in columns:
-            optional_columns.append('kill_rewards_enabled')
-        else:
-            optional_columns.append('0 as kill_rewards_enabled')
-        
-        if 'is_active' in columns:
-            optional_columns.append('is_active')
-        else:
-            optional_columns.append('1 as is_active')
-        
-        # Create the final query
-        all_columns = base_columns + optional_columns
-        query = f"SELECT {', '.join(all_columns)} FROM rooms ORDER BY created_at DESC"
-        
-        cur.execute(query)
-        rooms = cur.fetchall()
-        
-    except Exception as e:
-        print(f"Error in admin rooms query: {e}")
-        # Ultimate fallback
-        cur.execute("""
-            SELECT id, room_name, game_type, entry_fee, prize_pool, max_players, 
-                   room_id_game, room_password, 
-                   COALESCE(created_at, NOW()) as event_timing,
-                   1 as is_multiplayer, 1 as min_team_size, 4 as max_team_size,
-                   'open' as status, 0 as kill_rewards_enabled, 1 as is_active
-            FROM rooms ORDER BY created_at DESC
-        """)
-        rooms = cur.fetchall()
-    
+    # The room stats and table are fragment-cached until a view adds, changes
+    # or cancels a room; only then is the full list read (see fragment_cache.py)
+    rooms_version = fragment_cache.versions(cur, 'rooms')
     cur.close()
-    
-    return render_template('admin_rooms.html', rooms=rooms)
+
+    return render_template('admin_rooms.html', rooms_version=rooms_version, load_rooms=load_rooms)
 
 @app.route('/admin/debug_rooms')
 @admin_required
+@read_only
 def debug_rooms():
     cur = mysql.connection.cursor()
     
@@ -877,22 +1045,56 @@ def debug_rooms():
     
     return jsonify(debug_info)
 
+@app.route('/admin/metrics')
+@admin_required
+def admin_metrics():
+    """Per-endpoint latency percentiles and query counts for this worker"""
+    return jsonify(instrumentation.registry.snapshot())
+
+@app.route('/admin/slow_queries', methods=['GET', 'POST'])
+@admin_required
+def admin_slow_queries():
+    """Slow statements seen by this worker with their captured EXPLAIN plans"""
+    if request.method == 'POST':
+        slow_query_log.clear()
+        flash('Slow query log cleared', 'success')
+        return redirect(url_for('admin_slow_queries'))
+
+    if request.args.get('format') == 'json':
+        return jsonify({'threshold_ms': slow_query_log.threshold_ms, 'queries': slow_query_log.entries()})
+
+    return render_template('admin_slow_queries.html', queries=slow_query_log.entries(),
+                           threshold_ms=slow_query_log.threshold_ms, worker_pid=os.getpid())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus exposition; needs METRICS_TOKEN as a bearer token or an admin session"""
+    token = os.getenv('METRICS_TOKEN')
+    authorized = bool(token) and request.headers.get('Authorization') == f'Bearer {token}'
+    if not authorized and not ('user_id' in session and (current_user_state() or {}).get('is_admin')):
+        return 'Forbidden', 403
+    return instrumentation.prometheus_text(), 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
 @app.route('/admin/approve_withdrawal/<int:withdrawal_id>', methods=['POST'])
 @admin_required
 def approve_withdrawal(withdrawal_id):
     screenshot = request.files.get('screenshot')
     
     if screenshot:
-        filename = secure_filename(f"{withdrawal_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png")
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        screenshot.save(filepath)
+        filename = upload_store.save(screenshot.stream, 'png')
         
         cur = mysql.connection.cursor()
+        cur.execute("SELECT payment_screenshot FROM withdrawals WHERE id = %s FOR UPDATE", (withdrawal_id,))
+        previous = cur.fetchone()
         cur.execute("""
             UPDATE withdrawals 
             SET status = 'approved', payment_screenshot = %s, processed_at = NOW()
             WHERE id = %s
         """, (filename, withdrawal_id))
+        if previous:
+            upload_storage.release(cur, previous[0])
+            upload_storage.add_ref(cur, filename)
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
         cur.close()
         
@@ -933,7 +1135,10 @@ def reject_withdrawal(withdrawal_id):
             VALUES (%s, 'credit', %s, %s)
         """, (user_id, amount, f'Withdrawal rejection refund - ID: {withdrawal_id}'))
         
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        refresh_user_state(user_id)
         flash('Withdrawal rejected and money returned to user!', 'success')
         
     except Exception as e:
@@ -965,7 +1170,10 @@ def approve_payment(transaction_id):
         # Update transaction status
         cur.execute("UPDATE transactions SET status = 'approved', type = 'credit' WHERE id = %s", (transaction_id,))
         
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        refresh_user_state(user_id)
         flash(f'Payment approved! {amount} coins added to user account.', 'success')
         
     except Exception as e:
@@ -987,6 +1195,7 @@ def reject_payment(transaction_id):
         if cur.rowcount == 0:
             flash('Transaction not found or already processed', 'danger')
         else:
+            fragment_cache.bump(cur, 'finance')
             mysql.connection.commit()
             flash('Payment rejected!', 'success')
         
@@ -1074,42 +1283,15 @@ def create_room():
     
     cur = mysql.connection.cursor()
     try:
-        # Check if new columns exist in rooms table
-        cur.execute("SHOW COLUMNS FROM rooms LIKE 'event_timing'")
-        has_new_columns = cur.fetchone() is not None
-        
-        if has_new_columns:
-            # Check if kill reward columns exist
-            cur.execute("SHOW COLUMNS FROM rooms LIKE 'enable_kill_rewards'")
-            has_kill_columns = cur.fetchone() is not None
-            
-            if has_kill_columns:
-                # Use full new schema with kill rewards
-                cur.execute("""
-                    INSERT INTO rooms (room_name, game_type, entry_fee, prize_pool, max_players, 
-                                     min_players_to_start, room_id_game, room_password, event_timing, 
-                                     is_multiplayer, min_team_size, max_team_size, kill_rewards_enabled, 
-                                     min_kills_required, reward_per_kill, is_active, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'open')
-                """, (room_name, game_type, entry_fee, prize_pool, max_players, min_players_to_start,
-                      room_id_game, room_password, event_timing, is_multiplayer, min_team_size, max_team_size,
-                      enable_kill_rewards, min_kills_required, reward_per_kill, is_active))
-            else:
-                # Use schema without kill rewards
-                cur.execute("""
-                    INSERT INTO rooms (room_name, game_type, entry_fee, prize_pool, max_players, 
-                                     min_players_to_start, room_id_game, room_password, event_timing, 
-                                     is_multiplayer, min_team_size, max_team_size, is_active, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'open')
-                """, (room_name, game_type, entry_fee, prize_pool, max_players, min_players_to_start,
-                      room_id_game, room_password, event_timing, is_multiplayer, min_team_size, max_team_size, is_active))
-        else:
-            # Use old schema
-            cur.execute("""
-                INSERT INTO rooms (room_name, game_type, entry_fee, prize_pool, max_players, 
-                                 room_id_game, room_password, is_active, status)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'open')
-            """, (room_name, game_type, entry_fee, prize_pool, max_players, room_id_game, room_password, is_active))
+        cur.execute("""
+            INSERT INTO rooms (room_name, game_type, entry_fee, prize_pool, max_players, 
+                             min_players_to_start, room_id_game, room_password, event_timing, 
+                             is_multiplayer, min_team_size, max_team_size, kill_rewards_enabled, 
+                             min_kills_required, reward_per_kill, is_active, status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'open')
+        """, (room_name, game_type, entry_fee, prize_pool, max_players, min_players_to_start,
+              room_id_game, room_password, event_timing, is_multiplayer, min_team_size, max_team_size,
+              enable_kill_rewards, min_kills_required, reward_per_kill, is_active))
         
         # Get the created room ID
         room_id = cur.lastrowid
@@ -1157,7 +1339,7 @@ def create_room():
                         """, (room_id, user_id, session['user_id'], block_reason or f'Pre-blocked during room creation'))
                         blocked_count += 1
                 except Exception as block_error:
-                    print(f"Error blocking user {username}: {block_error}")
+                    log.warning("Could not pre-block user %s: %s", username, block_error)
             
             if blocked_count > 0:
                 flash(f'Room created successfully! {blocked_count} users were pre-blocked.', 'success')
@@ -1166,12 +1348,13 @@ def create_room():
         else:
             flash('Room created successfully!', 'success')
         
+        fragment_cache.bump(cur, 'rooms')
         mysql.connection.commit()
         
     except Exception as e:
         mysql.connection.rollback()
         flash(f'Room creation failed: {str(e)}', 'danger')
-        print(f"Room creation error: {e}")  # For debugging
+        log.exception("Room creation failed")
     finally:
         cur.close()
     
@@ -1278,7 +1461,10 @@ def create_team(room_id):
                     VALUES (%s, %s, %s)
                 """, (team_id, user_id, pubg_username_id))
         
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        refresh_user_state(session['user_id'])
         flash('Team created and enrolled successfully!', 'success')
         return redirect(url_for('room_enrollments', room_id=room_id))
         
@@ -1291,6 +1477,7 @@ def create_team(room_id):
 
 @app.route('/admin/room/<int:room_id>/kills')
 @admin_required
+@read_only
 def manage_kills(room_id):
     cur = mysql.connection.cursor()
     
@@ -1341,7 +1528,7 @@ def record_kills(room_id):
     try:
         # Get room kill reward settings
         cur.execute("""
-            SELECT enable_kill_rewards, min_kills_required, reward_per_kill 
+            SELECT kill_rewards_enabled, min_kills_required, reward_per_kill 
             FROM rooms WHERE id = %s
         """, (room_id,))
         room_settings = cur.fetchone()
@@ -1361,9 +1548,14 @@ def record_kills(room_id):
         # Handle screenshot upload
         screenshot_filename = None
         if screenshot:
-            screenshot_filename = secure_filename(f"kills_{room_id}_{user_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png")
-            screenshot_path = os.path.join(app.config['UPLOAD_FOLDER'], screenshot_filename)
-            screenshot.save(screenshot_path)
+            screenshot_filename = upload_store.save(screenshot.stream, 'png')
+        
+        # The screenshot this record replaces loses its reference
+        cur.execute("""
+            SELECT screenshot_proof FROM gaming_id_room_stats
+            WHERE user_gaming_id = %s AND room_id = %s FOR UPDATE
+        """, (gaming_id, room_id))
+        previous = cur.fetchone()
         
         # Update gaming_id_room_stats for gaming ID system
         cur.execute("""
@@ -1375,6 +1567,9 @@ def record_kills(room_id):
             recorded_by = %s, recorded_at = NOW()
         """, (gaming_id, room_id, kills_count, reward_earned, screenshot_filename, 
               session['user_id'], kills_count, reward_earned, screenshot_filename, session['user_id']))
+        if previous:
+            upload_storage.release(cur, previous[0])
+        upload_storage.add_ref(cur, screenshot_filename)
         
         # Add reward to user's coins if applicable
         if reward_earned > 0:
@@ -1386,7 +1581,11 @@ def record_kills(room_id):
                 VALUES (%s, 'kill_reward', %s, %s)
             """, (user_id, int(reward_earned), f"room_{room_id}_gaming_id_kills_{kills_count}"))
         
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        if reward_earned > 0:
+            refresh_user_state(user_id)
         flash(f'Kill record updated! Reward: {reward_earned} Rs', 'success')
         
     except Exception as e:
@@ -1465,13 +1664,10 @@ def enroll_team(room_id):
         current_total_players = cur.fetchone()[0]
         
         # Check if adding this team would exceed max players
-        print(f"=== TEAM ENROLLMENT VALIDATION ===")
-        print(f"Room ID: {room_id}")
-        print(f"Room Max Players: {max_players}")
-        print(f"Current Total Players: {current_total_players}")
-        print(f"Team Size to Add: {team_size}")
-        print(f"Total After Adding: {current_total_players + team_size}")
-        print("===============================")
+        enrollment_log.debug("Team enrollment capacity check", extra={
+            'room_id': room_id, 'max_players': max_players,
+            'current_players': current_total_players, 'team_size': team_size,
+        })
         
         if current_total_players + team_size > max_players:
             remaining_slots = max_players - current_total_players
@@ -1507,7 +1703,10 @@ def enroll_team(room_id):
             VALUES (%s, %s, %s, %s, 'paid')
         """, (room_id, user_team_id, session['user_id'], total_entry_fee))
         
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        refresh_user_state(session['user_id'])
         flash('Team enrolled successfully!', 'success')
         return redirect(url_for('room_enrollments', room_id=room_id))
         
@@ -1519,21 +1718,47 @@ def enroll_team(room_id):
         cur.close()
 
 # API Routes
-@app.route('/api/user_coins')
-@login_required
-def api_user_coins():
+def fetch_version(query, params):
+    """One row of aggregates that changes whenever an API payload would (see http_cache.py)"""
     cur = mysql.connection.cursor()
     try:
-        cur.execute("SELECT coins FROM users WHERE id = %s", (session['user_id'],))
-        coins = cur.fetchone()[0]
-        return jsonify({'coins': coins})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        cur.execute(query, params)
+        return cur.fetchone()
     finally:
         cur.close()
 
+def room_teams_version(room_id):
+    # Teams are only ever deactivated, and edits bump updated_at
+    return fetch_version("""
+        SELECT (SELECT CONCAT_WS(':', COUNT(*), MAX(id), MAX(updated_at)) FROM user_teams),
+               (SELECT CONCAT_WS(':', COUNT(*), MAX(id)) FROM room_team_enrollments WHERE room_id = %s)
+    """, (room_id,))
+
+def room_blocked_version(room_id):
+    # Blocks are inserted and deleted, never updated
+    return fetch_version("""
+        SELECT (SELECT CONCAT_WS(':', COUNT(*), MAX(id)) FROM blocked_users WHERE room_id = %s),
+               (SELECT CONCAT_WS(':', COUNT(*), MAX(id)) FROM blocked_teams WHERE room_id = %s)
+    """, (room_id, room_id))
+
+def room_gaming_ids_version(room_id):
+    # gaming_id_room_stats has no updated_at and sums miss kills moved between
+    # gaming IDs (5/3 -> 3/5), so its rows are checksummed one by one
+    return fetch_version("""
+        SELECT (SELECT CONCAT_WS(':', COUNT(*), MAX(updated_at))
+                FROM room_user_enrollments WHERE room_id = %s),
+               (SELECT CONCAT_WS(':', COUNT(*), BIT_XOR(rg.id), MAX(ug.updated_at))
+                FROM room_gaming_ids rg JOIN user_gaming_ids ug ON rg.user_gaming_id = ug.id
+                WHERE rg.room_id = %s),
+               (SELECT CONCAT_WS(':', COUNT(*),
+                                 BIT_XOR(CRC32(CONCAT_WS(':', user_gaming_id, kills_count, reward_earned))))
+                FROM gaming_id_room_stats WHERE room_id = %s)
+    """, (room_id, room_id, room_id))
+
 @app.route('/api/room/<int:room_id>/teams')
 @admin_required
+@read_only
+@http_cache.conditional(room_teams_version)
 def api_room_teams(room_id):
     cur = mysql.connection.cursor()
     try:
@@ -1559,13 +1784,14 @@ def api_room_teams(room_id):
         
         return jsonify({'teams': teams})
     except Exception as e:
-        print(f"API teams error: {e}")  # Debug logging
+        log.exception("API teams lookup failed for room %s", room_id)
         return jsonify({'error': str(e)}), 500
     finally:
         cur.close()
 
 @app.route('/api/users/suggestions')
 @admin_required
+@read_only
 def api_user_suggestions():
     cur = mysql.connection.cursor()
     try:
@@ -1580,6 +1806,8 @@ def api_user_suggestions():
 
 @app.route('/api/room/<int:room_id>/blocked_users')
 @admin_required
+@read_only
+@http_cache.conditional(room_blocked_version)
 def api_room_blocked_users(room_id):
     cur = mysql.connection.cursor()
     try:
@@ -1626,6 +1854,56 @@ def api_room_blocked_users(room_id):
     finally:
         cur.close()
 
+@app.route('/api/room/<int:room_id>/gaming_ids_enrollments')
+@login_required
+@read_only
+@http_cache.conditional(room_gaming_ids_version)
+def get_room_gaming_ids_enrollments(room_id):
+    """API endpoint to get room enrollments with gaming IDs"""
+    cur = mysql.connection.cursor()
+    try:
+        cur.execute("""
+            SELECT rue.id, rue.user_id, u.username, rue.gaming_ids_count,
+                   rue.total_entry_fee, rue.created_at,
+                   GROUP_CONCAT(CONCAT(ug.display_name, ' (', ug.gaming_platform, ')')
+                                ORDER BY rg.id SEPARATOR ', ') as gaming_ids,
+                   GROUP_CONCAT(COALESCE(gs.kills_count, 0) ORDER BY rg.id SEPARATOR ', ') as kills_list,
+                   SUM(gs.reward_earned) as total_rewards
+            FROM room_user_enrollments rue
+            JOIN users u ON rue.user_id = u.id
+            LEFT JOIN room_gaming_ids rg ON rue.id = rg.room_user_enrollment_id
+            LEFT JOIN user_gaming_ids ug ON rg.user_gaming_id = ug.id
+            LEFT JOIN gaming_id_room_stats gs ON gs.user_gaming_id = rg.user_gaming_id
+                                             AND gs.room_id = rue.room_id
+            WHERE rue.room_id = %s AND rue.payment_status = 'paid' AND rue.is_active = TRUE
+            GROUP BY rue.id, rue.user_id, u.username, rue.gaming_ids_count, rue.total_entry_fee,
+                     rue.created_at
+            ORDER BY rue.created_at ASC
+        """, (room_id,))
+
+        enrollments = cur.fetchall()
+        return jsonify({
+            'success': True,
+            'enrollments': [
+                {
+                    'id': e[0],
+                    'user_id': e[1],
+                    'username': e[2],
+                    'gaming_ids_count': e[3],
+                    'total_entry_fee': e[4],
+                    'enrolled_at': e[5].isoformat() if e[5] else None,
+                    'gaming_ids': e[6] or '',
+                    'kills_list': e[7] or '',
+                    'total_rewards': float(e[8] or 0)
+                }
+                for e in enrollments
+            ]
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    finally:
+        cur.close()
+
 # Room Controls Routes
 @app.route('/admin/toggle_room/<int:room_id>', methods=['POST'])
 @admin_required
@@ -1646,6 +1924,7 @@ def toggle_room(room_id):
         
         # Update room status
         cur.execute("UPDATE rooms SET is_active = %s WHERE id = %s", (new_status, room_id))
+        fragment_cache.bump(cur, 'rooms')
         mysql.connection.commit()
         
         flash(f'Room "{room_name}" has been {status_text}', 'success')
@@ -1654,9 +1933,28 @@ def toggle_room(room_id):
         flash(f'Failed to toggle room status: {str(e)}', 'danger')
     finally:
         cur.close()
-    
+
     return redirect(url_for('admin_dashboard'))
 
+@app.route('/admin/cancel_room/<int:room_id>', methods=['POST'])
+@admin_required
+def cancel_room(room_id):
+    """Cancel a room and refund every paid enrollment back to the players"""
+    try:
+        refunds.cancel_room(mysql.connection, room_id)
+        summary = refunds.refund_cancelled_room(mysql.connection, room_id)
+        live_feed.notify_changed()
+        session_store.users.invalidate(*refunds.room_payers(mysql.connection, room_id))
+        flash(f"Room cancelled! Refunded {summary['coins_refunded']} coins to "
+              f"{summary['user_enrollments']} player and {summary['team_enrollments']} team enrollments.",
+              'success')
+    except refunds.RefundError as e:
+        flash(str(e), 'danger')
+    except Exception as e:
+        flash(f'Refund failed, run it again to resume: {str(e)}', 'danger')
+
+    return redirect(url_for('admin_rooms'))
+
 @app.route('/admin/block_user', methods=['POST'])
 @admin_required
 def block_user():
@@ -1804,6 +2102,7 @@ def unblock_team():
 # Gaming IDs Management Routes
 @app.route('/my_gaming_ids')
 @login_required
+@read_only
 def my_gaming_ids():
     """Display user's gaming IDs management page"""
     cur = mysql.connection.cursor()
@@ -1878,6 +2177,7 @@ def add_gaming_id():
             """, (gaming_id,))
             
             mysql.connection.commit()
+            refresh_user_state(session['user_id'])
             flash(f'Gaming ID "{display_name}" added successfully!', 'success')
             return redirect(url_for('my_gaming_ids'))
             
@@ -1931,6 +2231,7 @@ def edit_gaming_id(gaming_id):
             """, (gaming_platform, gaming_username, display_name, is_primary, is_active, gaming_id))
             
             mysql.connection.commit()
+            refresh_user_state(session['user_id'])
             flash('Gaming ID updated successfully!', 'success')
             return redirect(url_for('my_gaming_ids'))
             
@@ -1972,6 +2273,7 @@ def set_primary_gaming_id(gaming_id):
         """, (gaming_id,))
         
         mysql.connection.commit()
+        refresh_user_state(session['user_id'])
         return jsonify({'success': True, 'message': 'Primary gaming ID updated'})
         
     except Exception as e:
@@ -1987,6 +2289,17 @@ def join_room_with_gaming_ids(room_id):
     cur = mysql.connection.cursor()
     
     try:
+        if request.method == 'POST':
+            # Joins to one room run one at a time: the room row stays locked
+            # until this request commits or rolls back, so the slot count and
+            # the gaming ID checks below see every earlier join. The unique
+            # keys on room_gaming_ids only cover the same user_gaming_ids row;
+            # the same platform + username under another account is only
+            # caught here. Committing first ends any read snapshot an earlier
+            # query in this request opened, so the checks read after the lock.
+            mysql.connection.commit()
+            cur.execute("SELECT id FROM rooms WHERE id = %s FOR UPDATE", (room_id,))
+
         # Get room details
         cur.execute("SELECT * FROM rooms WHERE id = %s", (room_id,))
         room = cur.fetchone()
@@ -2162,9 +2475,9 @@ def join_room_with_gaming_ids(room_id):
                 # Add selected gaming IDs
                 for gaming_id in selected_gaming_ids:
                     cur.execute("""
-                        INSERT INTO room_gaming_ids (room_user_enrollment_id, user_gaming_id)
-                        VALUES (%s, %s)
-                    """, (enrollment_id, int(gaming_id)))
+                        INSERT INTO room_gaming_ids (room_id, room_user_enrollment_id, user_gaming_id)
+                        VALUES (%s, %s, %s)
+                    """, (room_id, enrollment_id, int(gaming_id)))
                 
                 # Update gaming ID stats
                 for gaming_id in selected_gaming_ids:
@@ -2174,7 +2487,10 @@ def join_room_with_gaming_ids(room_id):
                         WHERE user_gaming_id = %s
                     """, (int(gaming_id),))
                 
+                fragment_cache.bump(cur, 'finance')
                 mysql.connection.commit()
+                live_feed.notify_changed()
+                refresh_user_state(session['user_id'])
                 flash(f'Successfully joined the tournament with {len(selected_gaming_ids)} gaming IDs!', 'success')
                 return redirect(url_for('room_details', room_id=room_id))
                 
@@ -2198,6 +2514,7 @@ def join_room_with_gaming_ids(room_id):
 
 @app.route('/admin/winners')
 @admin_required
+@read_only
 def manage_winners():
     """Admin interface to view and manage winners for all rooms"""
     cur = mysql.connection.cursor()
@@ -2228,8 +2545,19 @@ def manage_winners():
     finally:
         cur.close()
 
+def default_reward_settings(entry_fee, total_players):
+    """Fallback (position, base_reward, kill_bonus_per_kill, max_kill_bonus) rows for rooms created without any"""
+    entry_fee = float(entry_fee) if entry_fee is not None else 0
+    total_prize_pool = total_players * entry_fee * 0.8 if total_players > 0 else 1000
+    return [
+        (1, total_prize_pool * 0.50, 5.0, 100.0),   # 1st: 50%
+        (2, total_prize_pool * 0.30, 3.0, 75.0),    # 2nd: 30%
+        (3, total_prize_pool * 0.20, 2.0, 50.0),    # 3rd: 20%
+    ]
+
 @app.route('/admin/winners/room/<int:room_id>')
 @admin_required
+@read_only
 def room_winner_selection(room_id):
     """Admin interface to select winners for a specific room"""
     cur = mysql.connection.cursor()
@@ -2271,29 +2599,11 @@ def room_winner_selection(room_id):
         """, (room_id,))
         reward_settings = cur.fetchall()
         
-        # If no reward settings exist, this means it's an old room - create basic defaults
+        # If no reward settings exist, this means it's an old room - show basic
+        # defaults; this page may read from a replica, so select_winner saves them
         if not reward_settings:
             flash('This room was created without reward settings. Please contact admin to configure rewards.', 'warning')
-            # Create minimal default settings as fallback
-            total_players = len(players)
-            entry_fee = float(room[3]) if room[3] is not None else 0
-            total_prize_pool = total_players * entry_fee * 0.8 if total_players > 0 else 1000
-            
-            default_rewards = [
-                (1, total_prize_pool * 0.50, 5.0, 100.0),   # 1st: 50%
-                (2, total_prize_pool * 0.30, 3.0, 75.0),    # 2nd: 30%
-                (3, total_prize_pool * 0.20, 2.0, 50.0),    # 3rd: 20%
-            ]
-            
-            for position, base_reward, kill_bonus, max_kill_bonus in default_rewards:
-                cur.execute("""
-                    INSERT INTO room_reward_settings 
-                    (room_id, position, base_reward, kill_bonus_per_kill, max_kill_bonus)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (room_id, position, base_reward, kill_bonus, max_kill_bonus))
-            
-            mysql.connection.commit()
-            reward_settings = default_rewards
+            reward_settings = default_reward_settings(room[3], len(players))
         
         return render_template('admin_room_winners.html', 
                              room=room, players=players, reward_settings=reward_settings)
@@ -2332,6 +2642,29 @@ def select_winner():
         """, (room_id, position))
         reward_setting = cur.fetchone()
         
+        if not reward_setting:
+            # An old room without any settings: save the defaults the selection page showed
+            cur.execute("SELECT COUNT(*) FROM room_reward_settings WHERE room_id = %s", (room_id,))
+            if not cur.fetchone()[0]:
+                cur.execute("""
+                    SELECT r.entry_fee, COUNT(rgi.id)
+                    FROM rooms r
+                    LEFT JOIN room_user_enrollments rue ON rue.room_id = r.id AND rue.payment_status = 'paid'
+                    LEFT JOIN room_gaming_ids rgi ON rgi.room_user_enrollment_id = rue.id
+                    WHERE r.id = %s
+                    GROUP BY r.id, r.entry_fee
+                """, (room_id,))
+                room = cur.fetchone()
+                if room:
+                    for setting in default_reward_settings(room[0], room[1]):
+                        cur.execute("""
+                            INSERT INTO room_reward_settings 
+                            (room_id, position, base_reward, kill_bonus_per_kill, max_kill_bonus)
+                            VALUES (%s, %s, %s, %s, %s)
+                        """, (room_id,) + setting)
+                        if setting[0] == position:
+                            reward_setting = setting[1:]
+        
         if not reward_setting:
             flash('Reward settings not found for this position', 'danger')
             return redirect(url_for('room_winner_selection', room_id=room_id))
@@ -2451,7 +2784,10 @@ def distribute_rewards(room_id):
             total_distributed += reward_amount
             distributed_count += 1
         
+        fragment_cache.bump(cur, 'finance')
         mysql.connection.commit()
+        live_feed.notify_changed()
+        refresh_user_state(*{winner[4] for winner in winners})
         flash(f'Successfully distributed {total_distributed:.2f} coins to {distributed_count} winners!', 'success')
         
         return redirect(url_for('room_winner_selection', room_id=room_id))
@@ -2465,6 +2801,7 @@ def distribute_rewards(room_id):
 
 @app.route('/admin/winner_history/<int:room_id>')
 @admin_required
+@read_only
 def winner_history(room_id):
     """View winner selection and reward distribution history for a room"""
     cur = mysql.connection.cursor()
@@ -2498,6 +2835,13 @@ def winner_history(room_id):
     finally:
         cur.close()
 
+# Fingerprinted static assets, if built (see assets.py)
+assets.init_app(app)
+
+# Compile every template now rather than on the first request; last, so any
+# filter or extension the templates use is registered
+template_warmup.init_app(app)
+
 if __name__ == '__main__':
     # Get port from environment variable or default to 5000
     port = int(os.getenv('PORT', 5000))
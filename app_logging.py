@@ -0,0 +1,199 @@
+"""
+Application Logging
+Structured, request-aware logging that never writes on the request thread.
+
+Records are tagged with the current request ID, passed through an optional
+debug sampler and put on an in-memory queue; a QueueListener thread does
+the formatting and the actual stdout I/O.
+
+Environment:
+  LOG_LEVEL              root level for the app loggers (default INFO, DEBUG outside production)
+  LOG_LEVELS             per-logger overrides, e.g. "gaming_platform.enrollments=DEBUG,gaming_platform.db=WARNING"
+  LOG_FORMAT             "json" (default in production) or "text"
+  LOG_DEBUG_SAMPLE_RATE  fraction of DEBUG records that are kept (default 1.0)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from flask import g, has_request_context, request
+
+APP_LOGGER = 'gaming_platform'
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id', 'taskName'}
+
+_listener = None
+_production = False
+
+
+def get_logger(name=None):
+    """Logger under the application namespace, e.g. get_logger('enrollments')"""
+    return logging.getLogger(f'{APP_LOGGER}.{name}' if name else APP_LOGGER)
+
+
+def current_request_id():
+    if has_request_context():
+        return g.get('request_id', '-')
+    return '-'
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the ID of the request that produced it"""
+
+    def filter(self, record):
+        record.request_id = current_request_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every record above DEBUG and only a fraction of DEBUG records"""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with any `extra=` fields merged in"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with `extra=` fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        extras = [f'{key}={value}' for key, value in vars(record).items() if key not in _RECORD_ATTRS]
+        return f"{line} {' '.join(extras)}" if extras else line
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock handler renders the message before queueing it; here the record
+    is only shallow-copied, so `%s` arguments are interpolated on the listener.
+    Callers should pass immutable values (ids, counts, strings) as arguments.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        if record.exc_info and not record.exc_text:
+            # Tracebacks reference live frames; render them before they unwind
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, level = item.partition('=')
+        if level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging(production=False):
+    """Install the queue handler on the app logger tree and start the listener"""
+    global _listener, _production
+    if _listener is not None:
+        return
+
+    _production = production
+    default_level = 'INFO' if production else 'DEBUG'
+    log_format = os.getenv('LOG_FORMAT', 'json' if production else 'text')
+    sample_rate = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', 1.0))
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(sample_rate))
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.handlers[:] = [queue_handler]
+    app_logger.propagate = False
+    app_logger.setLevel(os.getenv('LOG_LEVEL', default_level).upper())
+
+    for name, level in _parse_levels(os.getenv('LOG_LEVELS', '')).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued records; safe to call more than once"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def reinit_after_fork():
+    """Start a new queue and listener in a forked worker (threads do not survive fork).
+
+    Does nothing if the master never configured logging: the worker then
+    configures it when it imports the app, with the app's settings.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener = None
+    configure_logging(_production)
+
+
+def _assign_request_id():
+    incoming = request.headers.get(REQUEST_ID_HEADER, '')
+    g.request_id = incoming[:64] if incoming else uuid.uuid4().hex[:16]
+
+
+def _echo_request_id(response):
+    if 'request_id' in g:
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
+
+
+def init_app(app, production=False):
+    """Configure logging and give every request an ID (echoed in X-Request-ID)"""
+    configure_logging(production)
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Static Assets
+Builds the site's CSS and JS into fingerprinted, minified, pre-compressed
+files that browsers cache for a year, so a repeat page load only transfers
+the HTML.
+
+Sources live in static/src/ (css/, js/ and the vendored Bootstrap in
+vendor/). A build writes static/dist/:
+
+    css/login.3f2a9c1e.css      minified, name carries a hash of the content
+    css/login.3f2a9c1e.css.gz   gzip -9
+    css/login.3f2a9c1e.css.br   brotli, when the brotli package is installed
+    manifest.json               'css/login.css' -> 'css/login.3f2a9c1e.css'
+
+    python assets.py vendor     download Bootstrap into static/src/vendor/
+                                (pinned version, checked against its SRI hash)
+    python assets.py build      minify, fingerprint and compress into static/dist/
+
+Templates link assets with {{ asset_url('css/login.css') }} and
+{{ vendor_asset('bootstrap.min.css') }}. With a manifest these point at
+/assets/<fingerprinted name>, served with the best encoding the browser
+accepts and Cache-Control immutable; a changed file gets a new name, so
+nothing is ever stale. Without a build (local development) they point at
+the unminified sources in static/src/, and Bootstrap comes from the CDN.
+
+rcssmin and rjsmin are used for minification when installed; otherwise
+comments and whitespace are stripped conservatively.
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+import urllib.request
+
+from flask import abort, request, send_from_directory, url_for
+from markupsafe import Markup
+
+import app_logging
+
+log = app_logging.get_logger('assets')
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(ROOT, 'static', 'src')
+DIST_DIR = os.path.join(ROOT, 'static', 'dist')
+MANIFEST = 'manifest.json'
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+BOOTSTRAP_VERSION = '5.3.0'
+VENDOR = {
+    'bootstrap.min.css': {
+        'url': f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/css/bootstrap.min.css',
+        'integrity': 'sha384-9ndCyUaIbzAi2FUVXJi0CjmCapSmO7SnpJef0486qhLnuZ2cdeRhO02iuK6FUUVM',
+    },
+    'bootstrap.bundle.min.js': {
+        'url': f'https://cdn.jsdelivr.net/npm/bootstrap@{BOOTSTRAP_VERSION}/dist/js/bootstrap.bundle.min.js',
+        'integrity': 'sha384-geWF76RCwLtnZ8qwWowPQNguL3RmwHVBC9FhGdlKrxdiJJigb/j/68SIy3Te4Bkz',
+    },
+}
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Encodings we pre-compress to, best first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+# --- Building ---
+
+def _strip_css(text):
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\s*([{};,>])\s*', r'\1', text)
+    return text.replace(';}', '}').strip()
+
+
+def _strip_js(text):
+    # Without a real tokenizer comments can't be told apart from strings and
+    # regexes, so only indentation and blank lines go
+    lines = (line.strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def minify(name, text):
+    if name.endswith('.min.css') or name.endswith('.min.js'):
+        return text
+    if name.endswith('.css'):
+        try:
+            import rcssmin
+            return rcssmin.cssmin(text)
+        except ImportError:
+            return _strip_css(text)
+    if name.endswith('.js'):
+        try:
+            import rjsmin
+            return rjsmin.jsmin(text)
+        except ImportError:
+            return _strip_js(text)
+    return text
+
+
+def fingerprinted(name, data):
+    stem, ext = os.path.splitext(name)
+    if stem.endswith('.min'):
+        stem, ext = stem[:-4], '.min' + ext
+    return f'{stem}.{hashlib.sha256(data).hexdigest()[:8]}{ext}'
+
+
+def source_names():
+    """Every css/js file under static/src/, relative and with forward slashes"""
+    names = []
+    for dirpath, _, filenames in os.walk(SRC_DIR):
+        for filename in filenames:
+            if filename.endswith(('.css', '.js')):
+                path = os.path.relpath(os.path.join(dirpath, filename), SRC_DIR)
+                names.append(path.replace(os.sep, '/'))
+    return sorted(names)
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build():
+    """Minify, fingerprint and pre-compress every source; returns the manifest"""
+    manifest = {}
+    for name in source_names():
+        with open(os.path.join(SRC_DIR, name), encoding='utf-8') as f:
+            data = minify(name, f.read()).encode('utf-8')
+        target = fingerprinted(name, data)
+        path = os.path.join(DIST_DIR, target)
+        _write(path, data)
+        _write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write(path + '.br', brotli.compress(data))
+        manifest[name] = target
+
+    _write(os.path.join(DIST_DIR, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+
+def sri(data):
+    return 'sha384-' + base64.b64encode(hashlib.sha384(data).digest()).decode()
+
+
+def vendor():
+    """Download the pinned Bootstrap files, refusing any that don't match their SRI hash"""
+    for name, entry in VENDOR.items():
+        with urllib.request.urlopen(entry['url'], timeout=30) as response:
+            data = response.read()
+        if sri(data) != entry['integrity']:
+            raise ValueError(f"{name} from {entry['url']} does not match its integrity hash")
+        _write(os.path.join(SRC_DIR, 'vendor', name), data)
+        print(f"✅ {name} ({len(data) // 1024} KB)")
+
+
+# --- Serving ---
+
+def load_manifest():
+    try:
+        with open(os.path.join(DIST_DIR, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def serve(filename):
+    """A built asset, pre-compressed to the best encoding the client accepts"""
+    if filename == MANIFEST or filename.endswith(tuple(suffix for _, suffix in ENCODINGS)):
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in ENCODINGS:
+        if encoding in request.accept_encodings and os.path.isfile(os.path.join(DIST_DIR, filename + suffix)):
+            response = send_from_directory(DIST_DIR, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(DIST_DIR, filename, mimetype=mimetype)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def init_app(app):
+    """Add the /assets route and the asset_url / vendor_asset template globals"""
+    manifest = load_manifest()
+    if manifest:
+        log.info("Serving %d built assets from %s", len(manifest), DIST_DIR)
+    elif not app.debug:
+        # Production should never serve the unminified sources; the deploy skipped the build
+        log.error("No asset manifest in %s, serving unbuilt static/src files; "
+                  "run `python assets.py build` during the deploy", DIST_DIR)
+
+    def asset_url(name):
+        if name in manifest:
+            return url_for('assets', filename=manifest[name])
+        return url_for('static', filename='src/' + name)
+
+    def vendor_asset(name):
+        entry = VENDOR[name]
+        local = 'vendor/' + name
+        if local in manifest:
+            url, attrs = url_for('assets', filename=manifest[local]), ''
+        else:
+            url, attrs = entry['url'], f' integrity="{entry["integrity"]}" crossorigin="anonymous"'
+        if name.endswith('.css'):
+            return Markup(f'<link href="{url}" rel="stylesheet"{attrs}>')
+        return Markup(f'<script src="{url}"{attrs}></script>')
+
+    app.add_url_rule('/assets/<path:filename>', 'assets', serve)
+    app.jinja_env.globals.update(asset_url=asset_url, vendor_asset=vendor_asset)
+
+
+def main(argv):
+    command = argv[1] if len(argv) > 1 else 'build'
+    if command == 'vendor':
+        try:
+            vendor()
+        except (OSError, ValueError) as e:
+            print(f"❌ Could not vendor Bootstrap: {e}")
+            return 1
+        return 0
+    if command == 'build':
+        manifest = build()
+        if not any(name.startswith('vendor/') for name in manifest):
+            print("⚠️ Bootstrap not vendored (python assets.py vendor), pages will load it from the CDN")
+        print(f"✅ Built {len(manifest)} assets into {DIST_DIR}"
+              f"{'' if brotli else ' (gzip only, install brotli for .br)'}")
+        return 0
+    print(f"Usage: {argv[0]} [vendor|build]")
+    return 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compression Benchmark
+Fetches the largest admin pages and JSON APIs from a running server once per
+Accept-Encoding (identity, gzip, br) and reports the bytes on the wire, the
+server-side latency and the transfer time over a slow link, to weigh the
+CPU spent compressing (see compression.py) against the bytes saved.
+
+Needs a running server with MySQL and the admin account. Example:
+
+    python benchmark_compression.py --url http://127.0.0.1:5000 --room-id 1 --mbps 5
+"""
+
+import argparse
+import statistics
+
+from loadtest_client import Session
+
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+def pages(room_id):
+    return [
+        ('admin dashboard', '/admin'),
+        ('admin rooms', '/admin/rooms'),
+        ('room winners', f'/admin/winners/room/{room_id}'),
+        ('room kills', f'/admin/room/{room_id}/kills'),
+        ('enrollments json', f'/api/room/{room_id}/gaming_ids_enrollments'),
+        ('teams json', f'/api/room/{room_id}/teams'),
+    ]
+
+
+def measure(session, path, encoding, rounds):
+    """(bytes on the wire, median seconds) or None if the page failed"""
+    sizes, timings = [], []
+    for _ in range(rounds):
+        status, seconds, body = session.get(path, headers={'Accept-Encoding': encoding})
+        if status != 200:
+            return None
+        sizes.append(len(body))
+        timings.append(seconds)
+    return max(sizes), statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare response sizes and latency per Accept-Encoding')
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--room-id', type=int, default=1)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--mbps', type=float, default=5.0, help='link speed for the transfer time column')
+    parser.add_argument('--admin-user', default='admin')
+    parser.add_argument('--admin-password', default='admin123')
+    args = parser.parse_args()
+
+    session = Session(args.url)
+    if not session.login(args.admin_user, args.admin_password):
+        print("❌ Admin login failed")
+        return 1
+
+    print(f"\n📊 Median of {args.rounds} requests per encoding, transfer at {args.mbps:g} Mbit/s")
+    print(f"  {'page':<20}{'encoding':<10}{'bytes':>10}{'ratio':>8}{'server':>10}{'transfer':>10}")
+    for label, path in pages(args.room_id):
+        identity = None
+        for encoding in ENCODINGS:
+            result = measure(session, path, encoding, args.rounds)
+            if result is None:
+                print(f"  {label:<20}{encoding:<10}{'failed':>10}")
+                break
+            size, seconds = result
+            identity = identity or size
+            transfer_ms = size * 8 / (args.mbps * 1000)
+            print(f"  {label:<20}{encoding:<10}{size:>10}{size / identity:>8.2f}"
+                  f"{seconds * 1000:>8.1f}ms{transfer_ms:>8.1f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Gunicorn Preset Benchmark
+Starts the app under each GUNICORN_PRESET in turn and drives the lobby,
+room-join page and admin dashboard with concurrent logged-in clients.
+
+Needs a reachable MySQL with the schema loaded, one player account and the
+admin account. Example:
+
+    python benchmark_gunicorn_presets.py --user player1 --password secret --room-id 1
+"""
+
+import argparse
+import itertools
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from loadtest_client import LatencyRecorder, Session, print_report, wait_until_up
+
+
+def route_mix(room_id):
+    return [
+        ('lobby /home', '/home', 'player'),
+        ('room join page', f'/room/{room_id}/join_with_gaming_ids', 'player'),
+        ('admin dashboard', '/admin', 'admin'),
+    ]
+
+
+def start_server(preset, port):
+    env = dict(os.environ, GUNICORN_PRESET=preset, PORT=str(port))
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def run_clients(base_url, args):
+    recorder = LatencyRecorder()
+    routes = route_mix(args.room_id)
+    stop_at = time.time() + args.duration
+
+    def client(index):
+        sessions = {'player': Session(base_url), 'admin': Session(base_url)}
+        if not sessions['player'].login(args.user, args.password):
+            print(f"❌ Client {index}: player login failed")
+            return
+        if not sessions['admin'].login(args.admin_user, args.admin_password):
+            print(f"❌ Client {index}: admin login failed")
+            return
+
+        for label, path, role in itertools.cycle(routes):
+            if time.time() >= stop_at:
+                break
+            status, seconds, _ = sessions[role].get(path)
+            recorder.add(label, seconds, ok=200 <= status < 400)
+
+    started = time.time()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder.summary(time.time() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare gunicorn worker presets')
+    parser.add_argument('--presets', default='sync,gthread,gevent')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=int, default=30, help='seconds per preset')
+    parser.add_argument('--room-id', type=int, default=1)
+    parser.add_argument('--user', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--admin-user', default='admin')
+    parser.add_argument('--admin-password', default='admin123')
+    args = parser.parse_args()
+
+    base_url = f'http://127.0.0.1:{args.port}'
+    results = {}
+    for preset in args.presets.split(','):
+        print(f"\n🚀 Starting gunicorn with preset '{preset}'...")
+        server = start_server(preset, args.port)
+        try:
+            if not wait_until_up(base_url):
+                print(f"❌ Server did not come up for preset '{preset}'")
+                continue
+            results[preset] = run_clients(base_url, args)
+            print_report(f"Preset {preset} ({args.clients} clients, {args.duration}s)", results[preset])
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    if len(results) > 1:
+        print("\n🏁 Throughput by preset (req/s)")
+        for preset, report in results.items():
+            total = sum(row['rps'] for row in report.values())
+            print(f"  {preset:<10}{total:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
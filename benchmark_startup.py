@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures how long a freshly started gunicorn worker takes to serve its
+first pages, with and without template warmup (see template_warmup.py):
+
+  cold      no bytecode cache, no warmup: every template compiles on first hit
+  bytecode  TEMPLATE_WARMUP off, bytecode cache filled by template_warmup.py
+  warmup    the default: templates compiled at boot into the bytecode cache
+
+Each variant starts one worker, waits for /health, then requests every page
+twice; the first request is the time-to-first-request, the second the
+steady state. Logged-in pages are included with --user/--password (needs a
+reachable MySQL with the schema loaded). Example:
+
+    python benchmark_startup.py --rounds 5 --user player1 --password secret
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from loadtest_client import Session, wait_until_up
+
+ANONYMOUS_PAGES = ['/login', '/signup']
+PLAYER_PAGES = ['/home', '/profile', '/my_gaming_ids']
+VARIANTS = ['cold', 'bytecode', 'warmup']
+
+
+def variant_env(variant, cache_dir):
+    if variant == 'cold':
+        return {'JINJA_CACHE_DIR': '', 'TEMPLATE_WARMUP': 'false'}
+    if variant == 'bytecode':
+        return {'JINJA_CACHE_DIR': cache_dir, 'TEMPLATE_WARMUP': 'false'}
+    return {'JINJA_CACHE_DIR': cache_dir, 'TEMPLATE_WARMUP': 'true'}
+
+
+def fill_cache(cache_dir):
+    env = dict(os.environ, JINJA_CACHE_DIR=cache_dir)
+    subprocess.run([sys.executable, 'template_warmup.py'], env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def start_server(port, extra_env, preload):
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY='1',
+               GUNICORN_PRELOAD='true' if preload else 'false', **extra_env)
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def measure(base_url, args):
+    """Boot time, then first and second latency of every page, in seconds"""
+    session = Session(base_url)
+    pages = list(ANONYMOUS_PAGES)
+    if args.user:
+        pages += PLAYER_PAGES
+
+    timings = {}
+    # Anonymous pages first: logging in would render the lobby
+    for path in ANONYMOUS_PAGES:
+        timings[path] = [session.get(path)[1] for _ in range(2)]
+    if args.user:
+        if not session.login(args.user, args.password):
+            print("❌ Login failed, skipping logged-in pages")
+            return timings
+        for path in PLAYER_PAGES:
+            timings[path] = [session.get(path)[1] for _ in range(2)]
+    return timings
+
+
+def run_variant(variant, args, cache_dir):
+    base_url = f'http://127.0.0.1:{args.port}'
+    boots, firsts, seconds = [], {}, {}
+    for _ in range(args.rounds):
+        if variant == 'bytecode':
+            fill_cache(cache_dir)
+        elif variant == 'warmup':
+            # Warmup must compile from source, not from a previous round's cache
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+
+        started = time.perf_counter()
+        server = start_server(args.port, variant_env(variant, cache_dir), args.preload)
+        try:
+            if not wait_until_up(base_url, timeout=60):
+                print(f"❌ Server did not come up for variant '{variant}'")
+                return None
+            boots.append(time.perf_counter() - started)
+            for path, (first, second) in measure(base_url, args).items():
+                firsts.setdefault(path, []).append(first)
+                seconds.setdefault(path, []).append(second)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+    return {
+        'boot': statistics.median(boots),
+        'pages': {path: (statistics.median(firsts[path]), statistics.median(seconds[path])) for path in firsts},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure time-to-first-request with and without template warmup')
+    parser.add_argument('--variants', default=','.join(VARIANTS))
+    parser.add_argument('--rounds', type=int, default=3, help='server starts per variant (median is reported)')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--no-preload', dest='preload', action='store_false',
+                        help='import the app in the worker instead of the master')
+    parser.add_argument('--user')
+    parser.add_argument('--password')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='jinja-bench-') as cache_dir:
+        for variant in args.variants.split(','):
+            print(f"\n🚀 Variant '{variant}' ({args.rounds} rounds, preload {'on' if args.preload else 'off'})...")
+            result = run_variant(variant, args, cache_dir)
+            if result is None:
+                continue
+            results[variant] = result
+            print(f"  Boot to /health: {result['boot'] * 1000:.0f} ms")
+            for path, (first, second) in result['pages'].items():
+                print(f"  {path:<20} first {first * 1000:>7.1f} ms   then {second * 1000:>7.1f} ms")
+
+    if len(results) > 1:
+        print("\n🏁 Sum of first-request latencies by variant")
+        for variant, result in results.items():
+            total = sum(first for first, _ in result['pages'].values())
+            print(f"  {variant:<10}{total * 1000:>10.1f} ms   (boot {result['boot'] * 1000:.0f} ms)")
+
+
+if __name__ == '__main__':
+    main()
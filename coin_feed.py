@@ -0,0 +1,46 @@
+"""
+Live Coin Balances
+Pushes coin balance changes to the browser over Server-Sent Events instead
+of every tab re-fetching /api/user_coins whenever it regains focus.
+
+Streams are keyed by user id (see live_feed.py). The poller reads the users
+whose row changed since its last poll (users.updated_at, indexed by
+migration 0007) and publishes their balances to the streams open in this
+worker, so a credit committed by any worker, refunds.py or an admin in
+another process reaches every open tab within COIN_FEED_POLL_SECONDS.
+"""
+
+import os
+
+import live_feed
+
+POLL_SECONDS = float(os.getenv('COIN_FEED_POLL_SECONDS', 2))
+
+
+class CoinHub(live_feed.FeedHub):
+    """Balances of the users with an open stream in this worker"""
+
+    name = 'coin-feed'
+
+    def _poll(self, cur, since):
+        cur.execute("""
+            SELECT id, coins, updated_at FROM users
+            WHERE updated_at >= %s - INTERVAL %s SECOND
+        """, (since, live_feed.LOOKBACK_SECONDS))
+        for user_id, coins, updated_at in cur.fetchall():
+            self.publish(user_id, coins)
+            if updated_at > since:
+                since = updated_at
+        return since
+
+
+hub = CoinHub(POLL_SECONDS)
+
+
+def render(coins):
+    return live_feed.sse({'coins': coins})
+
+
+def event_stream(user_id, coins, config):
+    """Generator for the text/event-stream response of one browser tab"""
+    return live_feed.event_stream(hub, user_id, [render(coins)], config, render, value=coins)
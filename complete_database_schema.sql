@@ -20,7 +20,9 @@ CREATE TABLE IF NOT EXISTS users (
     coins INT DEFAULT 0,
     is_admin BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_users_updated_at (updated_at),
+    INDEX idx_users_username (username)
 );
 
 -- ============================================================================
@@ -47,7 +49,11 @@ CREATE TABLE IF NOT EXISTS rooms (
     min_kills_required INT DEFAULT 0,
     reward_per_kill DECIMAL(10,2) DEFAULT 0.00,
     max_kill_bonus DECIMAL(10,2) DEFAULT 0.00,
-    is_active BOOLEAN DEFAULT TRUE
+    is_active BOOLEAN DEFAULT TRUE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX idx_rooms_updated_at (updated_at),
+    INDEX idx_rooms_status_created (status, created_at),
+    INDEX idx_rooms_active (is_active)
 );
 
 -- ============================================================================
@@ -65,7 +71,7 @@ CREATE TABLE IF NOT EXISTS user_gaming_ids (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_user_gaming_ids_user (user_id),
+    INDEX idx_user_gaming_ids_user_active (user_id, is_active, is_primary DESC, gaming_platform, display_name),
     INDEX idx_user_gaming_ids_platform (gaming_platform),
     INDEX idx_user_gaming_ids_username (gaming_username)
 );
@@ -88,24 +94,29 @@ CREATE TABLE IF NOT EXISTS room_user_enrollments (
     user_id INT NOT NULL,
     total_entry_fee INT NOT NULL,
     gaming_ids_count INT NOT NULL,
-    payment_status ENUM('pending', 'paid', 'failed') DEFAULT 'pending',
+    payment_status ENUM('pending', 'paid', 'failed', 'refunded') DEFAULT 'pending',
     is_active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_room_user_enrollments_room (room_id),
-    INDEX idx_room_user_enrollments_user (user_id)
+    INDEX idx_room_user_enrollments_user (user_id),
+    INDEX idx_room_user_enrollments_room_payment (room_id, payment_status, is_active, gaming_ids_count),
+    INDEX idx_room_user_enrollments_updated (updated_at, room_id),
+    INDEX idx_enrollments_room_user (room_id, user_id)
 );
 
 CREATE TABLE IF NOT EXISTS room_gaming_ids (
     id INT PRIMARY KEY AUTO_INCREMENT,
+    room_id INT NOT NULL,
     room_user_enrollment_id INT NOT NULL,
     user_gaming_id INT NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (room_user_enrollment_id) REFERENCES room_user_enrollments(id) ON DELETE CASCADE,
     FOREIGN KEY (user_gaming_id) REFERENCES user_gaming_ids(id) ON DELETE CASCADE,
     UNIQUE KEY unique_enrollment_gaming_id (room_user_enrollment_id, user_gaming_id),
+    UNIQUE KEY unique_gaming_id_per_room (room_id, user_gaming_id),
     INDEX idx_room_gaming_ids_enrollment (room_user_enrollment_id),
     INDEX idx_room_gaming_ids_gaming_id (user_gaming_id)
 );
@@ -125,7 +136,8 @@ CREATE TABLE IF NOT EXISTS gaming_id_room_stats (
     FOREIGN KEY (recorded_by) REFERENCES users(id) ON DELETE SET NULL,
     UNIQUE KEY unique_gaming_id_room_stats (user_gaming_id, room_id),
     INDEX idx_gaming_id_room_stats_gaming_id (user_gaming_id),
-    INDEX idx_gaming_id_room_stats_room (room_id)
+    INDEX idx_gaming_id_room_stats_room_kills (room_id, kills_count),
+    INDEX idx_gaming_id_room_stats_screenshot (screenshot_proof)
 );
 
 -- ============================================================================
@@ -163,14 +175,16 @@ CREATE TABLE IF NOT EXISTS room_team_enrollments (
     user_team_id INT NOT NULL,
     enrolled_by INT NOT NULL,
     total_entry_fee INT NOT NULL,
-    payment_status ENUM('pending', 'paid', 'failed') DEFAULT 'pending',
+    payment_status ENUM('pending', 'paid', 'failed', 'refunded') DEFAULT 'pending',
+    is_active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
     FOREIGN KEY (user_team_id) REFERENCES user_teams(id) ON DELETE CASCADE,
     FOREIGN KEY (enrolled_by) REFERENCES users(id) ON DELETE CASCADE,
     UNIQUE KEY unique_room_team_enrollment (room_id, user_team_id),
     INDEX idx_room_team_enrollments_room (room_id),
-    INDEX idx_room_team_enrollments_team (user_team_id)
+    INDEX idx_room_team_enrollments_team (user_team_id),
+    INDEX idx_room_team_enrollments_payment (payment_status, total_entry_fee)
 );
 
 -- Legacy team system (maintained for backwards compatibility)
@@ -304,7 +318,7 @@ CREATE TABLE IF NOT EXISTS winner_selection_history (
     FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
     FOREIGN KEY (user_gaming_id) REFERENCES user_gaming_ids(id) ON DELETE SET NULL,
     FOREIGN KEY (admin_user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_winner_history_room (room_id),
+    INDEX idx_winner_history_room_time (room_id, action_timestamp),
     INDEX idx_winner_history_admin (admin_user_id)
 );
 
@@ -356,8 +370,10 @@ CREATE TABLE IF NOT EXISTS transactions (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     INDEX idx_transactions_user (user_id),
-    INDEX idx_transactions_type (type),
-    INDEX idx_transactions_status (status)
+    INDEX idx_transactions_type_status_created (type, status, created_at, amount),
+    INDEX idx_transactions_status (status),
+    INDEX idx_transactions_screenshot (payment_screenshot, user_id),
+    INDEX idx_transactions_created (created_at)
 );
 
 CREATE TABLE IF NOT EXISTS withdrawals (
@@ -370,8 +386,25 @@ CREATE TABLE IF NOT EXISTS withdrawals (
     requested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     processed_at TIMESTAMP NULL,
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-    INDEX idx_withdrawals_user (user_id),
-    INDEX idx_withdrawals_status (status)
+    INDEX idx_withdrawals_user_requested (user_id, requested_at),
+    INDEX idx_withdrawals_status_requested (status, requested_at, amount),
+    INDEX idx_withdrawals_processed (processed_at),
+    INDEX idx_withdrawals_screenshot (payment_screenshot, user_id)
+);
+
+-- Rows referencing each content-addressed upload (see upload_storage.py)
+CREATE TABLE IF NOT EXISTS upload_files (
+    storage_key VARCHAR(100) PRIMARY KEY,
+    ref_count INT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Version counters of fragment-cached admin sections (see fragment_cache.py)
+CREATE TABLE IF NOT EXISTS cache_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
 
 -- ============================================================================
@@ -428,17 +461,6 @@ CREATE TABLE IF NOT EXISTS room_result_status (
 INSERT IGNORE INTO users (username, password, is_admin, coins) 
 VALUES ('admin', 'admin123', TRUE, 10000);
 
--- ============================================================================
--- 12. CREATE INDEXES FOR PERFORMANCE
--- ============================================================================
-
--- Additional performance indexes
-CREATE INDEX IF NOT EXISTS idx_rooms_status ON rooms(status);
-CREATE INDEX IF NOT EXISTS idx_rooms_active ON rooms(is_active);
-CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
-CREATE INDEX IF NOT EXISTS idx_transactions_created ON transactions(created_at);
-CREATE INDEX IF NOT EXISTS idx_enrollments_room_user ON room_user_enrollments(room_id, user_id);
-
 -- ============================================================================
 -- SCHEMA COMPLETE - ALL TABLES FROM YOUR DATABASE INCLUDED
 -- ============================================================================
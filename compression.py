@@ -0,0 +1,142 @@
+"""
+Response Compression
+Compresses HTML and JSON responses on the way out, gzip or brotli
+(when the brotli package is installed) as the client accepts.
+
+Only responses whose mimetype is in COMPRESS_MIMETYPES and whose body is at
+least COMPRESS_MIN_SIZE bytes are compressed; small bodies gain nothing.
+Streamed responses are compressed chunk by chunk and flushed after each
+one, so the client still sees every chunk as soon as it is produced
+(Server-Sent Events are left alone all the same: proxies and browsers
+handle them better uncompressed).
+
+Responses that already carry a Content-Encoding pass through untouched,
+which is the fast path for the pre-compressed files under /assets (see
+assets.py); so do files sent with send_file, 206 partial content and
+anything marked Cache-Control: no-transform. A compressed response gets a
+weak ETag, since its bytes differ from the identity representation.
+"""
+
+import gzip
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MIMETYPES = (
+    'text/html', 'text/plain', 'text/css', 'text/csv', 'text/xml',
+    'application/json', 'application/javascript', 'application/xml',
+)
+
+# Only what we can produce, preferred first
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+class Settings:
+    min_size = 500
+    mimetypes = frozenset(DEFAULT_MIMETYPES)
+    gzip_level = 6
+    brotli_quality = 4
+    encodings = ENCODINGS
+
+
+settings = Settings()
+
+
+def choose_encoding():
+    """The best encoding the client accepts, or None"""
+    accepted = request.accept_encodings
+    for encoding in settings.encodings:
+        if accepted[encoding]:
+            return encoding
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.brotli_quality)
+    return gzip.compress(data, compresslevel=settings.gzip_level)
+
+
+def compress_stream(chunks, encoding):
+    """Compress an iterable of chunks, flushing after each so nothing is held back"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=settings.brotli_quality)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+
+    # wbits 16 + MAX_WBITS writes a gzip header and trailer
+    compressor = zlib.compressobj(settings.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def should_compress(response):
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if response.mimetype not in settings.mimetypes:
+        return False
+    if 'Content-Encoding' in response.headers or response.direct_passthrough:
+        return False
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return False
+    return request.method != 'HEAD'
+
+
+def compress_response(response):
+    if not should_compress(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        chunks = response.response
+        response.response = compress_stream(chunks, encoding)
+        if hasattr(chunks, 'close'):
+            # Let the original generator's cleanup run when the client goes away
+            response.call_on_close(chunks.close)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < settings.min_size:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """Read the COMPRESS_* settings and compress every eligible response"""
+    settings.min_size = int(app.config.get('COMPRESS_MIN_SIZE', settings.min_size))
+    mimetypes = app.config.get('COMPRESS_MIMETYPES')
+    if mimetypes:
+        settings.mimetypes = frozenset(m.strip() for m in mimetypes.split(',') if m.strip())
+    settings.gzip_level = int(app.config.get('COMPRESS_LEVEL', settings.gzip_level))
+    settings.brotli_quality = int(app.config.get('COMPRESS_BROTLI_QUALITY', settings.brotli_quality))
+    algorithms = app.config.get('COMPRESS_ALGORITHMS')
+    if algorithms is not None:
+        settings.encodings = tuple(a.strip() for a in algorithms.split(',') if a.strip() in ENCODINGS)
+
+    if settings.encodings:
+        app.after_request(compress_response)
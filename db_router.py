@@ -0,0 +1,157 @@
+"""
+Read Replica Routing
+Sends GET requests of views marked with @read_only to a MySQL read replica
+and everything else to the primary.
+
+    MYSQL_REPLICA_HOSTS=replica1:3306,replica2:3306
+
+A user who just wrote something (any non-GET request, or a GET that ran an
+INSERT/UPDATE/DELETE) is kept on the primary for REPLICA_STICKY_SECONDS via
+the session, so they always see their own writes despite replication lag.
+Without MYSQL_REPLICA_HOSTS, or while every replica is unreachable, all
+requests use the primary; an unreachable replica is skipped for
+REPLICA_RETRY_SECONDS before it is tried again.
+"""
+
+import os
+import random
+import threading
+import time
+
+import MySQLdb
+from flask import current_app, g, request, session
+from flask_mysqldb import MySQL
+
+import app_logging
+import instrumentation
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+SESSION_KEY = 'db_primary_until'
+
+log = app_logging.get_logger('db_router')
+
+
+def read_only(view):
+    """Mark a view as safe to serve from a read replica (GET/HEAD only)"""
+    view.read_only_db = True
+    return view
+
+
+def parse_hosts(value):
+    """'host1:3307,host2' -> [('host1', 3307), ('host2', 3306)]"""
+    hosts = []
+    for entry in (value or '').split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.partition(':')
+        hosts.append((host, int(port or 3306)))
+    return hosts
+
+
+class ReplicaPool:
+    """Replica addresses plus the ones currently skipped after a failed connect"""
+
+    def __init__(self, hosts=(), retry_seconds=30.0):
+        self.hosts = list(hosts)
+        self.retry_seconds = retry_seconds
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        """Healthy replicas in random order, to spread requests across them"""
+        now = time.time()
+        with self._lock:
+            healthy = [host for host in self.hosts if self._down_until.get(host, 0) <= now]
+        random.shuffle(healthy)
+        return healthy
+
+    def mark_down(self, host):
+        with self._lock:
+            self._down_until[host] = time.time() + self.retry_seconds
+
+    def reset(self):
+        """Forget failures, e.g. in a freshly forked worker"""
+        with self._lock:
+            self._down_until.clear()
+
+
+pool = ReplicaPool()
+
+
+class RoutedMySQL(MySQL):
+    """flask_mysqldb's MySQL whose per-request connection goes to a replica
+    when choose_route() allowed it for the current request"""
+
+    @property
+    def connect(self):
+        if g.get('db_route') == 'replica':
+            connection = self._connect_replica()
+            if connection is not None:
+                return connection
+            g.db_route = 'primary'
+        return super().connect
+
+    def _connect_replica(self):
+        config = current_app.config
+        kwargs = {
+            'user': config.get('MYSQL_REPLICA_USER') or config['MYSQL_USER'],
+            'passwd': config.get('MYSQL_REPLICA_PASSWORD') or config['MYSQL_PASSWORD'],
+            'db': config['MYSQL_DB'],
+            'connect_timeout': config.get('MYSQL_REPLICA_CONNECT_TIMEOUT', 2),
+        }
+        if config.get('MYSQL_CHARSET'):
+            kwargs['charset'] = config['MYSQL_CHARSET']
+        kwargs.update(config.get('MYSQL_CUSTOM_OPTIONS') or {})
+
+        for host, port in pool.candidates():
+            try:
+                return MySQLdb.connect(host=host, port=port, **kwargs)
+            except MySQLdb.OperationalError as e:
+                log.warning("Replica %s:%s unreachable, using the next one or the primary: %s", host, port, e)
+                pool.mark_down((host, port))
+        return None
+
+
+def choose_route():
+    """Use a replica for read-only views unless this user wrote recently"""
+    g.db_route = 'primary'
+    if not pool.hosts or request.method not in SAFE_METHODS:
+        return
+    view = current_app.view_functions.get(request.endpoint)
+    if not getattr(view, 'read_only_db', False):
+        return
+    if session.get(SESSION_KEY, 0) > time.time():
+        return
+    g.db_route = 'replica'
+
+
+def remember_writes(response):
+    """Keep a user who just wrote on the primary for REPLICA_STICKY_SECONDS"""
+    if not pool.hosts:
+        return response
+    wrote = instrumentation.current_request_stats().get('writes', 0)
+    if wrote and g.get('db_route') == 'replica':
+        log.warning("%s wrote to a replica connection; it should not be @read_only", request.endpoint)
+    if wrote or request.method not in SAFE_METHODS:
+        session[SESSION_KEY] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+    if current_app.debug or current_app.testing:
+        response.headers['X-DB-Route'] = g.get('db_route', 'primary')
+    return response
+
+
+def init_app(app):
+    """Configure the replica pool from the environment and register the routing hooks"""
+    app.config.setdefault('MYSQL_REPLICA_HOSTS', os.getenv('MYSQL_REPLICA_HOSTS', ''))
+    app.config.setdefault('MYSQL_REPLICA_USER', os.getenv('MYSQL_REPLICA_USER'))
+    app.config.setdefault('MYSQL_REPLICA_PASSWORD', os.getenv('MYSQL_REPLICA_PASSWORD'))
+    app.config.setdefault('REPLICA_STICKY_SECONDS', float(os.getenv('REPLICA_STICKY_SECONDS', 5)))
+
+    pool.hosts = parse_hosts(app.config['MYSQL_REPLICA_HOSTS'])
+    pool.retry_seconds = float(os.getenv('REPLICA_RETRY_SECONDS', 30))
+    if pool.hosts:
+        log.info("Read-only views use replicas: %s",
+                 ', '.join(f'{host}:{port}' for host, port in pool.hosts))
+
+    app.before_request(choose_route)
+    app.after_request(remember_writes)
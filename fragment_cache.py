@@ -0,0 +1,134 @@
+"""
+Template Fragment Cache
+Caches rendered sections of a template in an in-memory LRU, keyed by a name
+and explicit version values, so an unchanged section is emitted as-is
+instead of being re-rendered.
+
+    {% cache 'admin_rooms_table', rooms_version %}
+        {% set rooms = load_rooms() %}
+        ... large table ...
+    {% endcache %}
+
+The version values must change whenever anything shown in the section
+does; there is no other invalidation. They are counters in the
+cache_versions table: every view that changes the data calls bump() on its
+cursor just before committing, and the cached view reads them with
+versions(). Timestamps and counts are not enough, since two changes in the
+same second or a status-only update would leave them as they were. A
+counter row is locked from bump() until the commit, which is why it goes
+last.
+
+A hit skips the block body entirely, so data that is only needed by the
+section can be passed as a loader and queried inside the block. Never cache
+a section that shows per-user or per-request data (flash messages, the
+current user).
+
+Each worker keeps its own cache of at most FRAGMENT_CACHE_MAX_ENTRIES
+fragments and FRAGMENT_CACHE_MAX_BYTES characters; the least recently used
+fragments are dropped first and a single fragment over the byte limit is
+not stored.
+"""
+
+import threading
+from collections import OrderedDict
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered fragments, bounded by count and total size"""
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+cache = FragmentCache()
+
+
+def bump(cur, *names):
+    """Advance the named versions on the caller's cursor, in the transaction of the change"""
+    for name in names:
+        cur.execute("""
+            INSERT INTO cache_versions (name, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+        """, (name,))
+
+
+def versions(cur, *names):
+    """The current value of each named version, in order (0 if never bumped)"""
+    cur.execute(f"SELECT name, version FROM cache_versions WHERE name IN ({','.join(['%s'] * len(names))})",
+                names)
+    found = dict(cur.fetchall())
+    return tuple(found.get(name, 0) for name in names)
+
+
+class FragmentCacheExtension(Extension):
+    """The {% cache name, version, ... %} ... {% endcache %} tag"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        keys = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            keys.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_cached', [nodes.List(keys)]), [], [], body).set_lineno(lineno)
+
+    def _cached(self, keys, caller):
+        key = repr(keys)
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = caller()
+            cache.set(key, str(fragment))
+        return Markup(fragment)
+
+
+def init_app(app):
+    """Size the cache from the environment and enable the {% cache %} tag"""
+    cache.max_entries = int(app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', cache.max_entries))
+    cache.max_bytes = int(app.config.get('FRAGMENT_CACHE_MAX_BYTES', cache.max_bytes))
+    app.jinja_env.add_extension(FragmentCacheExtension)
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Gaming ID Duplicate Scanner
+Finds rooms where the same in-game player (platform + gaming username) holds
+more than one seat, and optionally repairs them, without locking whole tables.
+
+    python gaming_id_duplicates.py scan
+    python gaming_id_duplicates.py scan --json duplicates.json
+    python gaming_id_duplicates.py repair --pause 0.1 --max-threads-running 20
+
+Rooms are walked in keyset batches of --room-batch ids, each scanned with one
+grouped query that only touches that batch's enrollments. A repair keeps the
+earliest seat of every conflict and removes the later ones, each in its own
+short transaction:
+  1. lock the duplicate seat and its enrollment (FOR UPDATE)
+  2. delete the seat from room_gaming_ids
+  3. shrink the enrollment by one gaming ID and one entry fee
+     (an enrollment left without gaming IDs becomes refunded and inactive)
+  4. credit the entry fee back to the player with a ledger row
+
+A repaired seat no longer exists, so re-running is safe and an interrupted
+run resumes with whatever duplicates remain. Between repairs the tool sleeps
+--pause seconds and waits while the server's Threads_running is above
+--max-threads-running.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import fragment_cache
+
+DEFAULT_ROOM_BATCH = 500
+DEFAULT_PAUSE = 0.05
+DEFAULT_MAX_THREADS_RUNNING = 25
+LOCK_WAIT_TIMEOUT = 3
+LOCK_WAIT_TIMEOUT_ERROR = 1205
+
+
+def room_batches(conn, batch_size=DEFAULT_ROOM_BATCH):
+    """Yield lists of room ids in id order"""
+    last_id = 0
+    while True:
+        cur = conn.cursor()
+        try:
+            cur.execute("SELECT id FROM rooms WHERE id > %s ORDER BY id LIMIT %s", (last_id, batch_size))
+            room_ids = [row[0] for row in cur.fetchall()]
+        finally:
+            cur.close()
+        if not room_ids:
+            return
+        yield room_ids
+        last_id = room_ids[-1]
+
+
+def scan_rooms(conn, room_ids):
+    """Conflicts in a batch of rooms: one dict per player seated more than once in a room"""
+    placeholders = ','.join(['%s'] * len(room_ids))
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+            SELECT rue.room_id, ug.gaming_platform, ug.gaming_username,
+                   COUNT(*) AS seats, COUNT(DISTINCT rue.user_id) AS users,
+                   GROUP_CONCAT(rgi.id ORDER BY rgi.id) AS seat_ids,
+                   GROUP_CONCAT(u.username ORDER BY rgi.id) AS usernames
+            FROM room_user_enrollments rue
+            JOIN room_gaming_ids rgi ON rgi.room_user_enrollment_id = rue.id
+            JOIN user_gaming_ids ug ON rgi.user_gaming_id = ug.id
+            JOIN users u ON rue.user_id = u.id
+            WHERE rue.room_id IN ({placeholders}) AND rue.is_active = TRUE
+            GROUP BY rue.room_id, ug.gaming_platform, ug.gaming_username
+            HAVING COUNT(*) > 1
+        """, room_ids)
+        rows = cur.fetchall()
+    finally:
+        cur.close()
+
+    return [
+        {
+            'room_id': room_id,
+            'gaming_platform': platform,
+            'gaming_username': username,
+            'seats': seats,
+            'users': users,
+            'seat_ids': [int(seat) for seat in seat_ids.split(',')],
+            'usernames': usernames.split(','),
+        }
+        for room_id, platform, username, seats, users, seat_ids, usernames in rows
+    ]
+
+
+def scan(conn, batch_size=DEFAULT_ROOM_BATCH):
+    """Yield every conflict, batch by batch"""
+    for room_ids in room_batches(conn, batch_size):
+        for conflict in scan_rooms(conn, room_ids):
+            yield conflict
+
+
+def threads_running(conn):
+    cur = conn.cursor()
+    try:
+        cur.execute("SHOW GLOBAL STATUS LIKE 'Threads_running'")
+        row = cur.fetchone()
+        return int(row[1]) if row else 0
+    finally:
+        cur.close()
+
+
+def throttle(conn, pause, max_threads_running):
+    """Sleep between repairs, longer while the server is busy"""
+    if pause:
+        time.sleep(pause)
+    while max_threads_running and threads_running(conn) > max_threads_running:
+        time.sleep(max(pause, 0.5))
+
+
+def _remove_seat(conn, seat_id, keep_seat_id):
+    """Remove one duplicate seat and refund it; returns coins refunded, or None if already gone"""
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT rgi.id, rue.id, rue.user_id, rue.room_id, r.entry_fee, rue.gaming_ids_count
+            FROM room_gaming_ids rgi
+            JOIN room_user_enrollments rue ON rgi.room_user_enrollment_id = rue.id
+            JOIN rooms r ON rue.room_id = r.id
+            WHERE rgi.id IN (%s, %s) AND rue.is_active = TRUE
+            FOR UPDATE
+        """, (seat_id, keep_seat_id))
+        seats = {row[0]: row for row in cur.fetchall()}
+        # Only remove the duplicate while the seat it duplicates is still held
+        if seat_id not in seats or keep_seat_id not in seats:
+            conn.rollback()
+            return None
+
+        _, enrollment_id, user_id, room_id, entry_fee, gaming_ids_count = seats[seat_id]
+        cur.execute("DELETE FROM room_gaming_ids WHERE id = %s", (seat_id,))
+
+        if gaming_ids_count <= 1:
+            cur.execute("""
+                UPDATE room_user_enrollments
+                SET gaming_ids_count = 0, total_entry_fee = GREATEST(total_entry_fee - %s, 0),
+                    payment_status = 'refunded', is_active = FALSE
+                WHERE id = %s
+            """, (entry_fee, enrollment_id))
+        else:
+            cur.execute("""
+                UPDATE room_user_enrollments
+                SET gaming_ids_count = gaming_ids_count - 1,
+                    total_entry_fee = GREATEST(total_entry_fee - %s, 0)
+                WHERE id = %s
+            """, (entry_fee, enrollment_id))
+
+        if entry_fee:
+            cur.execute("UPDATE users SET coins = coins + %s WHERE id = %s", (entry_fee, user_id))
+            cur.execute("""
+                INSERT INTO transactions (user_id, type, amount, description, payment_id, status)
+                VALUES (%s, 'credit', %s, %s, %s, 'approved')
+            """, (user_id, entry_fee, f'Duplicate gaming ID refund - Room ID: {room_id}',
+                  f'duplicate_seat_{seat_id}'))
+
+        fragment_cache.bump(cur, 'finance')
+        conn.commit()
+        return int(entry_fee or 0)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def repair(conn, conflicts, pause=DEFAULT_PAUSE, max_threads_running=DEFAULT_MAX_THREADS_RUNNING):
+    """Keep the earliest seat of each conflict and refund the rest, one seat per transaction"""
+    import MySQLdb
+
+    cur = conn.cursor()
+    try:
+        # Give way to live traffic instead of queueing behind it
+        cur.execute("SET SESSION innodb_lock_wait_timeout = %s", (LOCK_WAIT_TIMEOUT,))
+    finally:
+        cur.close()
+
+    summary = {'conflicts': 0, 'seats_removed': 0, 'coins_refunded': 0, 'skipped': 0}
+    for conflict in conflicts:
+        summary['conflicts'] += 1
+        keep_seat_id, *duplicate_seat_ids = conflict['seat_ids']
+        for seat_id in duplicate_seat_ids:
+            throttle(conn, pause, max_threads_running)
+            try:
+                refunded = _remove_seat(conn, seat_id, keep_seat_id)
+            except MySQLdb.OperationalError as e:
+                if e.args[0] != LOCK_WAIT_TIMEOUT_ERROR:
+                    raise
+                refunded = None
+            if refunded is None:
+                summary['skipped'] += 1
+                continue
+            summary['seats_removed'] += 1
+            summary['coins_refunded'] += refunded
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find and repair gaming IDs seated twice in a room')
+    parser.add_argument('command', choices=['scan', 'repair'])
+    parser.add_argument('--room-batch', type=int, default=DEFAULT_ROOM_BATCH, help='rooms per scan query')
+    parser.add_argument('--pause', type=float, default=DEFAULT_PAUSE, help='seconds to sleep between repairs')
+    parser.add_argument('--max-threads-running', type=int, default=DEFAULT_MAX_THREADS_RUNNING,
+                        help='wait while the server has more running threads (0 disables)')
+    parser.add_argument('--json', help='write the conflicts found to this file')
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    import MySQLdb
+
+    load_dotenv()
+    conn = MySQLdb.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        passwd=os.getenv('MYSQL_PASSWORD', '1111'),
+        db=os.getenv('MYSQL_DB', 'gaming_platform')
+    )
+    try:
+        print(f"🔍 Scanning rooms in batches of {args.room_batch}...")
+        conflicts = []
+        for conflict in scan(conn, args.room_batch):
+            conflicts.append(conflict)
+            print(f"  ⚠️  Room {conflict['room_id']}: {conflict['gaming_username']} "
+                  f"({conflict['gaming_platform']}) seated {conflict['seats']}x by "
+                  f"{', '.join(conflict['usernames'])}")
+
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(conflicts, f, indent=2)
+            print(f"💾 Conflicts written to {args.json}")
+
+        if not conflicts:
+            print("✅ No duplicate gaming IDs found")
+            return 0
+        print(f"\n⚠️  {len(conflicts)} conflicts, {sum(c['seats'] - 1 for c in conflicts)} extra seats")
+
+        if args.command == 'repair':
+            summary = repair(conn, conflicts, pause=args.pause, max_threads_running=args.max_threads_running)
+            print(f"🔧 Removed {summary['seats_removed']} duplicate seats, refunded "
+                  f"{summary['coins_refunded']} coins ({summary['skipped']} skipped: changed or locked, "
+                  f"re-run to retry)")
+        else:
+            print("Run with `repair` to keep the earliest seat of each conflict and refund the rest")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
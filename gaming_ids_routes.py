@@ -186,6 +186,17 @@ def join_room_with_gaming_ids(room_id):
     cur = mysql.connection.cursor()
     
     try:
+        if request.method == 'POST':
+            # Joins to one room run one at a time: the room row stays locked
+            # until this request commits or rolls back, so the slot count and
+            # the gaming ID checks below see every earlier join. The unique
+            # keys on room_gaming_ids only cover the same user_gaming_ids row;
+            # the same platform + username under another account is only
+            # caught here. Committing first ends any read snapshot an earlier
+            # query in this request opened, so the checks read after the lock.
+            mysql.connection.commit()
+            cur.execute("SELECT id FROM rooms WHERE id = %s FOR UPDATE", (room_id,))
+
         # Get room details
         cur.execute("SELECT * FROM rooms WHERE id = %s", (room_id,))
         room = cur.fetchone()
@@ -293,9 +304,9 @@ def join_room_with_gaming_ids(room_id):
                 # Add selected gaming IDs
                 for gaming_id in selected_gaming_ids:
                     cur.execute("""
-                        INSERT INTO room_gaming_ids (room_user_enrollment_id, user_gaming_id)
-                        VALUES (%s, %s)
-                    """, (enrollment_id, int(gaming_id)))
+                        INSERT INTO room_gaming_ids (room_id, room_user_enrollment_id, user_gaming_id)
+                        VALUES (%s, %s, %s)
+                    """, (room_id, enrollment_id, int(gaming_id)))
                 
                 # Update gaming ID stats
                 for gaming_id in selected_gaming_ids:
@@ -322,48 +333,3 @@ def join_room_with_gaming_ids(room_id):
         return redirect(url_for('room_details', room_id=room_id))
     finally:
         cur.close()
-
-@app.route('/api/room/<int:room_id>/gaming_ids_enrollments')
-@login_required
-def get_room_gaming_ids_enrollments(room_id):
-    """API endpoint to get room enrollments with gaming IDs"""
-    cur = mysql.connection.cursor()
-    try:
-        cur.execute("""
-            SELECT rue.id, rue.user_id, u.username, rue.gaming_ids_count, 
-                   rue.total_entry_fee, rue.enrolled_at,
-                   GROUP_CONCAT(CONCAT(ug.display_name, ' (', ug.gaming_platform, ')') SEPARATOR ', ') as gaming_ids,
-                   GROUP_CONCAT(rg.kills_count SEPARATOR ', ') as kills_list,
-                   SUM(rg.reward_earned) as total_rewards
-            FROM room_user_enrollments rue
-            JOIN users u ON rue.user_id = u.id
-            LEFT JOIN room_gaming_ids rg ON rue.id = rg.room_user_enrollment_id
-            LEFT JOIN user_gaming_ids ug ON rg.user_gaming_id = ug.id
-            WHERE rue.room_id = %s AND rue.payment_status = 'paid' AND rue.is_active = TRUE
-            GROUP BY rue.id
-            ORDER BY rue.enrolled_at ASC
-        """, (room_id,))
-        
-        enrollments = cur.fetchall()
-        return jsonify({
-            'success': True,
-            'enrollments': [
-                {
-                    'id': e[0],
-                    'user_id': e[1],
-                    'username': e[2],
-                    'gaming_ids_count': e[3],
-                    'total_entry_fee': e[4],
-                    'enrolled_at': e[5].isoformat() if e[5] else None,
-                    'gaming_ids': e[6] or '',
-                    'kills_list': e[7] or '',
-                    'total_rewards': float(e[8] or 0)
-                }
-                for e in enrollments
-            ]
-        })
-        
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
-    finally:
-        cur.close()
\ No newline at end of file
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Generator
+Fills every table from complete_database_schema.sql with deterministic,
+internally consistent data at a chosen scale, for measuring performance
+work at production-like volume.
+
+    python generate_dataset.py --scale small
+    python generate_dataset.py --scale large --method infile      # 1M users, 100k rooms, 10M transactions
+    python generate_dataset.py --users 50000 --rooms 5000 --transactions 500000 --seed 7
+
+Rows get explicit ids above the current MAX(id) of each table, so the data is
+appended to whatever is already there and foreign keys are known without
+reading anything back. Foreign key checks are disabled for the loading
+session only; every generated reference points at a generated row.
+
+--method insert  multi-row INSERTs in batches (works everywhere)
+--method infile  tab-separated files + LOAD DATA LOCAL INFILE (fastest; the
+                 server needs local_infile=ON)
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from array import array
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+import MySQLdb
+
+load_dotenv()
+
+SCALES = {
+    'small': {'users': 1000, 'rooms': 100, 'transactions': 10000},
+    'medium': {'users': 50000, 'rooms': 5000, 'transactions': 500000},
+    'large': {'users': 1000000, 'rooms': 100000, 'transactions': 10000000},
+}
+
+TABLE_COLUMNS = {
+    'users': ['id', 'username', 'password', 'gpay_number', 'coins', 'is_admin', 'created_at'],
+    'rooms': ['id', 'room_name', 'game_type', 'entry_fee', 'prize_pool', 'max_players', 'room_id_game',
+              'room_password', 'created_at', 'event_timing', 'is_multiplayer', 'min_team_size',
+              'max_team_size', 'min_players_to_start', 'status', 'kill_rewards_enabled',
+              'min_kills_required', 'reward_per_kill', 'max_kill_bonus', 'is_active'],
+    'user_gaming_ids': ['id', 'user_id', 'gaming_platform', 'gaming_username', 'display_name',
+                        'is_primary', 'is_active', 'created_at'],
+    'user_gaming_id_stats': ['id', 'user_gaming_id', 'total_rooms_joined', 'total_kills', 'total_rewards_earned'],
+    'room_user_enrollments': ['id', 'room_id', 'user_id', 'total_entry_fee', 'gaming_ids_count',
+                              'payment_status', 'is_active', 'created_at'],
+    'room_gaming_ids': ['id', 'room_id', 'room_user_enrollment_id', 'user_gaming_id', 'created_at'],
+    'gaming_id_room_stats': ['id', 'user_gaming_id', 'room_id', 'kills_count', 'reward_earned',
+                             'reward_status', 'screenshot_proof', 'recorded_by', 'recorded_at'],
+    'user_teams': ['id', 'user_id', 'team_name', 'team_email', 'team_size', 'is_active', 'created_at'],
+    'user_team_members': ['id', 'team_id', 'member_name', 'gaming_username', 'position_in_team', 'created_at'],
+    'room_team_enrollments': ['id', 'room_id', 'user_team_id', 'enrolled_by', 'total_entry_fee',
+                              'payment_status', 'created_at'],
+    'teams': ['id', 'room_id', 'team_name', 'team_email', 'team_leader_id', 'total_entry_fee',
+              'payment_status', 'created_at'],
+    'team_members': ['id', 'team_id', 'member_username', 'pubg_id', 'created_at'],
+    'enrollments': ['id', 'room_id', 'user_id', 'pubg_username', 'team_name', 'payment_status', 'created_at'],
+    'direct_enrollments': ['id', 'room_id', 'user_id', 'gaming_username', 'team_name', 'entry_fee',
+                           'payment_status', 'created_at'],
+    'enrollment_gaming_ids': ['id', 'enrollment_id', 'gaming_username', 'gaming_platform', 'created_at'],
+    'pubg_usernames': ['id', 'user_id', 'pubg_username', 'created_at'],
+    'room_enrollment_members': ['id', 'enrollment_id', 'member_name', 'pubg_username', 'created_at'],
+    'room_reward_settings': ['id', 'room_id', 'position', 'base_reward', 'kill_bonus_per_kill', 'max_kill_bonus'],
+    'room_winners': ['id', 'room_id', 'user_gaming_id', 'position', 'kills_count', 'base_reward', 'kill_bonus',
+                     'total_reward', 'performance_score', 'reward_distributed', 'selected_by', 'notes', 'created_at'],
+    'winner_selection_history': ['id', 'room_id', 'action_type', 'user_gaming_id', 'position', 'reward_amount',
+                                 'admin_user_id', 'details', 'action_timestamp'],
+    'winner_rewards_log': ['id', 'room_id', 'user_id', 'gaming_id', 'position', 'reward_amount',
+                           'distributed_by', 'distributed_at'],
+    'player_kills': ['id', 'room_id', 'user_id', 'kills_count', 'screenshot_proof', 'reward_earned',
+                     'verified', 'created_at'],
+    'transactions': ['id', 'user_id', 'type', 'amount', 'description', 'payment_id', 'payment_screenshot',
+                     'status', 'created_at'],
+    'withdrawals': ['id', 'user_id', 'amount', 'gpay_number', 'status', 'payment_screenshot',
+                    'requested_at', 'processed_at'],
+    'blocked_users': ['id', 'room_id', 'user_id', 'blocked_by', 'reason', 'blocked_at'],
+    'blocked_teams': ['id', 'room_id', 'team_id', 'blocked_by', 'reason', 'blocked_at'],
+    'room_result_status': ['id', 'room_id', 'status', 'winner_announced', 'results_finalized',
+                           'updated_by', 'updated_at'],
+}
+
+EPOCH = datetime(2025, 1, 1)
+SPAN_SECONDS = 365 * 24 * 3600
+ROOM_STATUSES = ['open'] * 20 + ['running'] * 5 + ['completed'] * 70 + ['cancelled'] * 5
+
+
+def get_connection(local_infile=False):
+    kwargs = {}
+    if local_infile:
+        kwargs['local_infile'] = 1
+    return MySQLdb.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        passwd=os.getenv('MYSQL_PASSWORD', '1111'),
+        db=os.getenv('MYSQL_DB', 'gaming_platform'),
+        charset='utf8mb4',
+        **kwargs
+    )
+
+
+class InsertLoader:
+    """Buffers rows per table and writes them as multi-row INSERTs"""
+
+    def __init__(self, conn, batch_size):
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+
+    def add(self, table, row):
+        buffer = self.buffers.setdefault(table, [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self._flush(table)
+
+    def _flush(self, table):
+        rows = self.buffers.get(table)
+        if not rows:
+            return
+        columns = TABLE_COLUMNS[table]
+        placeholders = ', '.join(['%s'] * len(columns))
+        self.cur.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+        self.conn.commit()
+        self.counts[table] = self.counts.get(table, 0) + len(rows)
+        self.buffers[table] = []
+
+    def close(self):
+        for table in list(self.buffers):
+            self._flush(table)
+        self.cur.close()
+        return self.counts
+
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class InfileLoader:
+    """Streams rows into one TSV file per table, then LOAD DATA LOCAL INFILE"""
+
+    def __init__(self, conn, batch_size):
+        self.conn = conn
+        self.directory = tempfile.mkdtemp(prefix='gaming_dataset_')
+        self.files = {}
+        self.counts = {}
+
+    def add(self, table, row):
+        handle = self.files.get(table)
+        if handle is None:
+            handle = self.files[table] = open(os.path.join(self.directory, f'{table}.tsv'), 'w', encoding='utf-8')
+        handle.write('\t'.join(_tsv_value(value) for value in row) + '\n')
+        self.counts[table] = self.counts.get(table, 0) + 1
+
+    def close(self):
+        cur = self.conn.cursor()
+        try:
+            for table, handle in self.files.items():
+                handle.close()
+                print(f"  📥 LOAD DATA {table} ({self.counts[table]:,} rows)")
+                cur.execute(f"""
+                    LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                    CHARACTER SET utf8mb4
+                    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                    LINES TERMINATED BY '\\n'
+                    ({', '.join(TABLE_COLUMNS[table])})
+                """, (handle.name,))
+                self.conn.commit()
+        finally:
+            cur.close()
+            shutil.rmtree(self.directory, ignore_errors=True)
+        return self.counts
+
+
+class IdAllocator:
+    """Hands out ids above each table's current MAX(id)"""
+
+    def __init__(self, conn):
+        self.next_ids = {}
+        cur = conn.cursor()
+        try:
+            for table in TABLE_COLUMNS:
+                cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+                self.next_ids[table] = cur.fetchone()[0] + 1
+        finally:
+            cur.close()
+
+    def peek(self, table):
+        return self.next_ids[table]
+
+    def take(self, table, count=1):
+        first = self.next_ids[table]
+        self.next_ids[table] += count
+        return first
+
+
+class DatasetGenerator:
+    """Generates all tables in dependency order from one master seed"""
+
+    def __init__(self, loader, ids, users, rooms, transactions, seed):
+        self.loader = loader
+        self.ids = ids
+        self.user_count = users
+        self.room_count = rooms
+        self.transaction_count = transactions
+        self.seed = seed
+        self.tag = f's{seed}'
+        # Per-user gaming ID allocation: ids first_gid[u] .. first_gid[u] + gid_count[u] - 1
+        self.first_user = ids.peek('users')
+        self.first_gid = array('q')
+        self.gid_count = array('b')
+        self.team_ids = []
+
+    def rng(self, table):
+        # Separate stream per table keeps each table stable when another table's scale changes
+        return random.Random(f'{self.seed}:{table}')
+
+    @staticmethod
+    def moment(rng):
+        return EPOCH + timedelta(seconds=rng.randrange(SPAN_SECONDS))
+
+    def user_id(self, index):
+        return self.first_user + index
+
+    def random_user(self, rng):
+        return self.first_user + rng.randrange(self.user_count)
+
+    def generate(self):
+        for step in (self.users, self.gaming_ids, self.teams, self.rooms_and_enrollments,
+                     self.legacy, self.ledger):
+            started = time.time()
+            step()
+            print(f"  ✅ {step.__name__} ({time.time() - started:.1f}s)")
+
+    def users(self):
+        rng = self.rng('users')
+        self.ids.take('users', self.user_count)
+        for n in range(self.user_count):
+            is_admin = n == 0
+            username = f'{self.tag}_admin' if is_admin else f'{self.tag}_player_{n}'
+            self.loader.add('users', (self.user_id(n), username, 'password', f'9{rng.randrange(10 ** 9):09d}',
+                                      rng.randrange(0, 5000), is_admin, self.moment(rng)))
+        self.admin_id = self.user_id(0)
+
+    def gaming_ids(self):
+        rng = self.rng('user_gaming_ids')
+        platforms = ['PUBG', 'PUBG', 'PUBG', 'BGMI', 'FreeFire']
+        for n in range(self.user_count):
+            count = rng.randint(1, 3)
+            first = self.ids.take('user_gaming_ids', count)
+            self.first_gid.append(first)
+            self.gid_count.append(count)
+            for k in range(count):
+                gid = first + k
+                name = f'{self.tag}_gid_{gid}'
+                self.loader.add('user_gaming_ids', (gid, self.user_id(n), rng.choice(platforms), name,
+                                                    name, k == 0, rng.random() > 0.02, self.moment(rng)))
+                self.loader.add('user_gaming_id_stats', (self.ids.take('user_gaming_id_stats'), gid,
+                                                         0, 0, 0))
+
+    def teams(self):
+        rng = self.rng('user_teams')
+        for _ in range(max(1, self.user_count // 10)):
+            team_id = self.ids.take('user_teams')
+            owner = self.random_user(rng)
+            size = rng.randint(2, 4)
+            self.team_ids.append((team_id, owner, size))
+            self.loader.add('user_teams', (team_id, owner, f'Team {team_id}', f'team{team_id}@example.com',
+                                           size, rng.random() > 0.1, self.moment(rng)))
+            for position in range(1, size + 1):
+                self.loader.add('user_team_members', (self.ids.take('user_team_members'), team_id,
+                                                      f'member_{team_id}_{position}',
+                                                      f'{self.tag}_tm_{team_id}_{position}', position,
+                                                      self.moment(rng)))
+
+    def rooms_and_enrollments(self):
+        rng = self.rng('rooms')
+        for _ in range(self.room_count):
+            room_id = self.ids.take('rooms')
+            status = rng.choice(ROOM_STATUSES)
+            max_players = rng.choice([25, 50, 100])
+            entry_fee = rng.choice([10, 20, 50, 100])
+            created_at = self.moment(rng)
+            kill_rewards = rng.random() < 0.5
+            self.loader.add('rooms', (room_id, f'Room {room_id}', rng.choice(['Solo', 'Duo', 'Squad']),
+                                      entry_fee, entry_fee * max_players, max_players, f'G{room_id}',
+                                      f'pw{room_id}', created_at, created_at + timedelta(days=2), True, 1, 4, 2,
+                                      status, kill_rewards, 1 if kill_rewards else 0,
+                                      5.0 if kill_rewards else 0.0, 50.0 if kill_rewards else 0.0,
+                                      status in ('open', 'running')))
+
+            for position, share in ((1, 0.5), (2, 0.3), (3, 0.2)):
+                self.loader.add('room_reward_settings', (self.ids.take('room_reward_settings'), room_id, position,
+                                                         round(entry_fee * max_players * 0.8 * share, 2),
+                                                         10.0 / position, 100.0 / position))
+
+            enrolled_gids = self._room_enrollments(rng, room_id, status, max_players, entry_fee, created_at)
+
+            if status != 'open':
+                self.loader.add('room_result_status', (self.ids.take('room_result_status'), room_id,
+                                                       {'running': 'in_progress', 'completed': 'completed',
+                                                        'cancelled': 'cancelled'}[status],
+                                                       status == 'completed', status == 'completed',
+                                                       self.admin_id, created_at + timedelta(days=2)))
+            if status == 'completed' and enrolled_gids:
+                self._room_results(rng, room_id, enrolled_gids, created_at)
+
+            if rng.random() < 0.05:
+                self.loader.add('blocked_users', (self.ids.take('blocked_users'), room_id, self.random_user(rng),
+                                                  self.admin_id, 'Synthetic block', created_at))
+            if self.team_ids and rng.random() < 0.02:
+                team_id = rng.choice(self.team_ids)[0]
+                self.loader.add('blocked_teams', (self.ids.take('blocked_teams'), room_id, team_id,
+                                                  self.admin_id, 'Synthetic block', created_at))
+
+    def _room_enrollments(self, rng, room_id, status, max_players, entry_fee, created_at):
+        """Enroll distinct players until the room's fill target; returns [(gid, user_id)]"""
+        target = int(max_players * rng.random()) if status == 'open' else int(max_players * rng.uniform(0.5, 1.0))
+        players = rng.sample(range(self.user_count), min(self.user_count, target))
+        enrolled = []
+        seats = 0
+        for index in players:
+            count = min(self.gid_count[index], rng.randint(1, 3), max_players - seats)
+            if count <= 0:
+                break
+            seats += count
+            user_id = self.user_id(index)
+            enrollment_id = self.ids.take('room_user_enrollments')
+            refunded = status == 'cancelled'
+            self.loader.add('room_user_enrollments', (enrollment_id, room_id, user_id, entry_fee * count, count,
+                                                      'refunded' if refunded else 'paid', not refunded,
+                                                      created_at))
+            first = self.first_gid[index]
+            for gid in range(first, first + count):
+                self.loader.add('room_gaming_ids', (self.ids.take('room_gaming_ids'), room_id, enrollment_id,
+                                                    gid, created_at))
+                enrolled.append((gid, user_id))
+
+        if self.team_ids and seats < max_players and rng.random() < 0.2:
+            team_id, owner, size = rng.choice(self.team_ids)
+            self.loader.add('room_team_enrollments', (self.ids.take('room_team_enrollments'), room_id, team_id,
+                                                      owner, entry_fee * size, 'paid', created_at))
+        return enrolled
+
+    def _room_results(self, rng, room_id, enrolled_gids, created_at):
+        finished_at = created_at + timedelta(days=2, hours=1)
+        kills = {}
+        for gid, _ in enrolled_gids:
+            kills[gid] = rng.choice([0, 0, 1, 1, 2, 3, 5, 8])
+            self.loader.add('gaming_id_room_stats', (self.ids.take('gaming_id_room_stats'), gid, room_id, kills[gid],
+                                                     kills[gid] * 5.0, 'approved', None, self.admin_id, finished_at))
+
+        ranked = sorted(enrolled_gids, key=lambda item: kills[item[0]], reverse=True)[:3]
+        for position, (gid, user_id) in enumerate(ranked, 1):
+            base_reward = round(300.0 / position, 2)
+            kill_bonus = min(kills[gid] * 10.0 / position, 100.0 / position)
+            total = base_reward + kill_bonus
+            self.loader.add('room_winners', (self.ids.take('room_winners'), room_id, gid, position, kills[gid],
+                                             base_reward, kill_bonus, total, kills[gid] * 10 + 60 - position * 10,
+                                             True, self.admin_id, None, finished_at))
+            self.loader.add('winner_selection_history', (self.ids.take('winner_selection_history'), room_id,
+                                                         'winner_selected', gid, position, total, self.admin_id,
+                                                         'Synthetic winner', finished_at))
+            self.loader.add('winner_selection_history', (self.ids.take('winner_selection_history'), room_id,
+                                                         'rewards_distributed', gid, position, total, self.admin_id,
+                                                         'Synthetic distribution', finished_at))
+            self.loader.add('winner_rewards_log', (self.ids.take('winner_rewards_log'), room_id, user_id, gid,
+                                                   position, total, self.admin_id, finished_at))
+
+    def legacy(self):
+        """Small volumes for the pre-gaming-ID tables the app still reads"""
+        rng = self.rng('legacy')
+        first_room = self.ids.peek('rooms') - self.room_count
+        for _ in range(max(1, self.user_count // 20)):
+            user_id = self.random_user(rng)
+            room_id = first_room + rng.randrange(self.room_count)
+            when = self.moment(rng)
+            pubg = f'{self.tag}_pubg_{self.ids.peek("pubg_usernames")}'
+            self.loader.add('pubg_usernames', (self.ids.take('pubg_usernames'), user_id, pubg, when))
+
+            enrollment_id = self.ids.take('enrollments')
+            self.loader.add('enrollments', (enrollment_id, room_id, user_id, pubg, None, 'paid', when))
+            self.loader.add('enrollment_gaming_ids', (self.ids.take('enrollment_gaming_ids'), enrollment_id,
+                                                      pubg, 'PUBG', when))
+            self.loader.add('room_enrollment_members', (self.ids.take('room_enrollment_members'), enrollment_id,
+                                                        f'member_{enrollment_id}', pubg, when))
+            self.loader.add('direct_enrollments', (self.ids.take('direct_enrollments'), room_id, user_id, pubg,
+                                                   None, 20, 'paid', when))
+
+            team_id = self.ids.take('teams')
+            self.loader.add('teams', (team_id, room_id, f'Legacy Team {team_id}', None, user_id, 40, 'paid', when))
+            self.loader.add('team_members', (self.ids.take('team_members'), team_id, pubg, pubg, when))
+            self.loader.add('player_kills', (self.ids.take('player_kills'), room_id, user_id, rng.randint(0, 8),
+                                             None, 0.0, rng.random() < 0.5, when))
+
+    def ledger(self):
+        rng = self.rng('transactions')
+        kinds = [('debit', 'approved')] * 50 + [('credit', 'approved')] * 25 + \
+                [('credit_pending', 'pending')] * 5 + [('credit_pending', 'rejected')] * 2 + \
+                [('kill_reward', 'approved')] * 18
+        for _ in range(self.transaction_count):
+            transaction_id = self.ids.take('transactions')
+            kind, status = rng.choice(kinds)
+            screenshot = f'payment_{transaction_id}.png' if kind == 'credit_pending' else None
+            self.loader.add('transactions', (transaction_id, self.random_user(rng), kind, rng.choice([10, 20, 50, 100, 500]),
+                                             f'Synthetic {kind}', f'syn_{transaction_id}', screenshot, status,
+                                             self.moment(rng)))
+
+        rng = self.rng('withdrawals')
+        for _ in range(max(1, self.transaction_count // 20)):
+            requested = self.moment(rng)
+            status = rng.choice(['pending', 'approved', 'approved', 'approved', 'rejected'])
+            processed = requested + timedelta(hours=rng.randint(1, 72)) if status != 'pending' else None
+            self.loader.add('withdrawals', (self.ids.take('withdrawals'), self.random_user(rng),
+                                            rng.choice([150, 200, 500, 1000]), f'9{rng.randrange(10 ** 9):09d}',
+                                            status, None, requested, processed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Populate gaming_platform with synthetic data')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--rooms', type=int)
+    parser.add_argument('--transactions', type=int)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--method', choices=['insert', 'infile'], default='insert')
+    parser.add_argument('--batch-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    scale = dict(SCALES[args.scale])
+    for key in ('users', 'rooms', 'transactions'):
+        if getattr(args, key) is not None:
+            scale[key] = getattr(args, key)
+
+    print(f"🏭 Generating {scale['users']:,} users, {scale['rooms']:,} rooms and "
+          f"{scale['transactions']:,} transactions (seed {args.seed}, {args.method})")
+
+    conn = get_connection(local_infile=args.method == 'infile')
+    cur = conn.cursor()
+    cur.execute("SET FOREIGN_KEY_CHECKS = 0")
+    cur.close()
+
+    started = time.time()
+    try:
+        ids = IdAllocator(conn)
+        loader_class = InfileLoader if args.method == 'infile' else InsertLoader
+        loader = loader_class(conn, args.batch_size)
+        DatasetGenerator(loader, ids, scale['users'], scale['rooms'], scale['transactions'], args.seed).generate()
+        counts = loader.close()
+    finally:
+        conn.close()
+
+    print(f"\n🎉 Loaded {sum(counts.values()):,} rows in {time.time() - started:.1f}s")
+    for table in TABLE_COLUMNS:
+        if counts.get(table):
+            print(f"   - {table}: {counts[table]:,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Gunicorn configuration
+Pick a worker model with GUNICORN_PRESET (sync, gthread or gevent); worker
+and thread counts are sized from the CPU count unless overridden.
+
+  sync     one request per process; simplest, but a slow RDS query or upload
+           blocks the whole worker
+  gthread  (default) a few processes with a thread pool each, so a worker keeps
+           serving while one thread waits on MySQL
+  gevent   cooperative greenlets for many idle, long-lived connections; the
+           preset to run when the live coin and occupancy streams matter,
+           since gthread only has two stream slots per worker. mysqlclient
+           is a C driver and is not made cooperative by monkey patching, so
+           DB-heavy routes do not benefit
+
+Overrides: WEB_CONCURRENCY (workers), GUNICORN_THREADS, GUNICORN_WORKER_CONNECTIONS,
+GUNICORN_MAX_REQUESTS, GUNICORN_TIMEOUT, GUNICORN_PRELOAD (always off under
+gevent), PORT, LIVE_STREAM_MAX_CLIENTS.
+"""
+
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+# Read .env here too so GUNICORN_* and LIVE_STREAM_* settings in it apply
+load_dotenv()
+
+cpu_count = multiprocessing.cpu_count()
+
+PRESETS = {
+    'sync': {
+        'worker_class': 'sync',
+        'workers': cpu_count * 2 + 1,
+        'threads': 1,
+    },
+    'gthread': {
+        'worker_class': 'gthread',
+        'workers': cpu_count + 1,
+        'threads': 4,
+    },
+    'gevent': {
+        'worker_class': 'gevent',
+        'workers': cpu_count,
+        'threads': 1,
+        'worker_connections': 1000,
+    },
+}
+
+preset_name = os.getenv('GUNICORN_PRESET', 'gthread').lower()
+if preset_name not in PRESETS:
+    raise ValueError(f"Unknown GUNICORN_PRESET '{preset_name}', expected one of {', '.join(PRESETS)}")
+
+if preset_name == 'gevent':
+    try:
+        import gevent  # noqa: F401
+    except ImportError:
+        print("⚠️  gevent is not installed, falling back to the gthread preset")
+        preset_name = 'gthread'
+
+preset = PRESETS[preset_name]
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+worker_class = preset['worker_class']
+workers = int(os.getenv('WEB_CONCURRENCY', preset['workers']))
+threads = int(os.getenv('GUNICORN_THREADS', preset['threads']))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', preset.get('worker_connections', 1000)))
+
+# Live coin and room occupancy streams (live_feed.py) each hold a thread or
+# greenlet for minutes: none under sync, where they would trip the worker timeout, half the
+# pool under gthread so page requests always have threads left
+os.environ.setdefault('LIVE_STREAM_MAX_CLIENTS', str({
+    'sync': 0,
+    'gthread': threads // 2,
+    'gevent': worker_connections // 2,
+}[preset_name]))
+
+# Recycle workers periodically so slow leaks never accumulate; the jitter
+# keeps all workers from restarting at the same moment
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max(1, max_requests // 10)
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Import the app once in the master and fork workers from it; anything that
+# holds threads or sockets is re-initialised in post_fork below. Not under
+# gevent: the worker monkey-patches only after the fork, so locks, queues
+# and threads the app created at import in the master would stay unpatched
+# and block the whole worker instead of one greenlet
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true' and worker_class != 'gevent'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    server.log.info(f"Preset '{preset_name}': {workers} x {worker_class} workers, "
+                    f"{threads} threads, recycle after ~{max_requests} requests")
+
+
+def post_fork(server, worker):
+    """Give each worker its own per-process state after forking from the master"""
+    import random
+
+    # The master's random state is copied into every worker by fork()
+    random.seed()
+    if not server.cfg.preload_app:
+        # The worker imports the app itself after this (under gevent only once
+        # it has monkey-patched), so there is no inherited state to reset, and
+        # importing the modules here would create their locks and threads early
+        return
+
+    import app_logging
+    import db_router
+    import instrumentation
+    import live_feed
+    from slow_query_log import slow_query_log
+
+    # The log listener thread does not survive fork(); start a fresh one
+    app_logging.reinit_after_fork()
+    # Worker metrics and slow queries must not include anything from the master
+    instrumentation.registry.reset()
+    slow_query_log.clear()
+    # Replica failures seen by the master say nothing about this worker's connections
+    db_router.pool.reset()
+    # Live streams and their poller threads are per worker
+    live_feed.reset()
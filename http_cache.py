@@ -0,0 +1,49 @@
+"""
+Conditional Responses
+Lets JSON APIs answer a repeated request with 304 Not Modified before
+running their real query.
+
+    @app.route('/api/room/<int:room_id>/teams')
+    @admin_required
+    @http_cache.conditional(room_teams_version)
+    def api_room_teams(room_id): ...
+
+The version function gets the view's arguments and returns a cheap token of
+everything the payload is built from (row counts, max ids, max updated_at),
+read with an index-only query. The ETag is a hash of that token, so the
+browser's If-None-Match is answered without building the payload, and a
+token that changed falls through to the view. Responses are private (they
+need a login) and no-cache: the browser revalidates on every use, which is
+the one cheap query.
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import make_response, request
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def etag_for(version):
+    return hashlib.sha1(f'{request.path}:{version!r}'.encode()).hexdigest()
+
+
+def conditional(version_func):
+    """Serve 304 when the client's ETag matches version_func(**view_args)"""
+    def decorator(view):
+        @wraps(view)
+        def decorated_function(*args, **kwargs):
+            etag = etag_for(version_func(**kwargs))
+            # Weak comparison: compressed responses carry a weak ETag (see compression.py)
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = CACHE_CONTROL
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,253 @@
+"""
+Request Instrumentation
+Counts queries, fetched rows and DB time per request through a cursor wrapper,
+times every endpoint and keeps rolling latency percentiles in memory.
+
+Stats live in the worker process, so every gunicorn worker reports its own
+numbers; the admin JSON endpoint and the Prometheus exposition include the pid.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from flask import current_app, g, has_request_context, request
+from MySQLdb.cursors import Cursor
+
+from slow_query_log import normalize_sql, slow_query_log
+
+# Number of most recent requests kept per endpoint for percentile calculation
+LATENCY_WINDOW = int(os.getenv('METRICS_LATENCY_WINDOW', 1024))
+PERCENTILES = (50, 95, 99)
+METRIC_PREFIX = 'gaming_platform'
+WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class InstrumentedCursor(Cursor):
+    """MySQLdb cursor that reports every statement to the current request
+    and hands slow ones to the slow query log"""
+
+    _in_executemany = False
+
+    def execute(self, query, args=None):
+        if self._in_executemany:
+            return super().execute(query, args)
+        start = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            duration = time.perf_counter() - start
+            record_query(duration, query)
+            slow_query_log.maybe_record(self.connection, query, args, duration, self.rowcount)
+
+    def executemany(self, query, args):
+        start = time.perf_counter()
+        self._in_executemany = True
+        try:
+            return super().executemany(query, args)
+        finally:
+            self._in_executemany = False
+            record_query(time.perf_counter() - start, query)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            record_rows(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size)
+        record_rows(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        record_rows(len(rows))
+        return rows
+
+
+def _request_stats():
+    if not has_request_context():
+        return None
+    stats = g.get('db_stats')
+    if stats is None:
+        stats = g.db_stats = {'queries': 0, 'rows': 0, 'db_time': 0.0, 'writes': 0}
+        # Statement text is only kept when asked for (query budget tests)
+        if current_app.config.get('DB_TRACK_STATEMENTS'):
+            stats['statements'] = []
+    return stats
+
+
+def record_query(duration, query=None):
+    """Add one executed statement to the current request's stats"""
+    stats = _request_stats()
+    if stats is not None:
+        stats['queries'] += 1
+        stats['db_time'] += duration
+        if isinstance(query, str) and query.lstrip()[:7].upper().startswith(WRITE_VERBS):
+            stats['writes'] += 1
+        if query is not None and 'statements' in stats:
+            stats['statements'].append(normalize_sql(query))
+
+
+def record_rows(count):
+    """Add fetched rows to the current request's stats"""
+    stats = _request_stats()
+    if stats is not None:
+        stats['rows'] += count
+
+
+def current_request_stats():
+    """Query count, rows fetched, DB seconds and writes for the request in progress"""
+    stats = _request_stats()
+    return dict(stats) if stats is not None else {'queries': 0, 'rows': 0, 'db_time': 0.0, 'writes': 0}
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class EndpointStats:
+    """Rolling per-endpoint latency window plus lifetime counters"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.query_counts = deque(maxlen=LATENCY_WINDOW)
+
+    def add(self, duration, db_stats, status_code):
+        self.count += 1
+        self.total_time += duration
+        self.queries += db_stats['queries']
+        self.rows += db_stats['rows']
+        self.db_time += db_stats['db_time']
+        self.latencies.append(duration)
+        self.query_counts.append(db_stats['queries'])
+        if status_code >= 500:
+            self.errors += 1
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'total_time': round(self.total_time, 6),
+            'queries': self.queries,
+            'rows': self.rows,
+            'db_time': round(self.db_time, 6),
+            'avg_queries': round(self.queries / self.count, 2) if self.count else 0,
+            'max_queries': max(self.query_counts) if self.query_counts else 0,
+            'latency': {f'p{pct}': round(_percentile(latencies, pct), 6) for pct in PERCENTILES},
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe map of endpoint name to EndpointStats"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self.started_at = time.time()
+
+    def record(self, endpoint, duration, db_stats, status_code):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.add(duration, db_stats, status_code)
+
+    def snapshot(self):
+        with self._lock:
+            endpoints = {name: stats.snapshot() for name, stats in self._endpoints.items()}
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 1),
+            'window': LATENCY_WINDOW,
+            'endpoints': endpoints,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
+
+
+registry = MetricsRegistry()
+
+
+def _start_timer():
+    g.request_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+
+    duration = time.perf_counter() - started
+    db_stats = current_request_stats()
+    endpoint = request.endpoint or 'unmatched'
+    registry.record(endpoint, duration, db_stats, response.status_code)
+
+    response.headers['Server-Timing'] = (
+        f"db;dur={db_stats['db_time'] * 1000:.1f};desc=\"{db_stats['queries']} queries\", "
+        f"app;dur={duration * 1000:.1f}"
+    )
+    return response
+
+
+def init_app(app):
+    """Route every cursor through InstrumentedCursor and time each request"""
+    options = dict(app.config.get('MYSQL_CUSTOM_OPTIONS') or {})
+    options['cursorclass'] = InstrumentedCursor
+    app.config['MYSQL_CUSTOM_OPTIONS'] = options
+
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+
+def prometheus_text(snapshot=None):
+    """Render the registry in the Prometheus text exposition format"""
+    snapshot = snapshot or registry.snapshot()
+    pid = snapshot['pid']
+    lines = [
+        f'# HELP {METRIC_PREFIX}_request_duration_seconds Request latency over the last {snapshot["window"]} requests per endpoint',
+        f'# TYPE {METRIC_PREFIX}_request_duration_seconds summary',
+    ]
+    counters = [
+        ('requests_total', 'count', 'Requests handled'),
+        ('request_errors_total', 'errors', 'Requests answered with a 5xx status'),
+        ('db_queries_total', 'queries', 'SQL statements executed'),
+        ('db_rows_fetched_total', 'rows', 'Rows fetched from MySQL'),
+        ('db_time_seconds_total', 'db_time', 'Seconds spent waiting on MySQL'),
+    ]
+
+    for endpoint, stats in sorted(snapshot['endpoints'].items()):
+        labels = f'endpoint="{_label(endpoint)}",pid="{pid}"'
+        for pct in PERCENTILES:
+            value = stats['latency'][f'p{pct}']
+            lines.append(f'{METRIC_PREFIX}_request_duration_seconds{{{labels},quantile="{pct / 100}"}} {value}')
+        lines.append(f'{METRIC_PREFIX}_request_duration_seconds_sum{{{labels}}} {stats["total_time"]}')
+        lines.append(f'{METRIC_PREFIX}_request_duration_seconds_count{{{labels}}} {stats["count"]}')
+
+    for name, key, help_text in counters:
+        lines.append(f'# HELP {METRIC_PREFIX}_{name} {help_text}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_{name} counter')
+        for endpoint, stats in sorted(snapshot['endpoints'].items()):
+            labels = f'endpoint="{_label(endpoint)}",pid="{pid}"'
+            lines.append(f'{METRIC_PREFIX}_{name}{{{labels}}} {stats[key]}')
+
+    return '\n'.join(lines) + '\n'
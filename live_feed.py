@@ -0,0 +1,227 @@
+"""
+Live Feeds
+Shared plumbing for the Server-Sent Event streams in coin_feed.py and
+room_feed.py.
+
+A FeedHub is an in-process pub/sub of the streams open in one worker, keyed
+by what they watch (a user id, a room id). One background thread per hub
+polls MySQL for rows changed since its last poll and publishes the new
+values, so the number of queries does not grow with the number of open
+streams, and changes committed by any worker or script reach every tab.
+Routes call notify_changed() after committing, which wakes every poller at
+once so the same worker's tabs update immediately.
+
+An open stream holds a worker thread (gthread) or greenlet (gevent) for up
+to LIVE_STREAM_MAX_SECONDS; the browser reconnects by itself afterwards.
+LIVE_STREAM_MAX_CLIENTS caps the streams of all feeds together per worker
+so they never starve page requests; above the cap a stream answers 503 and
+the page falls back to what it did before (refreshing on focus or reload).
+"""
+
+import json
+import queue
+import threading
+import time
+
+import MySQLdb
+
+import app_logging
+
+# Rows are re-read this far back so a transaction that committed late is not missed
+LOOKBACK_SECONDS = 5
+KEEPALIVE_SECONDS = 15
+
+log = app_logging.get_logger('live_feed')
+
+_hubs = []
+_streams_lock = threading.Lock()
+_open_streams = 0
+
+
+class FeedHub:
+    """Streams of this worker by key, fed by one poller thread; subclasses implement _poll()"""
+
+    name = 'feed'
+
+    def __init__(self, poll_seconds):
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._last = {}
+        self._wake = threading.Event()
+        self._poller = None
+        self._config = None
+        _hubs.append(self)
+
+    def subscribe(self, key, value=None):
+        stream = queue.Queue(maxsize=16)
+        with self._lock:
+            self._subscribers.setdefault(key, set()).add(stream)
+            if value is not None:
+                self._last[key] = value
+        return stream
+
+    def unsubscribe(self, key, stream):
+        with self._lock:
+            streams = self._subscribers.get(key)
+            if streams is None:
+                return
+            streams.discard(stream)
+            if not streams:
+                del self._subscribers[key]
+                self._last.pop(key, None)
+
+    def subscribed_keys(self):
+        with self._lock:
+            return set(self._subscribers)
+
+    def publish(self, key, value):
+        """Send a value to the key's streams if it differs from the last one sent"""
+        with self._lock:
+            if key not in self._subscribers or self._last.get(key) == value:
+                return
+            self._last[key] = value
+        self.deliver(key, value)
+
+    def deliver(self, key, value):
+        """Send a value to the key's streams as it is"""
+        with self._lock:
+            streams = list(self._subscribers.get(key, ()))
+        for stream in streams:
+            try:
+                stream.put_nowait(value)
+            except queue.Full:
+                # A stalled client only needs the latest value
+                pass
+
+    def notify_changed(self):
+        self._wake.set()
+
+    def ensure_poller(self, config):
+        """Start the poller thread on the first stream (never in the gunicorn master)"""
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._config = dict(config)
+            self._poller = threading.Thread(target=self._poll_loop, name=self.name, daemon=True)
+            self._poller.start()
+
+    def reset(self):
+        """Drop all state, e.g. in a freshly forked worker"""
+        with self._lock:
+            self._subscribers.clear()
+            self._last.clear()
+            self._poller = None
+        self._wake = threading.Event()
+
+    def _connect(self):
+        config = self._config
+        return MySQLdb.connect(
+            host=config['MYSQL_HOST'],
+            user=config['MYSQL_USER'],
+            passwd=config['MYSQL_PASSWORD'],
+            db=config['MYSQL_DB'],
+            autocommit=True
+        )
+
+    def _poll_loop(self):
+        connection = None
+        since = None
+        while True:
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            with self._lock:
+                if not self._subscribers:
+                    continue
+            try:
+                if connection is None:
+                    connection = self._connect()
+                cur = connection.cursor()
+                try:
+                    if since is None:
+                        cur.execute("SELECT NOW()")
+                        since = cur.fetchone()[0]
+                    since = self._poll(cur, since)
+                finally:
+                    cur.close()
+            except MySQLdb.Error as e:
+                log.warning("%s poll failed, reconnecting: %s", self.name, e)
+                try:
+                    if connection is not None:
+                        connection.close()
+                except MySQLdb.Error:
+                    pass
+                connection = None
+                time.sleep(self.poll_seconds)
+
+    def _poll(self, cur, since):
+        """Publish what changed since `since`; returns the new cursor"""
+        raise NotImplementedError
+
+
+def notify_changed():
+    """Wake every feed's poller; call after committing a change a feed shows"""
+    for hub in _hubs:
+        hub.notify_changed()
+
+
+def reset():
+    global _open_streams
+    for hub in _hubs:
+        hub.reset()
+    with _streams_lock:
+        _open_streams = 0
+
+
+def reserve_slot(config):
+    """Take one of this worker's stream slots (LIVE_STREAM_MAX_CLIENTS); False if none is free.
+
+    The check and the count happen under one lock, so concurrent requests
+    cannot all see the last free slot. Every True must be paired with one
+    release_slot(), which live_stream_response (app.py) registers on the
+    response's close so it runs even if the stream never starts.
+    """
+    global _open_streams
+    with _streams_lock:
+        if _open_streams >= int(config.get('LIVE_STREAM_MAX_CLIENTS', 2)):
+            return False
+        _open_streams += 1
+        return True
+
+
+def release_slot():
+    global _open_streams
+    with _streams_lock:
+        _open_streams = max(_open_streams - 1, 0)
+
+
+def sse(payload, event=None):
+    message = f"event: {event}\n" if event else ''
+    return message + f"data: {json.dumps(payload)}\n\n"
+
+
+def event_stream(hub, key, first_events, config, render, value=None):
+    """Generator for one text/event-stream response.
+
+    first_events are sent as they are; every value then published for `key`
+    is sent as render(value). `value` is what the first events already show,
+    so it is not sent twice. Nothing is subscribed until the server starts
+    iterating; the stream slot is the caller's (see reserve_slot).
+    """
+    max_seconds = float(config.get('LIVE_STREAM_MAX_SECONDS', 300))
+    hub.ensure_poller(config)
+    stream = hub.subscribe(key, value)
+    try:
+        yield "retry: 5000\n\n"
+        for message in first_events:
+            yield message
+        deadline = time.monotonic() + max_seconds
+        while time.monotonic() < deadline:
+            try:
+                value = stream.get(timeout=KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield render(value)
+    finally:
+        hub.unsubscribe(key, stream)
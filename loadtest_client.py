@@ -0,0 +1,109 @@
+"""
+Load Test Client
+Small cookie-keeping HTTP client plus latency bookkeeping shared by the
+benchmark scripts. Uses only the standard library so it runs anywhere the
+app does.
+"""
+
+import http.cookiejar
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+class Session:
+    """One simulated browser: keeps the Flask session cookie between requests"""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+        self.last_url = None
+
+    def request(self, path, data=None, method=None, headers=None):
+        """Return (status, seconds, body); network errors come back as status 0"""
+        url = self.base_url + path
+        body = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        req = urllib.request.Request(url, data=body, method=method, headers=headers or {})
+        start = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=self.timeout) as response:
+                payload = response.read()
+                self.last_url = response.geturl()
+                return response.status, time.perf_counter() - start, payload
+        except urllib.error.HTTPError as e:
+            return e.code, time.perf_counter() - start, e.read()
+        except (urllib.error.URLError, OSError):
+            return 0, time.perf_counter() - start, b''
+
+    def get(self, path, headers=None):
+        return self.request(path, headers=headers)
+
+    def post(self, path, data):
+        return self.request(path, data=data, method='POST')
+
+    def login(self, username, password):
+        """Log in through the form; a successful login redirects away from /login"""
+        status, _, _ = self.post('/login', {'username': username, 'password': password})
+        return status == 200 and not (self.last_url or '').endswith('/login')
+
+
+def wait_until_up(base_url, timeout=30):
+    """Poll /health until the server answers"""
+    deadline = time.time() + timeout
+    session = Session(base_url, timeout=2)
+    while time.time() < deadline:
+        status, _, _ = session.get('/health')
+        if status in (200, 503):
+            return True
+        time.sleep(0.25)
+    return False
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LatencyRecorder:
+    """Thread-safe per-label latency and status collection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.failures = {}
+
+    def add(self, label, seconds, ok=True):
+        with self._lock:
+            self.samples.setdefault(label, []).append(seconds)
+            if not ok:
+                self.failures[label] = self.failures.get(label, 0) + 1
+
+    def summary(self, elapsed):
+        """Per-label request count, throughput, failures and p50/p95/p99 in ms"""
+        report = {}
+        with self._lock:
+            for label, values in self.samples.items():
+                ordered = sorted(values)
+                report[label] = {
+                    'requests': len(ordered),
+                    'rps': round(len(ordered) / elapsed, 1) if elapsed else 0,
+                    'failures': self.failures.get(label, 0),
+                    'p50_ms': round(percentile(ordered, 50) * 1000, 1),
+                    'p95_ms': round(percentile(ordered, 95) * 1000, 1),
+                    'p99_ms': round(percentile(ordered, 99) * 1000, 1),
+                }
+        return report
+
+
+def print_report(title, report):
+    print(f"\n📊 {title}")
+    print(f"  {'route':<28}{'reqs':>8}{'req/s':>9}{'fail':>7}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for label, row in sorted(report.items()):
+        print(f"  {label:<28}{row['requests']:>8}{row['rps']:>9}{row['failures']:>7}"
+              f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}")
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Tournament Join Rush Load Test
+Seeds synthetic players, gaming IDs and rooms, then has many logged-in
+players rush the same few rooms while admins browse their pages.
+Reports throughput, latency percentiles and invariant violations.
+
+    python loadtest_join_rush.py seed --users 2000 --rooms 20
+    python loadtest_join_rush.py run --base-url http://127.0.0.1:5000 --clients 200 --duration 60
+    python loadtest_join_rush.py check
+    python loadtest_join_rush.py reset
+
+Every seeded row is prefixed with 'loadtest' so `reset` removes exactly the
+synthetic data (enrollments and stats cascade with their users and rooms).
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+
+from dotenv import load_dotenv
+import MySQLdb
+
+from loadtest_client import LatencyRecorder, Session, print_report, wait_until_up
+
+load_dotenv()
+
+USER_PREFIX = 'loadtest_user_'
+ROOM_PREFIX = 'Loadtest Room '
+PASSWORD = 'loadtest'
+BATCH_SIZE = 1000
+
+
+def get_connection():
+    return MySQLdb.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        passwd=os.getenv('MYSQL_PASSWORD', '1111'),
+        db=os.getenv('MYSQL_DB', 'gaming_platform')
+    )
+
+
+def _insert_batches(cur, sql, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        cur.executemany(sql, rows[start:start + BATCH_SIZE])
+
+
+def seed(args):
+    """Create players with 1-3 gaming IDs each and a set of contested rooms"""
+    rng = random.Random(args.seed)
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        users = [(f'{USER_PREFIX}{n}', PASSWORD, f'90000{n:05d}', args.coins) for n in range(args.users)]
+        _insert_batches(cur, """
+            INSERT IGNORE INTO users (username, password, gpay_number, coins)
+            VALUES (%s, %s, %s, %s)
+        """, users)
+
+        cur.execute("SELECT id, username FROM users WHERE username LIKE %s", (USER_PREFIX + '%',))
+        user_ids = [row[0] for row in cur.fetchall()]
+
+        gaming_ids = []
+        for user_id in user_ids:
+            for n in range(rng.randint(1, 3)):
+                name = f'lt_{user_id}_{n}'
+                gaming_ids.append((user_id, 'PUBG', name, name, n == 0))
+        _insert_batches(cur, """
+            INSERT INTO user_gaming_ids (user_id, gaming_platform, gaming_username, display_name, is_primary)
+            VALUES (%s, %s, %s, %s, %s)
+        """, gaming_ids)
+        cur.execute("""
+            INSERT IGNORE INTO user_gaming_id_stats (user_gaming_id)
+            SELECT g.id FROM user_gaming_ids g
+            JOIN users u ON g.user_id = u.id
+            WHERE u.username LIKE %s
+        """, (USER_PREFIX + '%',))
+
+        rooms = [(f'{ROOM_PREFIX}{n}', 'PUBG', args.entry_fee, args.entry_fee * args.room_size,
+                  args.room_size, f'LT{n}', 'loadtest') for n in range(args.rooms)]
+        _insert_batches(cur, """
+            INSERT INTO rooms (room_name, game_type, entry_fee, prize_pool, max_players,
+                               room_id_game, room_password, status, is_active)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, 'open', TRUE)
+        """, rooms)
+
+        conn.commit()
+        print(f"✅ Seeded {len(user_ids)} players, {len(gaming_ids)} gaming IDs and {len(rooms)} rooms")
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+def reset(args):
+    """Delete all loadtest players and rooms"""
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM rooms WHERE room_name LIKE %s", (ROOM_PREFIX + '%',))
+        rooms = cur.rowcount
+        cur.execute("DELETE FROM users WHERE username LIKE %s", (USER_PREFIX + '%',))
+        users = cur.rowcount
+        conn.commit()
+        print(f"🧹 Removed {users} players and {rooms} rooms")
+    finally:
+        cur.close()
+        conn.close()
+
+
+def check_invariants(conn):
+    """Return a dict of violation name -> offending rows"""
+    cur = conn.cursor()
+    try:
+        violations = {}
+
+        cur.execute("""
+            SELECT r.id, r.room_name, r.max_players, SUM(rue.gaming_ids_count) AS players
+            FROM rooms r
+            JOIN room_user_enrollments rue ON rue.room_id = r.id
+            WHERE rue.payment_status = 'paid' AND rue.is_active = TRUE
+            GROUP BY r.id, r.room_name, r.max_players
+            HAVING players > r.max_players
+        """)
+        violations['overbooked_rooms'] = cur.fetchall()
+
+        cur.execute("SELECT id, username, coins FROM users WHERE coins < 0")
+        violations['negative_coins'] = cur.fetchall()
+
+        cur.execute("""
+            SELECT rue.room_id, rgi.user_gaming_id, COUNT(*) AS enrollments
+            FROM room_gaming_ids rgi
+            JOIN room_user_enrollments rue ON rgi.room_user_enrollment_id = rue.id
+            WHERE rue.is_active = TRUE
+            GROUP BY rue.room_id, rgi.user_gaming_id
+            HAVING enrollments > 1
+        """)
+        violations['duplicate_gaming_ids'] = cur.fetchall()
+
+        cur.execute("""
+            SELECT room_id, user_id, COUNT(*) AS enrollments
+            FROM room_user_enrollments
+            WHERE is_active = TRUE
+            GROUP BY room_id, user_id
+            HAVING enrollments > 1
+        """)
+        violations['duplicate_user_enrollments'] = cur.fetchall()
+
+        return violations
+    finally:
+        cur.close()
+
+
+def check(args):
+    conn = get_connection()
+    try:
+        _print_violations(check_invariants(conn))
+    finally:
+        conn.close()
+
+
+def _print_violations(violations):
+    print("\n🔍 Invariants")
+    clean = True
+    for name, rows in violations.items():
+        if rows:
+            clean = False
+            print(f"  ❌ {name}: {len(rows)}")
+            for row in rows[:5]:
+                print(f"     {row}")
+        else:
+            print(f"  ✅ {name}")
+    return clean
+
+
+def _load_fixture(conn, room_limit):
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            SELECT u.username, g.id
+            FROM users u
+            JOIN user_gaming_ids g ON g.user_id = u.id AND g.is_active = TRUE
+            WHERE u.username LIKE %s
+        """, (USER_PREFIX + '%',))
+        players = {}
+        for username, gaming_id in cur.fetchall():
+            players.setdefault(username, []).append(gaming_id)
+
+        cur.execute("SELECT id FROM rooms WHERE room_name LIKE %s ORDER BY id LIMIT %s",
+                    (ROOM_PREFIX + '%', room_limit))
+        room_ids = [row[0] for row in cur.fetchall()]
+        return players, room_ids
+    finally:
+        cur.close()
+
+
+def run(args):
+    """Drive the join rush against a running server"""
+    if not wait_until_up(args.base_url):
+        print(f"❌ {args.base_url} is not answering /health")
+        return
+
+    conn = get_connection()
+    try:
+        players, room_ids = _load_fixture(conn, args.rooms)
+    finally:
+        conn.close()
+    if not players or not room_ids:
+        print("❌ No loadtest data found, run the seed command first")
+        return
+
+    recorder = LatencyRecorder()
+    outcomes = {'joined': 0, 'rejected': 0, 'login_failed': 0}
+    outcome_lock = threading.Lock()
+    usernames = sorted(players)
+    stop_at = time.time() + args.duration
+
+    def count(outcome):
+        with outcome_lock:
+            outcomes[outcome] += 1
+
+    def player(index):
+        rng = random.Random(args.seed + index)
+        while time.time() < stop_at:
+            username = usernames[rng.randrange(len(usernames))]
+            session = Session(args.base_url)
+            if not session.login(username, PASSWORD):
+                count('login_failed')
+                continue
+
+            room_id = rng.choice(room_ids)
+            for label, path in (('GET /home', '/home'),
+                                ('GET /room/<id>', f'/room/{room_id}'),
+                                ('GET join page', f'/room/{room_id}/join_with_gaming_ids')):
+                status, seconds, _ = session.get(path)
+                recorder.add(label, seconds, ok=status == 200)
+
+            gaming_ids = players[username]
+            selected = rng.sample(gaming_ids, rng.randint(1, len(gaming_ids)))
+            status, seconds, body = session.post(f'/room/{room_id}/join_with_gaming_ids',
+                                                 {'selected_gaming_ids': [str(gid) for gid in selected]})
+            recorder.add('POST join', seconds, ok=status == 200)
+            count('joined' if b'Successfully joined the tournament' in body else 'rejected')
+
+            status, seconds, _ = session.get(f'/room/{room_id}/enrollments')
+            recorder.add('GET enrollments', seconds, ok=status == 200)
+
+    def admin(index):
+        session = Session(args.base_url)
+        if not session.login(args.admin_user, args.admin_password):
+            count('login_failed')
+            return
+        pages = [('GET /admin', '/admin'), ('GET /admin/rooms', '/admin/rooms'),
+                 ('GET /admin/winners', '/admin/winners')]
+        while time.time() < stop_at:
+            for label, path in pages:
+                status, seconds, _ = session.get(path)
+                recorder.add(label, seconds, ok=status == 200)
+
+    threads = [threading.Thread(target=player, args=(i,)) for i in range(args.clients)]
+    threads += [threading.Thread(target=admin, args=(i,)) for i in range(args.admins)]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+
+    report = recorder.summary(elapsed)
+    print_report(f"Join rush: {args.clients} players + {args.admins} admins for {elapsed:.0f}s", report)
+    total = sum(row['requests'] for row in report.values())
+    print(f"\n  Total: {total} requests, {total / elapsed:.1f} req/s")
+    print(f"  Joins: {outcomes['joined']} accepted, {outcomes['rejected']} rejected, "
+          f"{outcomes['login_failed']} failed logins")
+
+    conn = get_connection()
+    try:
+        clean = _print_violations(check_invariants(conn))
+    finally:
+        conn.close()
+    if not clean:
+        raise SystemExit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tournament join rush load test')
+    parser.add_argument('--seed', type=int, default=42, help='random seed')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    seed_parser = commands.add_parser('seed', help='create synthetic players and rooms')
+    seed_parser.add_argument('--users', type=int, default=2000)
+    seed_parser.add_argument('--rooms', type=int, default=20)
+    seed_parser.add_argument('--room-size', type=int, default=100, help='max_players per room')
+    seed_parser.add_argument('--entry-fee', type=int, default=10)
+    seed_parser.add_argument('--coins', type=int, default=1000)
+    seed_parser.set_defaults(func=seed)
+
+    run_parser = commands.add_parser('run', help='drive concurrent traffic')
+    run_parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    run_parser.add_argument('--clients', type=int, default=100)
+    run_parser.add_argument('--admins', type=int, default=2)
+    run_parser.add_argument('--duration', type=int, default=60)
+    run_parser.add_argument('--rooms', type=int, default=5, help='how many seeded rooms to contend for')
+    run_parser.add_argument('--admin-user', default='admin')
+    run_parser.add_argument('--admin-password', default='admin123')
+    run_parser.set_defaults(func=run)
+
+    commands.add_parser('check', help='report invariant violations').set_defaults(func=check)
+    commands.add_parser('reset', help='delete synthetic data').set_defaults(func=reset)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
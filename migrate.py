@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Schema Migration Runner
+Applies the numbered files in migrations/ in order and records each one in a
+schema_migrations table, so every environment can tell exactly which schema
+it is on and the app can refuse to start against an out-of-date database.
+
+    python migrate.py status
+    python migrate.py up
+    python migrate.py up --allow-locking     # permit blocking ALTERs on large tables
+
+An empty database (no users table) is created from
+complete_database_schema.sql, which is kept at the shape of the latest
+migration, and every migration is recorded as applied. The migrations bring a
+database created from an earlier complete_database_schema.sql to the same
+shape. A database created from the original database.sql has no tables or
+columns for the features added since (winners, rewards, kill stats, ...),
+which no migration creates; the migrations skip the changes that depend on
+them, so such a database can still be migrated but needs those tables created
+from complete_database_schema.sql before the app can use it. Every migration is idempotent (it checks
+information_schema before changing anything), so it is safe to re-run after
+a failure. MySQL commits DDL implicitly, which is why idempotency rather
+than rollback is what makes a half-applied migration recoverable. A
+migration's data changes run in its transaction unless it commits them
+itself, as the 0006 (per chunk) and 0012 backfills do.
+
+Large tables are altered online: ALGORITHM=INSTANT, then INPLACE with
+LOCK=NONE, and only tables below MIGRATION_LARGE_TABLE_ROWS may fall back to a
+locking table copy. A short lock_wait_timeout keeps a migration from queueing
+live queries behind a metadata lock.
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import time
+
+from dotenv import load_dotenv
+import MySQLdb
+
+import app_logging
+from sql_script import creation_levels, split_sql_statements
+
+load_dotenv()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'complete_database_schema.sql')
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+LOCK_NAME = 'gaming_platform_schema_migrations'
+LARGE_TABLE_ROWS = int(os.getenv('MIGRATION_LARGE_TABLE_ROWS', 1000000))
+LOCK_WAIT_TIMEOUT = int(os.getenv('MIGRATION_LOCK_WAIT_TIMEOUT', 5))
+# The requested ALGORITHM/LOCK is not possible for this change (1845, 1846),
+# or the server predates the keyword (1064 syntax error)
+ALTER_NOT_SUPPORTED = (1845, 1846, 1064)
+
+log = app_logging.get_logger('migrations')
+
+
+class MigrationError(Exception):
+    pass
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def get_connection(config=None):
+    config = config or {}
+    return MySQLdb.connect(
+        host=config.get('MYSQL_HOST') or os.getenv('MYSQL_HOST', 'localhost'),
+        user=config.get('MYSQL_USER') or os.getenv('MYSQL_USER', 'root'),
+        passwd=config.get('MYSQL_PASSWORD') or os.getenv('MYSQL_PASSWORD', '1111'),
+        db=config.get('MYSQL_DB') or os.getenv('MYSQL_DB', 'gaming_platform')
+    )
+
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Return [(version, name, path, checksum)] sorted by version"""
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        path = os.path.join(directory, filename)
+        with open(path, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()
+        migrations.append((match.group(1), match.group(2), path, checksum))
+
+    versions = [m[0] for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise MigrationError(f"Duplicate migration version in {directory}")
+    return migrations
+
+
+def ensure_version_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(16) PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            execution_ms INT NOT NULL
+        )
+    """)
+
+
+def applied_migrations(cur):
+    """{version: checksum}, or None when the version table does not exist yet"""
+    cur.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'schema_migrations'
+    """)
+    if not cur.fetchone()[0]:
+        return None
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cur.fetchall())
+
+
+def is_empty_database(cur):
+    cur.execute("""
+        SELECT COUNT(*) FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users'
+    """)
+    return not cur.fetchone()[0]
+
+
+def create_from_schema(conn, path=SCHEMA_FILE):
+    """Run the schema file on an empty database, each table after the ones it references"""
+    if not os.path.exists(path):
+        raise MigrationError(f"The database is empty and {os.path.basename(path)} is missing")
+    with open(path, encoding='utf-8') as f:
+        statements = split_sql_statements(f.read())
+    levels, others = creation_levels(statements)
+    tables = [index for level in levels for index, _ in level]
+    # Statements before the first CREATE TABLE set the scene, the rest (seed rows) need the tables
+    first_create = min(tables, default=len(statements))
+    order = ([index for index in others if index < first_create] + tables
+             + [index for index in others if index > first_create])
+    cur = conn.cursor()
+    try:
+        for index in order:
+            try:
+                cur.execute(statements[index])
+            except MySQLdb.Error as e:
+                raise MigrationError(f"{os.path.basename(path)} statement {index + 1} failed: {e}")
+        conn.commit()
+    finally:
+        cur.close()
+    return len(tables)
+
+
+def pending_migrations(conn):
+    cur = conn.cursor()
+    try:
+        applied = applied_migrations(cur) or {}
+    finally:
+        cur.close()
+    return [m for m in discover_migrations() if m[0] not in applied]
+
+
+class Migration:
+    """What a migration's upgrade() receives: a cursor plus idempotent schema helpers"""
+
+    def __init__(self, conn, allow_locking=False):
+        self.conn = conn
+        self.cur = conn.cursor()
+        self.allow_locking = allow_locking
+
+    def execute(self, sql, args=None):
+        self.cur.execute(sql, args)
+        return self.cur
+
+    def scalar(self, sql, args=None):
+        self.cur.execute(sql, args)
+        row = self.cur.fetchone()
+        return row[0] if row else None
+
+    def table_exists(self, table):
+        return bool(self.scalar("""
+            SELECT COUNT(*) FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,)))
+
+    def column_exists(self, table, column):
+        return bool(self.scalar("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column)))
+
+    def columns_exist(self, table, columns):
+        """Whether every column of an index column list such as 'a, b DESC' exists"""
+        names = [column.split()[0] for column in columns.split(',')]
+        return all(self.column_exists(table, name) for name in names)
+
+    def column_type(self, table, column):
+        return self.scalar("""
+            SELECT COLUMN_TYPE FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column))
+
+    def index_exists(self, table, index):
+        return bool(self.scalar("""
+            SELECT COUNT(*) FROM information_schema.STATISTICS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        """, (table, index)))
+
+    def constraint_exists(self, table, constraint):
+        return bool(self.scalar("""
+            SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = %s
+        """, (table, constraint)))
+
+    def approximate_rows(self, table):
+        return self.scalar("""
+            SELECT COALESCE(TABLE_ROWS, 0) FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, (table,)) or 0
+
+    def alter(self, table, clause):
+        """ALTER TABLE without blocking writers: INSTANT, then INPLACE/LOCK=NONE,
+        then a table copy only if the table is small or locking was allowed"""
+        for algorithm in ('ALGORITHM=INSTANT', 'ALGORITHM=INPLACE, LOCK=NONE'):
+            try:
+                self.cur.execute(f"ALTER TABLE {table} {clause}, {algorithm}")
+                log.info("Altered %s (%s): %s", table, algorithm, clause)
+                return
+            except MySQLdb.Error as e:
+                if e.args[0] not in ALTER_NOT_SUPPORTED:
+                    raise
+
+        rows = self.approximate_rows(table)
+        if rows >= LARGE_TABLE_ROWS and not self.allow_locking:
+            raise MigrationError(
+                f"ALTER TABLE {table} {clause} cannot run online and {table} has ~{rows:,} rows; "
+                f"run it with pt-online-schema-change/gh-ost or re-run with --allow-locking in a quiet window")
+        self.cur.execute(f"ALTER TABLE {table} {clause}")
+        log.info("Altered %s with a table copy (~%s rows): %s", table, rows, clause)
+
+    def add_column(self, table, column, definition):
+        if not self.column_exists(table, column):
+            self.alter(table, f"ADD COLUMN {column} {definition}")
+
+    def add_index(self, table, index, columns, unique=False):
+        if not self.index_exists(table, index):
+            kind = 'UNIQUE INDEX' if unique else 'INDEX'
+            self.alter(table, f"ADD {kind} {index} ({columns})")
+
+    def drop_index(self, table, index):
+        if self.index_exists(table, index):
+            self.alter(table, f"DROP INDEX {index}")
+
+    def create_table(self, table, body):
+        self.cur.execute(f"CREATE TABLE IF NOT EXISTS {table} ({body})")
+
+    def close(self):
+        self.cur.close()
+
+
+def _load_module(version, name, path):
+    spec = importlib.util.spec_from_file_location(f'migration_{version}_{name}', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, 'upgrade'):
+        raise MigrationError(f"{os.path.basename(path)} has no upgrade(migration) function")
+    return module
+
+
+def apply_migration(conn, version, name, path, checksum, allow_locking=False):
+    module = _load_module(version, name, path)
+    migration = Migration(conn, allow_locking)
+    started = time.time()
+    try:
+        conn.begin()
+        module.upgrade(migration)
+        elapsed_ms = int((time.time() - started) * 1000)
+        migration.execute("""
+            INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+            VALUES (%s, %s, %s, %s)
+        """, (version, name, checksum, elapsed_ms))
+        conn.commit()
+        return elapsed_ms
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        migration.close()
+
+
+def migrate_up(conn, allow_locking=False):
+    """Apply all pending migrations under a server-side lock; returns the versions applied"""
+    cur = conn.cursor()
+    try:
+        cur.execute("SET SESSION lock_wait_timeout = %s", (LOCK_WAIT_TIMEOUT,))
+        cur.execute("SELECT GET_LOCK(%s, 60)", (LOCK_NAME,))
+        if cur.fetchone()[0] != 1:
+            raise MigrationError("Another migration run holds the lock")
+        try:
+            ensure_version_table(cur)
+            conn.commit()
+            applied = applied_migrations(cur)
+            if not applied and is_empty_database(cur):
+                print(f"🆕 Empty database, creating it from {os.path.basename(SCHEMA_FILE)}...")
+                tables = create_from_schema(conn)
+                # The schema file already has every migration's changes
+                for version, name, _, checksum in discover_migrations():
+                    cur.execute("""
+                        INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+                        VALUES (%s, %s, %s, 0)
+                    """, (version, name, checksum))
+                    applied[version] = checksum
+                conn.commit()
+                print(f"✅ Created {tables} tables, recorded {len(applied)} migration(s) as applied")
+            done = []
+            for version, name, path, checksum in discover_migrations():
+                if version in applied:
+                    if applied[version] != checksum:
+                        print(f"⚠️  {version}_{name} changed after it was applied")
+                    continue
+                print(f"⏳ Applying {version}_{name}...")
+                elapsed_ms = apply_migration(conn, version, name, path, checksum, allow_locking)
+                print(f"✅ {version}_{name} ({elapsed_ms} ms)")
+                done.append(version)
+            return done
+        finally:
+            cur.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cur.fetchone()
+    finally:
+        cur.close()
+
+
+def check_app_schema(app):
+    """Startup check: stop the app if the database is behind the migrations.
+
+    SCHEMA_CHECK=enforce (default) raises SchemaOutOfDate, warn only logs,
+    off skips the check. An unreachable database is logged and left to /health.
+    """
+    mode = os.getenv('SCHEMA_CHECK', 'enforce').lower()
+    if mode == 'off':
+        return
+    try:
+        conn = get_connection(app.config)
+    except MySQLdb.Error as e:
+        log.warning("Schema check skipped, database unreachable: %s", e)
+        return
+    try:
+        pending = pending_migrations(conn)
+    finally:
+        conn.close()
+
+    if not pending:
+        return
+    names = ', '.join(f'{version}_{name}' for version, name, _, _ in pending)
+    message = f"Database schema is missing migrations: {names}. Run `python migrate.py up`."
+    if mode == 'warn':
+        log.warning(message)
+    else:
+        raise SchemaOutOfDate(message)
+
+
+def status(conn):
+    cur = conn.cursor()
+    try:
+        applied = applied_migrations(cur) or {}
+    finally:
+        cur.close()
+    print("📋 Migrations")
+    for version, name, _, checksum in discover_migrations():
+        if version not in applied:
+            state = '⏳ pending'
+        elif applied[version] != checksum:
+            state = '⚠️  applied (file changed since)'
+        else:
+            state = '✅ applied'
+        print(f"  {version}_{name:<40} {state}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Versioned schema migrations')
+    parser.add_argument('command', choices=['status', 'up'])
+    parser.add_argument('--allow-locking', action='store_true',
+                        help='allow table-copy ALTERs on tables above MIGRATION_LARGE_TABLE_ROWS')
+    args = parser.parse_args()
+
+    app_logging.configure_logging(production=False)
+    conn = get_connection()
+    try:
+        if args.command == 'status':
+            status(conn)
+        else:
+            done = migrate_up(conn, allow_locking=args.allow_locking)
+            print(f"\n🎉 Applied {len(done)} migration(s)" if done else "✅ Schema is up to date")
+    except MigrationError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    finally:
+        conn.close()
+        app_logging.stop_logging()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,160 +1,280 @@
 #!/usr/bin/env python3
 """
 AWS RDS Database Migration Script
-This script helps migrate your database schema to AWS RDS
+This script migrates your database schema (and optionally the data of a local
+MySQL) to AWS RDS.
+
+    python migrate_to_aws_rds.py                                  # prompts for the RDS details
+    python migrate_to_aws_rds.py --host xxx.rds.amazonaws.com --password secret
+    python migrate_to_aws_rds.py --host ... --copy-data            # also copy rows from MYSQL_* source
+    python migrate_to_aws_rds.py --host ... --copy-data --resume   # continue after a failure
+
+The SQL file is split like the mysql client does (DELIMITER, comments and
+quoted strings are respected). CREATE TABLE statements run in parallel,
+level by level, so a table is only created once every table it references
+exists. Rows are copied by table_copy.py: streamed primary-key chunks,
+several tables at a time, each chunk verified with a checksum.
+
+Schema progress is written to a state file after every statement; with
+--resume, finished statements are skipped and only the row chunks whose
+checksum differs from the source are copied again.
 """
 
-import pymysql
+import argparse
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymysql
 from dotenv import load_dotenv
 
+from sql_script import creation_levels, split_sql_statements
+from table_copy import connect, copy_tables, source_config, source_tables
+
 # Load environment variables
 load_dotenv()
 
-def test_connection(host, user, password, database, port=3306):
+STATE_FILE = '.rds_migration_state.json'
+
+
+def test_connection(config):
     """Test database connection"""
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database,
-            port=port,
-            charset='utf8mb4'
-        )
-        
+        connection = connect(config)
+
         with connection.cursor() as cursor:
             cursor.execute("SELECT VERSION()")
             version = cursor.fetchone()
             print(f"✅ Connection successful! MySQL version: {version[0]}")
-            
+
         connection.close()
         return True
-        
+
     except Exception as e:
         print(f"❌ Connection failed: {e}")
         return False
 
-def import_schema(host, user, password, database, schema_file, port=3306):
+
+# ============================================================================
+# SQL SCRIPT LOADING
+# ============================================================================
+
+class MigrationState:
+    """Schema import progress, saved to STATE_FILE after every statement"""
+
+    def __init__(self, path, target, resume=False):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = {'target': target, 'schema': {}}
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved.get('target') == target:
+                self.data = saved
+            else:
+                print(f"⚠️  {path} belongs to {saved.get('target')}, starting over")
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def schema_progress(self, checksum):
+        """Indexes of the statements already executed from this exact script"""
+        with self.lock:
+            schema = self.data['schema']
+            if schema.get('checksum') != checksum:
+                schema.clear()
+                schema.update({'checksum': checksum, 'done': []})
+            return set(schema['done'])
+
+    def statement_done(self, index):
+        with self.lock:
+            self.data['schema']['done'].append(index)
+            self.save()
+
+
+
+def import_schema(target, schema_file, state, workers=4):
     """Import SQL schema file to RDS"""
+    with open(schema_file, 'r', encoding='utf-8') as file:
+        schema_content = file.read()
+
+    statements = split_sql_statements(schema_content)
+    levels, others = creation_levels(statements)
+    done = state.schema_progress(hashlib.sha256(schema_content.encode('utf-8')).hexdigest())
+
+    # Statements before the first CREATE TABLE (SET, CREATE DATABASE...) set
+    # the scene; everything after (seed rows, indexes) needs the tables
+    first_create = min((index for level in levels for index, _ in level), default=len(statements))
+    setup = [index for index in others if index < first_create]
+    finish = [index for index in others if index > first_create]
+
+    print(f"📊 Importing {len(statements)} SQL statements "
+          f"({sum(len(level) for level in levels)} tables in {len(levels)} levels)...")
+    if done:
+        print(f"⏭️  Resuming: {len(done)} statements already applied")
+
+    local = threading.local()
+    connections = []
+
+    def execute(index):
+        if index in done:
+            return
+        if not hasattr(local, 'connection'):
+            local.connection = connect(target, autocommit=True)
+            connections.append(local.connection)
+        try:
+            with local.connection.cursor() as cursor:
+                cursor.execute(statements[index])
+        except pymysql.MySQLError as e:
+            raise RuntimeError(f"Statement {index + 1} failed: {e}\nStatement: {statements[index][:200]}...")
+        state.statement_done(index)
+
+    started = time.time()
     try:
-        # Read schema file
-        with open(schema_file, 'r', encoding='utf-8') as file:
-            schema_content = file.read()
-        
-        # Split into individual statements
-        statements = [stmt.strip() for stmt in schema_content.split(';') if stmt.strip()]
-        
-        # Connect to database
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database,
-            port=port,
-            charset='utf8mb4'
-        )
-        
-        print(f"📊 Importing {len(statements)} SQL statements...")
-        
-        with connection.cursor() as cursor:
-            success_count = 0
-            for i, statement in enumerate(statements, 1):
-                try:
-                    cursor.execute(statement)
-                    success_count += 1
-                    print(f"✅ Statement {i}/{len(statements)} executed successfully")
-                except Exception as e:
-                    print(f"⚠️  Statement {i} failed: {e}")
-                    print(f"Statement: {statement[:100]}...")
-        
-        connection.commit()
-        connection.close()
-        
-        print(f"🎉 Schema import completed! {success_count}/{len(statements)} statements successful")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Schema import failed: {e}")
-        return False
+        for index in setup:
+            execute(index)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for number, level in enumerate(levels, 1):
+                list(pool.map(execute, [index for index, _ in level]))
+                print(f"   🧱 Level {number}/{len(levels)}: {', '.join(table for _, table in level)}")
+        for index in finish:
+            execute(index)
+    finally:
+        for connection in connections:
+            connection.close()
 
-def verify_tables(host, user, password, database, port=3306):
+    print(f"🎉 Schema import completed in {time.time() - started:.1f}s")
+    return [table for level in levels for _, table in level]
+
+
+def verify_tables(target):
     """Verify that tables were created successfully"""
     try:
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database,
-            port=port,
-            charset='utf8mb4'
-        )
-        
+        connection = connect(target)
+
         with connection.cursor() as cursor:
             cursor.execute("SHOW TABLES")
             tables = cursor.fetchall()
-            
+
             print(f"📋 Found {len(tables)} tables in database:")
             for table in tables:
-                cursor.execute(f"SELECT COUNT(*) FROM {table[0]}")
+                cursor.execute(f"SELECT COUNT(*) FROM `{table[0]}`")
                 count = cursor.fetchone()[0]
                 print(f"   - {table[0]}: {count} records")
-        
+
         connection.close()
         return True
-        
+
     except Exception as e:
         print(f"❌ Table verification failed: {e}")
         return False
 
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Migrate the gaming platform database to AWS RDS')
+    parser.add_argument('--host', default=os.getenv('RDS_HOST'), help='RDS endpoint')
+    parser.add_argument('--user', default=os.getenv('RDS_USER'))
+    parser.add_argument('--password', default=os.getenv('RDS_PASSWORD'))
+    parser.add_argument('--database', default=os.getenv('RDS_DB'))
+    parser.add_argument('--port', type=int, default=os.getenv('RDS_PORT'))
+    parser.add_argument('--schema', default='complete_database_schema.sql')
+    parser.add_argument('--workers', type=int, default=4, help='parallel connections for tables and copies')
+    parser.add_argument('--skip-schema', action='store_true', help='tables already exist on RDS')
+    parser.add_argument('--copy-data', action='store_true', help='copy rows from the MYSQL_* database')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='primary-key ids per copied chunk')
+    parser.add_argument('--resume', action='store_true', help=f'continue from {STATE_FILE}')
+    return parser.parse_args()
+
+
 def main():
     """Main migration process"""
+    args = parse_args()
+
     print("🚀 AWS RDS Migration Tool for Gaming Platform")
     print("=" * 50)
-    
+
     # Get RDS connection details
-    print("\n📝 Enter your AWS RDS connection details:")
-    host = input("RDS Endpoint (e.g., gaming-platform-db.xxxxxxxxx.region.rds.amazonaws.com): ").strip()
-    user = input("Master Username (default: admin): ").strip() or "admin"
-    password = input("Master Password: ").strip()
-    database = input("Database Name (default: gaming_platform): ").strip() or "gaming_platform"
-    port = int(input("Port (default: 3306): ").strip() or "3306")
-    
+    if not args.host:
+        print("\n📝 Enter your AWS RDS connection details:")
+        args.host = input("RDS Endpoint (e.g., gaming-platform-db.xxxxxxxxx.region.rds.amazonaws.com): ").strip()
+        args.user = args.user or input("Master Username (default: admin): ").strip()
+        args.password = args.password or input("Master Password: ").strip()
+        args.database = args.database or input("Database Name (default: gaming_platform): ").strip()
+        args.port = args.port or int(input("Port (default: 3306): ").strip() or "3306")
+    target = {
+        'host': args.host,
+        'user': args.user or 'admin',
+        'password': args.password or '',
+        'database': args.database or 'gaming_platform',
+        'port': args.port or 3306,
+    }
+    host = target['host']
+
     print(f"\n🔌 Testing connection to {host}...")
-    
+
     # Test connection
-    if not test_connection(host, user, password, database, port):
+    if not test_connection(target):
         print("❌ Cannot proceed without valid database connection")
         return
-    
+
+    state = MigrationState(STATE_FILE, f"{host}:{target['port']}/{target['database']}", resume=args.resume)
+
     # Import schema
-    schema_file = "complete_database_schema.sql"
+    schema_file = args.schema
     if not os.path.exists(schema_file):
         print(f"❌ Schema file '{schema_file}' not found!")
         print("Make sure you're running this script from the project directory")
         return
-    
-    print(f"\n📥 Importing schema from {schema_file}...")
-    if not import_schema(host, user, password, database, schema_file, port):
-        print("❌ Schema import failed")
-        return
-    
+
+    with open(schema_file, encoding='utf-8') as f:
+        levels, _ = creation_levels(split_sql_statements(f.read()))
+    tables = [table for level in levels for _, table in level]
+
+    try:
+        if not args.skip_schema:
+            print(f"\n📥 Importing schema from {schema_file}...")
+            import_schema(target, schema_file, state, workers=args.workers)
+
+        if args.copy_data:
+            source = source_config()
+            available = set(source_tables(source))
+            for table in tables:
+                if table not in available:
+                    print(f"   ⚠️  {table}: not in source database, skipped")
+            tables = [table for table in tables if table in available]
+            print(f"\n📦 Copying {len(tables)} tables from {source['host']}/{source['database']}...")
+            results = copy_tables(source, target, tables, workers=args.workers,
+                                  chunk_size=args.chunk_size, incremental=args.resume)
+            mismatched = [r['table'] for r in results if r['mismatched']]
+            if mismatched:
+                raise RuntimeError(f"Checksums differ for: {', '.join(mismatched)}")
+    except (RuntimeError, pymysql.MySQLError) as e:
+        print(f"❌ Migration failed: {e}")
+        print(f"💾 Progress saved to {STATE_FILE}; fix the problem and re-run with --resume")
+        raise SystemExit(1)
+
     # Verify tables
     print(f"\n🔍 Verifying table creation...")
-    verify_tables(host, user, password, database, port)
-    
+    verify_tables(target)
+
     # Generate Railway environment variables
     print(f"\n📋 Railway Environment Variables:")
     print("=" * 40)
     print(f"MYSQL_HOST={host}")
-    print(f"MYSQL_USER={user}")
-    print(f"MYSQL_PASSWORD={password}")
-    print(f"MYSQL_DB={database}")
-    print(f"MYSQL_PORT={port}")
+    print(f"MYSQL_USER={target['user']}")
+    print(f"MYSQL_PASSWORD={target['password']}")
+    print(f"MYSQL_DB={target['database']}")
+    print(f"MYSQL_PORT={target['port']}")
     print("FLASK_ENV=production")
     print("SECRET_KEY=change-this-to-something-secure")
     print("PORT=8080")
-    
+
     print(f"\n✅ Migration completed successfully!")
     print(f"🎯 Next steps:")
     print(f"   1. Copy the environment variables above to Railway")
@@ -162,4 +282,4 @@ def main():
     print(f"   3. Test your app at your-app.railway.app/health")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,32 @@
+"""
+Tournament settings on rooms (was update_rooms_schema.py, add_missing_tables.sql,
+update_database.sql and the is_active part of setup_room_controls.py).
+
+Older databases created the kill reward flag as enable_kill_rewards; its
+values are carried over to kill_rewards_enabled, the column the app uses.
+"""
+
+ROOM_COLUMNS = [
+    ('event_timing', 'DATETIME DEFAULT NULL'),
+    ('is_multiplayer', 'BOOLEAN DEFAULT TRUE'),
+    ('min_team_size', 'INT DEFAULT 1'),
+    ('max_team_size', 'INT DEFAULT 4'),
+    ('min_players_to_start', 'INT DEFAULT 2'),
+    ('status', "ENUM('open', 'running', 'completed', 'cancelled') DEFAULT 'open'"),
+    ('kill_rewards_enabled', 'BOOLEAN DEFAULT FALSE'),
+    ('min_kills_required', 'INT DEFAULT 0'),
+    ('reward_per_kill', 'DECIMAL(10,2) DEFAULT 0.00'),
+    ('max_kill_bonus', 'DECIMAL(10,2) DEFAULT 0.00'),
+    ('is_active', 'BOOLEAN DEFAULT TRUE'),
+]
+
+
+def upgrade(m):
+    for column, definition in ROOM_COLUMNS:
+        m.add_column('rooms', column, definition)
+
+    if m.column_exists('rooms', 'enable_kill_rewards'):
+        m.execute("""
+            UPDATE rooms SET kill_rewards_enabled = TRUE
+            WHERE enable_kill_rewards = TRUE AND kill_rewards_enabled = FALSE
+        """)
@@ -0,0 +1,30 @@
+"""
+Per-room blocked users and teams (was setup_room_controls.py).
+"""
+
+
+def upgrade(m):
+    m.create_table('blocked_users', """
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        room_id INT NOT NULL,
+        user_id INT NOT NULL,
+        blocked_by INT NOT NULL,
+        reason TEXT,
+        blocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY (blocked_by) REFERENCES users(id) ON DELETE CASCADE,
+        UNIQUE KEY unique_room_user_block (room_id, user_id)
+    """)
+
+    m.create_table('blocked_teams', """
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        room_id INT NOT NULL,
+        team_id INT NOT NULL,
+        blocked_by INT NOT NULL,
+        reason TEXT,
+        blocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
+        FOREIGN KEY (blocked_by) REFERENCES users(id) ON DELETE CASCADE,
+        UNIQUE KEY unique_room_team_block (room_id, team_id)
+    """)
@@ -0,0 +1,79 @@
+"""
+Gaming ID enrollment tables (was create_gaming_ids_schema.py), including the
+one-off copy of legacy pubg_usernames into user_gaming_ids.
+"""
+
+
+def upgrade(m):
+    m.create_table('user_gaming_ids', """
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        user_id INT NOT NULL,
+        gaming_platform VARCHAR(50) DEFAULT 'PUBG',
+        gaming_username VARCHAR(100) NOT NULL,
+        display_name VARCHAR(100),
+        is_primary BOOLEAN DEFAULT FALSE,
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        INDEX idx_user_gaming_ids_user (user_id)
+    """)
+
+    m.create_table('user_gaming_id_stats', """
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        user_gaming_id INT NOT NULL,
+        total_rooms_joined INT DEFAULT 0,
+        total_kills INT DEFAULT 0,
+        total_rewards_earned DECIMAL(10,2) DEFAULT 0.00,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_gaming_id) REFERENCES user_gaming_ids(id) ON DELETE CASCADE,
+        UNIQUE KEY unique_gaming_id_stats (user_gaming_id)
+    """)
+
+    m.create_table('room_user_enrollments', """
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        room_id INT NOT NULL,
+        user_id INT NOT NULL,
+        total_entry_fee INT NOT NULL,
+        gaming_ids_count INT NOT NULL,
+        payment_status ENUM('pending', 'paid', 'failed') DEFAULT 'pending',
+        is_active BOOLEAN DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        FOREIGN KEY (room_id) REFERENCES rooms(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        INDEX idx_room_user_enrollments_room (room_id),
+        INDEX idx_room_user_enrollments_user (user_id)
+    """)
+
+    m.create_table('room_gaming_ids', """
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        room_user_enrollment_id INT NOT NULL,
+        user_gaming_id INT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (room_user_enrollment_id) REFERENCES room_user_enrollments(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_gaming_id) REFERENCES user_gaming_ids(id) ON DELETE CASCADE,
+        UNIQUE KEY unique_enrollment_gaming_id (room_user_enrollment_id, user_gaming_id),
+        INDEX idx_room_gaming_ids_gaming_id (user_gaming_id)
+    """)
+
+    if m.table_exists('pubg_usernames'):
+        m.execute("""
+            INSERT INTO user_gaming_ids (user_id, gaming_platform, gaming_username, display_name)
+            SELECT p.user_id, 'PUBG', p.pubg_username, p.pubg_username
+            FROM pubg_usernames p
+            WHERE NOT EXISTS (
+                SELECT 1 FROM user_gaming_ids g
+                WHERE g.user_id = p.user_id AND g.gaming_username = p.pubg_username
+            )
+        """)
+        # Every user with gaming IDs gets their oldest one as primary
+        m.execute("""
+            UPDATE user_gaming_ids g
+            JOIN (
+                SELECT MIN(id) AS id FROM user_gaming_ids
+                GROUP BY user_id
+                HAVING SUM(is_primary) = 0
+            ) first_ids ON first_ids.id = g.id
+            SET g.is_primary = TRUE
+        """)
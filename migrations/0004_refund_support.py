@@ -0,0 +1,18 @@
+"""
+Refund state for cancelled rooms (was add_refund_support.sql): enrollments can
+be marked refunded, and team enrollments get an is_active flag like user ones.
+"""
+
+PAYMENT_STATUS = "ENUM('pending', 'paid', 'failed', 'refunded') DEFAULT 'pending'"
+
+
+def upgrade(m):
+    for table in ('room_user_enrollments', 'room_team_enrollments'):
+        if not m.table_exists(table):
+            continue
+        if 'refunded' not in (m.column_type(table, 'payment_status') or ''):
+            # Appending an ENUM value is an in-place metadata change
+            m.alter(table, f"MODIFY COLUMN payment_status {PAYMENT_STATUS}")
+
+    if m.table_exists('room_team_enrollments'):
+        m.add_column('room_team_enrollments', 'is_active', 'BOOLEAN DEFAULT TRUE')
@@ -0,0 +1,35 @@
+"""
+Composite and covering indexes shaped after the route queries (was
+add_composite_indexes.sql); verify_indexes.py checks the resulting plans.
+Each single-column index is dropped only after the composite that starts
+with the same column exists, so foreign keys always keep an index. An index
+whose table or columns a database.sql-era database lacks is skipped.
+"""
+
+# table, new index, columns, index it supersedes
+INDEXES = [
+    ('rooms', 'idx_rooms_status_created', 'status, created_at', 'idx_rooms_status'),
+    ('room_user_enrollments', 'idx_room_user_enrollments_room_payment',
+     'room_id, payment_status, is_active, gaming_ids_count', None),
+    ('room_team_enrollments', 'idx_room_team_enrollments_payment', 'payment_status, total_entry_fee', None),
+    ('user_gaming_ids', 'idx_user_gaming_ids_user_active',
+     'user_id, is_active, is_primary DESC, gaming_platform, display_name', 'idx_user_gaming_ids_user'),
+    ('gaming_id_room_stats', 'idx_gaming_id_room_stats_room_kills', 'room_id, kills_count',
+     'idx_gaming_id_room_stats_room'),
+    ('winner_selection_history', 'idx_winner_history_room_time', 'room_id, action_timestamp',
+     'idx_winner_history_room'),
+    ('transactions', 'idx_transactions_type_status_created', 'type, status, created_at, amount',
+     'idx_transactions_type'),
+    ('withdrawals', 'idx_withdrawals_status_requested', 'status, requested_at, amount', 'idx_withdrawals_status'),
+    ('withdrawals', 'idx_withdrawals_processed', 'processed_at', None),
+    ('withdrawals', 'idx_withdrawals_user_requested', 'user_id, requested_at', 'idx_withdrawals_user'),
+]
+
+
+def upgrade(m):
+    for table, index, columns, superseded in INDEXES:
+        if not m.columns_exist(table, columns):
+            continue
+        m.add_index(table, index, columns)
+        if superseded:
+            m.drop_index(table, superseded)
@@ -0,0 +1,44 @@
+"""
+One seat per gaming ID per room (was fix_duplicates.py): room_gaming_ids
+gets the room_id of its enrollment and a unique key on (room_id,
+user_gaming_id), so concurrent joins cannot seat the same gaming ID twice.
+
+Existing duplicates must be repaired first with
+`python gaming_id_duplicates.py repair`; the migration stops until then.
+No foreign key to rooms is added: rows already cascade through
+room_user_enrollments, and adding one would force a table copy.
+"""
+
+import MySQLdb
+
+from gaming_id_duplicates import scan
+from migrate import MigrationError
+
+BACKFILL_CHUNK = 10000
+
+
+def upgrade(m):
+    m.add_column('room_gaming_ids', 'room_id', 'INT DEFAULT NULL AFTER id')
+
+    # Backfill in id ranges so each UPDATE only locks a slice of the table
+    last_id = m.scalar("SELECT COALESCE(MAX(id), 0) FROM room_gaming_ids")
+    for start in range(0, last_id + 1, BACKFILL_CHUNK):
+        m.execute("""
+            UPDATE room_gaming_ids rgi
+            JOIN room_user_enrollments rue ON rgi.room_user_enrollment_id = rue.id
+            SET rgi.room_id = rue.room_id
+            WHERE rgi.id >= %s AND rgi.id < %s AND rgi.room_id IS NULL
+        """, (start, start + BACKFILL_CHUNK))
+        m.conn.commit()
+
+    if m.index_exists('room_gaming_ids', 'unique_gaming_id_per_room'):
+        return
+    conflict = next(scan(m.conn), None)
+    if conflict:
+        raise MigrationError(
+            f"Room {conflict['room_id']} has {conflict['gaming_username']} seated {conflict['seats']}x; "
+            f"run `python gaming_id_duplicates.py repair` first")
+    try:
+        m.add_index('room_gaming_ids', 'unique_gaming_id_per_room', 'room_id, user_gaming_id', unique=True)
+    except MySQLdb.IntegrityError as e:
+        raise MigrationError(f"Duplicate seats remain outside active enrollments: {e}")
@@ -0,0 +1,10 @@
+"""
+Index users.updated_at so coin_feed.py's change feed reads only the users
+whose balance changed since its last poll instead of scanning the table.
+Skipped on a database.sql-era users table, which has no updated_at column.
+"""
+
+
+def upgrade(m):
+    if m.column_exists('users', 'updated_at'):
+        m.add_index('users', 'idx_users_updated_at', 'updated_at')
@@ -0,0 +1,9 @@
+"""
+Index room_user_enrollments by updated_at (with room_id, so the index covers
+the query) for room_feed.py, which asks which rooms had enrollment changes
+since its last poll.
+"""
+
+
+def upgrade(m):
+    m.add_index('room_user_enrollments', 'idx_room_user_enrollments_updated', 'updated_at, room_id')
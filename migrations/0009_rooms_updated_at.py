@@ -0,0 +1,10 @@
+"""
+rooms.updated_at, bumped by MySQL on every change, so admin pages can key
+their fragment-cached room sections on COUNT/MAX(id)/MAX(updated_at) of
+rooms (see fragment_cache.py) instead of re-reading every room.
+"""
+
+
+def upgrade(m):
+    m.add_column('rooms', 'updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    m.add_index('rooms', 'idx_rooms_updated_at', 'updated_at')
@@ -0,0 +1,19 @@
+"""
+Index the screenshot columns so /uploads/<name> can check who owns a file
+(uploads.can_view) with three index lookups instead of scanning
+transactions, withdrawals and gaming_id_room_stats. Tables or columns that a
+database.sql-era database does not have are skipped.
+"""
+
+INDEXES = [
+    ('transactions', 'idx_transactions_screenshot', 'payment_screenshot, user_id'),
+    ('withdrawals', 'idx_withdrawals_screenshot', 'payment_screenshot, user_id'),
+    ('gaming_id_room_stats', 'idx_gaming_id_room_stats_screenshot', 'screenshot_proof'),
+]
+
+
+def upgrade(m):
+    for table, index, columns in INDEXES:
+        if not m.columns_exist(table, columns):
+            continue
+        m.add_index(table, index, columns)
@@ -0,0 +1,15 @@
+"""
+upload_files: how many rows reference each content-addressed upload (see
+upload_storage.py), so the cleanup job can tell orphaned files from shared
+ones. Keys are added and released in the same transaction as the row that
+stores them.
+"""
+
+
+def upgrade(m):
+    m.create_table('upload_files', """
+        storage_key VARCHAR(100) PRIMARY KEY,
+        ref_count INT NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    """)
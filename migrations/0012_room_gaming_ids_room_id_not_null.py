@@ -0,0 +1,36 @@
+"""
+Make room_gaming_ids.room_id NOT NULL. 0006 added it as nullable for the
+backfill, and rows inserted without it since (the join route in
+gaming_ids_routes.py did) hold NULL, which the unique (room_id,
+user_gaming_id) key lets through any number of times.
+
+The key only stops the same user_gaming_ids row being seated twice in a
+room. The rule players care about, one seat per gaming platform + username
+per room, spans accounts; join_room_with_gaming_ids enforces it by locking
+the room row (SELECT ... FOR UPDATE) so joins to a room run one at a time.
+"""
+
+import MySQLdb
+
+from migrate import MigrationError
+
+
+def upgrade(m):
+    try:
+        m.execute("""
+            UPDATE room_gaming_ids rgi
+            JOIN room_user_enrollments rue ON rgi.room_user_enrollment_id = rue.id
+            SET rgi.room_id = rue.room_id
+            WHERE rgi.room_id IS NULL
+        """)
+    except MySQLdb.IntegrityError as e:
+        raise MigrationError(f"A gaming ID inserted without room_id is seated twice in its room; "
+                             f"run `python gaming_id_duplicates.py repair` first ({e})")
+    m.conn.commit()
+
+    if m.scalar("""
+        SELECT IS_NULLABLE FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'room_gaming_ids' AND COLUMN_NAME = 'room_id'
+    """) == 'NO':
+        return
+    m.alter('room_gaming_ids', 'MODIFY room_id INT NOT NULL')
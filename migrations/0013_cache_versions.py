@@ -0,0 +1,14 @@
+"""
+cache_versions: one counter per group of data shown in fragment-cached
+admin sections (see fragment_cache.py). Views that change the data bump the
+counter in the same transaction, so the cache key changes with every commit,
+including several in the same second or a status-only update.
+"""
+
+
+def upgrade(m):
+    m.create_table('cache_versions', """
+        name VARCHAR(64) PRIMARY KEY,
+        version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    """)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Query Budget Report
+Runs every route from query_budgets.py through the Flask test client against
+a seeded database and compares the statements and rows each one needed with
+its budget. tests/test_query_budgets.py uses the same functions, so this
+report shows exactly what CI checks.
+
+    python generate_dataset.py --scale small --seed 1      # once, on the test database
+    python query_budget_report.py
+    python query_budget_report.py --database gaming_platform_test --json budgets.json --markdown budgets.md
+
+The database defaults to QUERY_BUDGET_DB (or gaming_platform_test). Exits
+with status 1 when any route is over budget.
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+
+from dotenv import load_dotenv
+
+from query_budgets import BUDGETS, DEFAULT_MAX_REPEATS
+
+load_dotenv()
+
+DEFAULT_DATABASE = os.getenv('QUERY_BUDGET_DB', 'gaming_platform_test')
+
+
+def load_app(database=DEFAULT_DATABASE):
+    """Import the app pointed at the budget database with statement tracking on"""
+    # Set before the import so the startup schema check looks at the same database
+    os.environ['MYSQL_DB'] = database
+    # Sessions and cached user state stay inside this process
+    os.environ['SESSION_STORE'] = 'memory'
+    from app import app, mysql
+
+    app.config['MYSQL_DB'] = database
+    app.config['DB_TRACK_STATEMENTS'] = True
+    app.config['TESTING'] = True
+    return app, mysql
+
+
+def _one(cur, sql, args=None):
+    cur.execute(sql, args)
+    return cur.fetchone()
+
+
+def resolve_context(app, mysql):
+    """Pick the ids the budget paths are formatted with; LookupError if the DB is not seeded"""
+    with app.app_context():
+        cur = mysql.connection.cursor()
+        try:
+            admin = _one(cur, "SELECT id, username FROM users WHERE is_admin = TRUE ORDER BY id LIMIT 1")
+            # The busiest room makes per-enrollment queries show up
+            room = _one(cur, """
+                SELECT room_id FROM room_user_enrollments
+                WHERE is_active = TRUE
+                GROUP BY room_id
+                ORDER BY COUNT(*) DESC, room_id
+                LIMIT 1
+            """)
+            # The player with the most teams makes per-team queries show up
+            player = _one(cur, """
+                SELECT u.id, u.username
+                FROM users u
+                JOIN user_gaming_ids g ON g.user_id = u.id AND g.is_active = TRUE
+                LEFT JOIN user_teams ut ON ut.user_id = u.id
+                WHERE u.is_admin = FALSE
+                GROUP BY u.id, u.username
+                ORDER BY COUNT(DISTINCT ut.id) DESC, u.id
+                LIMIT 1
+            """)
+            join_room = None
+            if player:
+                join_room = _one(cur, """
+                    SELECT r.id FROM rooms r
+                    WHERE r.status = 'open' AND r.is_active = TRUE
+                      AND NOT EXISTS (SELECT 1 FROM room_user_enrollments rue
+                                      WHERE rue.room_id = r.id AND rue.user_id = %s AND rue.is_active = TRUE)
+                      AND NOT EXISTS (SELECT 1 FROM blocked_users bu
+                                      WHERE bu.room_id = r.id AND bu.user_id = %s)
+                    ORDER BY r.id
+                    LIMIT 1
+                """, (player[0], player[0]))
+        finally:
+            cur.close()
+
+    missing = [name for name, row in (('admin', admin), ('room with enrollments', room),
+                                      ('player with gaming IDs', player), ('open room to join', join_room))
+               if row is None]
+    if missing:
+        raise LookupError(f"Budget database is not seeded (missing {', '.join(missing)}); "
+                          f"run generate_dataset.py against it first")
+
+    return {
+        'room_id': room[0],
+        'join_room_id': join_room[0],
+        'player': (player[0], player[1], False),
+        'admin': (admin[0], admin[1], True),
+    }
+
+
+def measure_route(app, name, budget, context):
+    """GET one budgeted route as its user and return what it cost"""
+    import instrumentation
+    from app import refresh_user_state
+    from flask import request
+
+    user_id, username, is_admin = context[budget['as']]
+    path = budget['path'].format(**context)
+
+    # Keeping the client open preserves the request context, so the
+    # cursor stats of the request are still readable afterwards
+    with app.test_client() as client:
+        with client.session_transaction() as sess:
+            sess['user_id'] = user_id
+            sess['username'] = username
+            sess['is_admin'] = is_admin
+        # Cache the user's state the way logging in does
+        with app.app_context():
+            refresh_user_state(user_id)
+        response = client.get(path)
+        stats = instrumentation.current_request_stats()
+        endpoint = request.endpoint
+
+    statements = Counter(stats.get('statements', []))
+    return {
+        'name': name,
+        'path': path,
+        'endpoint': endpoint,
+        'status': response.status_code,
+        'queries': stats['queries'],
+        'rows': stats['rows'],
+        'db_time_ms': round(stats['db_time'] * 1000, 1),
+        'repeated': {sql: count for sql, count in statements.items() if count > 1},
+    }
+
+
+def check_budget(result, budget):
+    """Return a list of human readable budget violations (empty when within budget)"""
+    violations = []
+    expected_status = budget.get('status', 200)
+    if result['status'] != expected_status:
+        violations.append(f"status {result['status']}, expected {expected_status}")
+    if result['endpoint'] != result['name']:
+        violations.append(f"{result['path']} was served by '{result['endpoint']}'")
+    if result['queries'] > budget['queries']:
+        violations.append(f"{result['queries']} queries, budget {budget['queries']}")
+    if result['rows'] > budget['rows']:
+        violations.append(f"{result['rows']} rows fetched, budget {budget['rows']}")
+
+    max_repeats = budget.get('max_repeats', DEFAULT_MAX_REPEATS)
+    for sql, count in result['repeated'].items():
+        if count > max_repeats:
+            violations.append(f"statement ran {count}x (max {max_repeats}), likely N+1: {sql[:160]}")
+    return violations
+
+
+def run_budgets(app, mysql, budgets=BUDGETS):
+    context = resolve_context(app, mysql)
+    results = []
+    for name in sorted(budgets):
+        result = measure_route(app, name, budgets[name], context)
+        result['budget'] = {key: budgets[name][key] for key in ('queries', 'rows')}
+        result['violations'] = check_budget(result, budgets[name])
+        results.append(result)
+    return results
+
+
+def print_report(results):
+    print("\n📊 Query budgets")
+    print(f"  {'route':<28}{'status':>7}{'queries':>12}{'rows':>14}{'db ms':>9}  result")
+    for r in results:
+        queries = f"{r['queries']}/{r['budget']['queries']}"
+        rows = f"{r['rows']}/{r['budget']['rows']}"
+        verdict = '✅' if not r['violations'] else '❌'
+        print(f"  {r['name']:<28}{r['status']:>7}{queries:>12}{rows:>14}{r['db_time_ms']:>9}  {verdict}")
+        for violation in r['violations']:
+            print(f"      - {violation}")
+
+
+def markdown_report(results):
+    lines = [
+        '| Route | Status | Queries | Rows | DB ms | Result |',
+        '|-------|--------|---------|------|-------|--------|',
+    ]
+    for r in results:
+        verdict = 'ok' if not r['violations'] else '<br>'.join(r['violations'])
+        lines.append(f"| `{r['name']}` | {r['status']} | {r['queries']} / {r['budget']['queries']} | "
+                     f"{r['rows']} / {r['budget']['rows']} | {r['db_time_ms']} | {verdict} |")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report per-route query and row budgets')
+    parser.add_argument('--database', default=DEFAULT_DATABASE)
+    parser.add_argument('--json', help='write results as JSON to this file')
+    parser.add_argument('--markdown', help='write a markdown table to this file')
+    args = parser.parse_args()
+
+    app, mysql = load_app(args.database)
+    results = run_budgets(app, mysql)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 JSON written to {args.json}")
+    if args.markdown:
+        with open(args.markdown, 'w') as f:
+            f.write(markdown_report(results))
+        print(f"💾 Markdown written to {args.markdown}")
+
+    over = [r['name'] for r in results if r['violations']]
+    if over:
+        print(f"\n❌ {len(over)} route(s) over budget: {', '.join(over)}")
+        raise SystemExit(1)
+    print(f"\n✅ All {len(results)} routes within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Query Budgets
+Upper bounds on SQL statements and fetched rows per route, checked by
+tests/test_query_budgets.py and printed by query_budget_report.py.
+
+Keys are Flask endpoint names. Paths are formatted with the ids that
+query_budget_report.resolve_context() picks from the seeded database:
+{room_id} is the room with the most enrollments, {join_room_id} an open
+room the player has not joined yet.
+'as' is the session the request runs with (player or admin).
+
+Routes run with the user's state cached as after a login (see
+session_store.py), so the user_coins context processor costs no query.
+Row budgets are sized for the reference dataset:
+
+    python generate_dataset.py --scale small --seed 1
+
+JSON APIs behind http_cache.conditional count their version query too; a
+304 answer runs only that one.
+
+'max_repeats' caps how often one identical statement may run in a request,
+which is what catches a query issued inside a loop (N+1). Raise a budget
+only together with the change that needs it.
+"""
+
+# One identical statement may run twice per request by default: pages that
+# read the user's coins in the route also get them from the context processor
+DEFAULT_MAX_REPEATS = 2
+
+BUDGETS = {
+    # Player pages
+    'home': {'path': '/home', 'as': 'player', 'queries': 3, 'rows': 40},
+    'room_details': {'path': '/room/{room_id}', 'as': 'player', 'queries': 7, 'rows': 10},
+    'room_enrollments': {'path': '/room/{room_id}/enrollments', 'as': 'player', 'queries': 6, 'rows': 250,
+                         'max_repeats': 1},
+    'join_room_with_gaming_ids': {'path': '/room/{join_room_id}/join_with_gaming_ids', 'as': 'player',
+                                  'queries': 6, 'rows': 10},
+    'profile': {'path': '/profile', 'as': 'player', 'queries': 4, 'rows': 25},
+    'my_teams': {'path': '/my_teams', 'as': 'player', 'queries': 3, 'rows': 50, 'max_repeats': 1},
+    'my_gaming_ids': {'path': '/my_gaming_ids', 'as': 'player', 'queries': 2, 'rows': 10},
+    'get_user_coins': {'path': '/api/user_coins', 'as': 'player', 'queries': 1, 'rows': 1},
+    'get_room_gaming_ids_enrollments': {'path': '/api/room/{room_id}/gaming_ids_enrollments', 'as': 'player',
+                                        'queries': 2, 'rows': 150},
+
+    # Admin pages
+    # Budgets of fragment-cached pages are for a cold cache (version query included)
+    'admin_dashboard': {'path': '/admin', 'as': 'admin', 'queries': 11, 'rows': 800},
+    'admin_rooms': {'path': '/admin/rooms', 'as': 'admin', 'queries': 3, 'rows': 150},
+    'manage_kills': {'path': '/admin/room/{room_id}/kills', 'as': 'admin', 'queries': 3, 'rows': 150},
+    'manage_winners': {'path': '/admin/winners', 'as': 'admin', 'queries': 2, 'rows': 150},
+    # Read-only: a room without reward settings shows defaults that select_winner saves
+    'room_winner_selection': {'path': '/admin/winners/room/{room_id}', 'as': 'admin', 'queries': 3,
+                              'rows': 150},
+    'winner_history': {'path': '/admin/winner_history/{room_id}', 'as': 'admin', 'queries': 3, 'rows': 20},
+    'api_room_teams': {'path': '/api/room/{room_id}/teams', 'as': 'admin', 'queries': 2, 'rows': 150},
+    'api_room_blocked_users': {'path': '/api/room/{room_id}/blocked_users', 'as': 'admin', 'queries': 3,
+                               'rows': 20},
+    'api_user_suggestions': {'path': '/api/users/suggestions', 'as': 'admin', 'queries': 1, 'rows': 1100},
+}
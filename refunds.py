@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Room Cancellation Refund Engine
+Refunds every paid enrollment of a cancelled room back to the players' coins.
+
+Each chunk of enrollments is refunded in its own short transaction:
+  1. lock the next batch of paid, active enrollments (keyset on id)
+  2. write one refund row per enrollment into transactions (INSERT ... SELECT)
+  3. credit users with a single UPDATE ... JOIN over the aggregated batch
+  4. mark the batch refunded and inactive
+
+A refunded enrollment is never 'paid' again, so running the engine twice
+for the same room is a no-op and an interrupted run simply resumes with
+the enrollments that are still paid.
+"""
+
+import os
+import sys
+import time
+
+import fragment_cache
+
+DEFAULT_CHUNK_SIZE = 200
+
+# (label, enrollment table, column holding the paying user)
+REFUND_SOURCES = [
+    ('user_enrollments', 'room_user_enrollments', 'user_id'),
+    ('team_enrollments', 'room_team_enrollments', 'enrolled_by'),
+]
+
+
+class RefundError(Exception):
+    """Raised when a room cannot be refunded"""
+
+
+def _refund_chunk(conn, table, payer_column, room_id, last_id, chunk_size):
+    """Refund one batch of enrollments; returns (count, coins, last_id)"""
+    cur = conn.cursor()
+    try:
+        cur.execute(f"""
+            SELECT id FROM {table}
+            WHERE room_id = %s AND id > %s
+            AND payment_status = 'paid' AND is_active = TRUE
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE
+        """, (room_id, last_id, chunk_size))
+        enrollment_ids = [row[0] for row in cur.fetchall()]
+
+        if not enrollment_ids:
+            conn.rollback()
+            return 0, 0, last_id
+
+        placeholders = ','.join(['%s'] * len(enrollment_ids))
+
+        # One refund ledger row per enrollment
+        cur.execute(f"""
+            INSERT INTO transactions (user_id, type, amount, description, payment_id, status)
+            SELECT {payer_column}, 'credit', total_entry_fee,
+                   CONCAT('Room cancellation refund - Room ID: ', room_id),
+                   CONCAT('refund_{table}_', id), 'approved'
+            FROM {table}
+            WHERE id IN ({placeholders}) AND total_entry_fee > 0
+        """, enrollment_ids)
+
+        # Credit all players of the batch in one statement
+        cur.execute(f"""
+            UPDATE users u
+            JOIN (
+                SELECT {payer_column} AS user_id, SUM(total_entry_fee) AS refund_amount
+                FROM {table}
+                WHERE id IN ({placeholders})
+                GROUP BY {payer_column}
+            ) r ON u.id = r.user_id
+            SET u.coins = u.coins + r.refund_amount
+        """, enrollment_ids)
+
+        cur.execute(f"""
+            SELECT COALESCE(SUM(total_entry_fee), 0) FROM {table}
+            WHERE id IN ({placeholders})
+        """, enrollment_ids)
+        coins_refunded = int(cur.fetchone()[0])
+
+        cur.execute(f"""
+            UPDATE {table}
+            SET payment_status = 'refunded', is_active = FALSE
+            WHERE id IN ({placeholders})
+        """, enrollment_ids)
+
+        fragment_cache.bump(cur, 'finance')
+        conn.commit()
+        return len(enrollment_ids), coins_refunded, enrollment_ids[-1]
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def refund_cancelled_room(conn, room_id, chunk_size=DEFAULT_CHUNK_SIZE, pause=0.0):
+    """Refund all paid enrollments of a cancelled room in chunks.
+
+    Commits after every chunk so locks are only held for `chunk_size` rows.
+    `pause` sleeps between chunks to give concurrent traffic room to breathe.
+    Returns a summary dict with per-source counts and the total coins refunded.
+    """
+    cur = conn.cursor()
+    try:
+        cur.execute("SELECT status FROM rooms WHERE id = %s", (room_id,))
+        room = cur.fetchone()
+    finally:
+        cur.close()
+
+    if not room:
+        raise RefundError(f'Room {room_id} not found')
+    if room[0] != 'cancelled':
+        raise RefundError(f'Room {room_id} is {room[0]}, only cancelled rooms can be refunded')
+
+    summary = {'room_id': room_id, 'coins_refunded': 0, 'chunks': 0}
+    for label, table, payer_column in REFUND_SOURCES:
+        summary[label] = 0
+        last_id = 0
+        while True:
+            count, coins, last_id = _refund_chunk(conn, table, payer_column, room_id,
+                                                  last_id, chunk_size)
+            if not count:
+                break
+            summary[label] += count
+            summary['coins_refunded'] += coins
+            summary['chunks'] += 1
+            if pause:
+                time.sleep(pause)
+
+    return summary
+
+
+def cancel_room(conn, room_id):
+    """Mark a room as cancelled and closed for new enrollments"""
+    cur = conn.cursor()
+    try:
+        cur.execute("""
+            UPDATE rooms SET status = 'cancelled', is_active = FALSE
+            WHERE id = %s AND status IN ('open', 'running', 'cancelled')
+        """, (room_id,))
+        fragment_cache.bump(cur, 'rooms')
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def room_payers(conn, room_id):
+    """Ids of every user refunded for the room, whose cached coins are now stale"""
+    cur = conn.cursor()
+    try:
+        cur.execute(" UNION ".join(
+            f"SELECT {payer_column} FROM {table} WHERE room_id = %s AND payment_status = 'refunded'"
+            for _, table, payer_column in REFUND_SOURCES
+        ), (room_id,) * len(REFUND_SOURCES))
+        return [row[0] for row in cur.fetchall()]
+    finally:
+        cur.close()
+
+
+def main():
+    """Resume or run a refund from the command line: python refunds.py <room_id> [chunk_size]"""
+    if len(sys.argv) < 2:
+        print("Usage: python refunds.py <room_id> [chunk_size]")
+        return 1
+
+    from dotenv import load_dotenv
+    import MySQLdb
+
+    load_dotenv()
+    room_id = int(sys.argv[1])
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CHUNK_SIZE
+
+    conn = MySQLdb.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        passwd=os.getenv('MYSQL_PASSWORD', '1111'),
+        db=os.getenv('MYSQL_DB', 'gaming_platform')
+    )
+    try:
+        summary = refund_cancelled_room(conn, room_id, chunk_size=chunk_size)
+        print(f"✅ Room {room_id}: refunded {summary['user_enrollments']} player enrollments "
+              f"and {summary['team_enrollments']} team enrollments "
+              f"({summary['coins_refunded']} coins in {summary['chunks']} chunks)")
+        return 0
+    except RefundError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Live Room Occupancy
+Pushes enrolled player and free slot counts to room_details and the lobby
+over Server-Sent Events, so players waiting for a match no longer reload
+the room page (five queries each time) to watch it fill up.
+
+    /api/room/<id>/occupancy/stream   one room
+    /api/rooms/occupancy/stream       every open room (the lobby)
+
+The poller (see live_feed.py) reads which rooms had an enrollment change
+since its last poll (room_user_enrollments.updated_at, indexed by migration
+0008) and recounts only those rooms in one grouped query, whether ten or ten
+thousand streams are open. Lobby streams get every room's changes; room
+streams only their room's.
+"""
+
+import os
+
+import live_feed
+
+POLL_SECONDS = float(os.getenv('ROOM_FEED_POLL_SECONDS', 1))
+LOBBY = 'lobby'
+
+
+def load_occupancy(cur, room_ids=None):
+    """room id -> occupancy dict for the given rooms, or for every open room"""
+    if room_ids is None:
+        where, params = "r.status = 'open'", ()
+    else:
+        if not room_ids:
+            return {}
+        where = f"r.id IN ({','.join(['%s'] * len(room_ids))})"
+        params = tuple(room_ids)
+    cur.execute(f"""
+        SELECT r.id, r.max_players, r.status,
+               COALESCE(SUM(CASE WHEN rue.payment_status = 'paid' AND rue.is_active = TRUE
+                                 THEN rue.gaming_ids_count END), 0)
+        FROM rooms r
+        LEFT JOIN room_user_enrollments rue ON rue.room_id = r.id
+        WHERE {where}
+        GROUP BY r.id, r.max_players, r.status
+    """, params)
+    return {
+        room_id: {
+            'room_id': room_id,
+            'current_players': int(players),
+            'max_players': max_players,
+            'available_slots': max_players - int(players),
+            'status': status,
+        }
+        for room_id, max_players, status, players in cur.fetchall()
+    }
+
+
+class RoomHub(live_feed.FeedHub):
+    """Occupancy of the rooms watched in this worker, plus lobby streams that watch all rooms"""
+
+    name = 'room-feed'
+
+    def __init__(self, poll_seconds):
+        super().__init__(poll_seconds)
+        self._lobby_last = {}
+
+    def reset(self):
+        super().reset()
+        self._lobby_last = {}
+
+    def remember_lobby(self, rooms):
+        """Rooms a new lobby stream starts with, so unchanged ones are not sent again"""
+        with self._lock:
+            self._lobby_last.update(rooms)
+
+    def publish_room(self, occupancy):
+        room_id = occupancy['room_id']
+        self.publish(room_id, occupancy)
+        with self._lock:
+            if LOBBY not in self._subscribers or self._lobby_last.get(room_id) == occupancy:
+                return
+            self._lobby_last[room_id] = occupancy
+        self.deliver(LOBBY, occupancy)
+
+    def _poll(self, cur, since):
+        cur.execute("""
+            SELECT room_id, MAX(updated_at) FROM room_user_enrollments
+            WHERE updated_at >= %s - INTERVAL %s SECOND
+            GROUP BY room_id
+        """, (since, live_feed.LOOKBACK_SECONDS))
+        changed = dict(cur.fetchall())
+        if not changed:
+            return since
+        since = max(since, max(changed.values()))
+
+        watched = self.subscribed_keys()
+        room_ids = sorted(changed) if LOBBY in watched else sorted(watched.intersection(changed))
+        for occupancy in load_occupancy(cur, room_ids).values():
+            self.publish_room(occupancy)
+        return since
+
+
+hub = RoomHub(POLL_SECONDS)
+
+
+def render(occupancy):
+    return live_feed.sse(occupancy)
+
+
+def room_stream(occupancy, config):
+    """Generator for the occupancy stream of one room"""
+    return live_feed.event_stream(hub, occupancy['room_id'], [render(occupancy)], config, render,
+                                  value=occupancy)
+
+
+def lobby_stream(rooms, config):
+    """Generator for the lobby stream: every open room now, then every change"""
+    hub.remember_lobby(rooms)
+    return live_feed.event_stream(hub, LOBBY, [render(occupancy) for occupancy in rooms.values()],
+                                  config, render)
@@ -0,0 +1,264 @@
+"""
+Server-Side Sessions
+Keeps session data on the server and only a signed session id in the
+cookie, plus a short-lived cache of each logged-in user's state (coins,
+admin flag, active gaming IDs) so authenticated pages stop re-reading it
+from MySQL on every request.
+
+SESSION_STORE picks where both live:
+
+  file    (default) one file per key in SESSION_FILE_DIR, /dev/shm when
+          available, so it is memory-backed and shared by every worker
+  memory  a dict in the worker; only for a single process (flask run)
+  redis   SESSION_REDIS_URL, needs `pip install redis`
+
+Stores only need get, setex and delete with Redis' signatures, so a
+redis.Redis client is used as-is and the local stores stand in for it.
+
+User state is written through: a view that changes a user's coins or
+gaming IDs calls refresh_user_state (app.py) after its commit, which
+reloads the state from the primary and replaces the cached copy, and bulk
+changes invalidate the users they touched. USER_STATE_TTL bounds how long
+a change made outside the app (a script, the SQL console) can go unseen.
+"""
+
+import hashlib
+import json
+import os
+import random
+import secrets
+import tempfile
+import threading
+import time
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+# One setex in this many also sweeps expired entries from the local stores
+PURGE_EVERY = 1000
+
+
+class MemoryStore:
+    """get/setex/delete over a dict in this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._writes = 0
+
+    def get(self, name):
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.time():
+                del self._entries[name]
+                return None
+            return value
+
+    def setex(self, name, seconds, value):
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        with self._lock:
+            self._entries[name] = (time.time() + seconds, value)
+            self._writes += 1
+            if self._writes % PURGE_EVERY == 0:
+                now = time.time()
+                for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[key]
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._entries.pop(name, None) is not None for name in names)
+
+
+class FileStore:
+    """get/setex/delete over one file per key, shared by every process on the host"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, hashlib.sha1(name.encode('utf-8')).hexdigest())
+
+    def get(self, name):
+        path = self._path(name)
+        try:
+            with open(path, 'rb') as f:
+                expires, _, value = f.read().partition(b'\n')
+        except FileNotFoundError:
+            return None
+        if float(expires or 0) <= time.time():
+            self._remove(path)
+            return None
+        return value
+
+    def setex(self, name, seconds, value):
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'%f\n' % (time.time() + seconds) + value)
+        os.replace(tmp_path, self._path(name))
+        if random.randrange(PURGE_EVERY) == 0:
+            self.purge()
+        return True
+
+    def delete(self, *names):
+        return sum(self._remove(self._path(name)) for name in names)
+
+    def purge(self):
+        """Remove every expired entry"""
+        now = time.time()
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            try:
+                with open(path, 'rb') as f:
+                    expires = float(f.readline() or 0)
+            except (OSError, ValueError):
+                continue
+            if expires <= now:
+                self._remove(path)
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+def default_file_dir():
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'warground-sessions')
+
+
+def create_store(config):
+    """The store selected by SESSION_STORE"""
+    kind = config.get('SESSION_STORE', 'file')
+    if kind == 'memory':
+        return MemoryStore()
+    if kind == 'file':
+        return FileStore(config.get('SESSION_FILE_DIR') or default_file_dir())
+    if kind == 'redis':
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SESSION_STORE=redis needs the redis package (pip install redis)")
+        return redis.Redis.from_url(config['SESSION_REDIS_URL'])
+    raise ValueError(f"Unknown SESSION_STORE '{kind}', expected file, memory or redis")
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session data loaded from the store; only its id travels in the cookie"""
+
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self.rotated_from = None
+
+    def rotate(self):
+        """Move the data to a fresh id, e.g. at login, so an id set before it can't be reused"""
+        if self.rotated_from is None and not self.new:
+            self.rotated_from = self.sid
+        self.sid = new_session_id()
+        self.modified = True
+
+
+def new_session_id():
+    return secrets.token_urlsafe(32)
+
+
+class ServerSideSessionInterface(SessionInterface):
+    serializer = TaggedJSONSerializer()
+    key_prefix = 'session:'
+
+    def __init__(self, store, ttl):
+        self.store = store
+        self.ttl = ttl
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('utf-8')
+            except BadSignature:
+                sid = None
+            data = self.store.get(self.key_prefix + sid) if sid else None
+            if data is not None:
+                return ServerSideSession(self.serializer.loads(data.decode('utf-8')), sid=sid)
+        return ServerSideSession(sid=new_session_id(), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.rotated_from:
+            self.store.delete(self.key_prefix + session.rotated_from)
+
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(self.key_prefix + session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if not session.modified:
+            return
+
+        self.store.setex(self.key_prefix + session.sid, self.ttl, self.serializer.dumps(dict(session)))
+        response.vary.add('Cookie')
+        response.set_cookie(
+            name, self._signer(app).sign(session.sid).decode('utf-8'),
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain, path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+class UserStateCache:
+    """Per-user dict (coins, is_admin, gaming_ids) in the session store"""
+
+    key_prefix = 'user:'
+
+    def __init__(self, store=None, ttl=60):
+        self.store = store
+        self.ttl = ttl
+
+    def get(self, user_id):
+        data = self.store.get(f'{self.key_prefix}{user_id}')
+        return json.loads(data) if data is not None else None
+
+    def put(self, user_id, state):
+        self.store.setex(f'{self.key_prefix}{user_id}', self.ttl, json.dumps(state))
+
+    def invalidate(self, *user_ids):
+        if user_ids:
+            self.store.delete(*(f'{self.key_prefix}{user_id}' for user_id in user_ids))
+
+
+users = UserStateCache()
+
+
+def init_app(app):
+    """Replace the cookie session with the server-side store and attach the user state cache"""
+    store = create_store(app.config)
+    app.session_interface = ServerSideSessionInterface(store, int(app.config.get('SESSION_TTL', 604800)))
+    users.store = store
+    users.ttl = int(app.config.get('USER_STATE_TTL', users.ttl))
@@ -0,0 +1,121 @@
+"""
+Slow Query Log
+Keeps the most recent statements that ran longer than SLOW_QUERY_THRESHOLD_MS
+in an in-memory ring buffer, together with the shape of their parameters,
+the route that issued them and an EXPLAIN plan captured on the spot.
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from flask import has_request_context, request
+from MySQLdb.cursors import Cursor
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', 200))
+# Re-use a captured plan for the same statement text for this many seconds
+EXPLAIN_CACHE_SECONDS = 60
+EXPLAIN_CACHE_SIZE = 256
+
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sql(query):
+    """Collapse whitespace so the same statement always looks the same"""
+    if isinstance(query, bytes):
+        query = query.decode('utf-8', 'replace')
+    return _WHITESPACE.sub(' ', query).strip()
+
+
+def params_shape(args):
+    """Describe parameters by type only, never by value"""
+    if args is None:
+        return None
+    if isinstance(args, dict):
+        return {key: type(value).__name__ for key, value in args.items()}
+    if isinstance(args, (list, tuple)):
+        return [type(value).__name__ for value in args]
+    return type(args).__name__
+
+
+class SlowQueryLog:
+    """Thread-safe ring buffer of slow statements"""
+
+    def __init__(self, threshold_ms=SLOW_QUERY_THRESHOLD_MS, size=SLOW_QUERY_LOG_SIZE):
+        self.threshold_ms = threshold_ms
+        self._entries = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._plans = {}
+
+    def _cached_plan(self, sql):
+        cached = self._plans.get(sql)
+        if cached and time.time() - cached[0] < EXPLAIN_CACHE_SECONDS:
+            return cached[1]
+        return None
+
+    def _explain(self, connection, query, args, sql):
+        if not sql.upper().startswith(EXPLAINABLE):
+            return None
+
+        plan = self._cached_plan(sql)
+        if plan is not None:
+            return plan
+
+        # A plain cursor keeps EXPLAIN itself out of the request stats
+        cur = connection.cursor(Cursor)
+        try:
+            cur.execute('EXPLAIN ' + query, args)
+            columns = [col[0] for col in cur.description]
+            plan = [dict(zip(columns, row)) for row in cur.fetchall()]
+        except Exception as e:
+            plan = [{'error': str(e)}]
+        finally:
+            cur.close()
+
+        with self._lock:
+            if len(self._plans) >= EXPLAIN_CACHE_SIZE:
+                self._plans.clear()
+            self._plans[sql] = (time.time(), plan)
+        return plan
+
+    def maybe_record(self, connection, query, args, duration, rowcount):
+        """Record the statement if it crossed the threshold"""
+        duration_ms = duration * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        sql = normalize_sql(query)
+        route = None
+        if has_request_context():
+            route = {'endpoint': request.endpoint, 'method': request.method, 'path': request.path}
+
+        entry = {
+            'recorded_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'duration_ms': round(duration_ms, 2),
+            'sql': sql,
+            'params_shape': params_shape(args),
+            'rowcount': rowcount,
+            'route': route,
+            'plan': self._explain(connection, query, args, sql),
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def entries(self):
+        """Recorded statements, slowest first"""
+        with self._lock:
+            entries = list(self._entries)
+        return sorted(entries, key=lambda entry: entry['duration_ms'], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+
+
+slow_query_log = SlowQueryLog()
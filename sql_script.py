@@ -0,0 +1,119 @@
+"""
+SQL Scripts
+Splits a .sql file into statements the way the mysql client does
+(DELIMITER, comments and quoted strings are respected) and orders its
+CREATE TABLE statements so every table is created after the tables it
+references. Used by migrate.py to create a fresh database from
+complete_database_schema.sql and by migrate_to_aws_rds.py.
+"""
+
+import re
+
+CREATE_TABLE = re.compile(r'^CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?', re.IGNORECASE)
+REFERENCES = re.compile(r'\bREFERENCES\s+`?(\w+)`?', re.IGNORECASE)
+DELIMITER_COMMAND = re.compile(r'DELIMITER[ \t]+(\S+)[^\n]*', re.IGNORECASE)
+
+
+def split_sql_statements(sql):
+    """Split a SQL script into statements.
+
+    Handles DELIMITER commands, `--`, `#` and `/* */` comments (MySQL's
+    executable `/*! */` comments are kept), and delimiters inside quoted
+    strings or backtick identifiers.
+    """
+    statements = []
+    buffer = []
+    delimiter = ';'
+    quote = None
+    i, n = 0, len(sql)
+
+    def flush():
+        statement = ''.join(buffer).strip()
+        if statement:
+            statements.append(statement)
+        buffer.clear()
+
+    while i < n:
+        ch = sql[i]
+
+        if quote:
+            buffer.append(ch)
+            if ch == '\\' and quote != '`' and i + 1 < n:
+                buffer.append(sql[i + 1])
+                i += 2
+                continue
+            if ch == quote:
+                if sql.startswith(quote, i + 1):  # doubled quote is an escaped quote
+                    buffer.append(quote)
+                    i += 2
+                    continue
+                quote = None
+            i += 1
+            continue
+
+        # DELIMITER is a client command and only valid at the start of a statement
+        if not ''.join(buffer).strip():
+            match = DELIMITER_COMMAND.match(sql, i)
+            if match:
+                delimiter = match.group(1)
+                buffer.clear()
+                i = match.end()
+                continue
+
+        if sql.startswith(delimiter, i):
+            flush()
+            i += len(delimiter)
+            continue
+
+        if ch in ('"', "'", '`'):
+            quote = ch
+            buffer.append(ch)
+            i += 1
+        elif ch == '#' or (sql.startswith('--', i) and (i + 2 == n or sql[i + 2].isspace())):
+            end = sql.find('\n', i)
+            i = n if end == -1 else end
+        elif sql.startswith('/*', i) and not sql.startswith('/*!', i):
+            end = sql.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            buffer.append(' ')
+        else:
+            buffer.append(ch)
+            i += 1
+
+    flush()
+    return statements
+
+
+def creation_levels(statements):
+    """Group the CREATE TABLE statements into levels that can run in parallel.
+
+    Returns (levels, others): levels is a list of [(index, table)] where each
+    table only references tables in earlier levels (or tables the script does
+    not create); others are the indexes of every other statement.
+    """
+    tables = {}
+    others = []
+    for index, statement in enumerate(statements):
+        match = CREATE_TABLE.match(statement)
+        if match:
+            tables[match.group(1).lower()] = (index, {
+                ref.lower() for ref in REFERENCES.findall(statement)
+            })
+        else:
+            others.append(index)
+
+    levels = []
+    created = set()
+    remaining = dict(tables)
+    while remaining:
+        ready = sorted(
+            (index, table) for table, (index, refs) in remaining.items()
+            if all(ref in created or ref == table or ref not in tables for ref in refs)
+        )
+        if not ready:
+            raise ValueError(f"Circular foreign keys between: {', '.join(sorted(remaining))}")
+        levels.append(ready)
+        for _, table in ready:
+            created.add(table)
+            del remaining[table]
+    return levels, others
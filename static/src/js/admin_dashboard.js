@@ -0,0 +1,87 @@
+function approvePayment(transactionId) {
+    if (confirm('Are you sure you want to approve this payment? Coins will be added to the user\'s account.')) {
+        fetch('/admin/approve_payment/' + transactionId, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => {
+            if (response.ok) {
+                location.reload(); // Refresh page to show updated data
+            } else {
+                alert('Failed to approve payment');
+            }
+        })
+        .catch(error => {
+            console.error('Error approving payment:', error);
+            alert('Error approving payment');
+        });
+    }
+}
+
+function rejectPayment(transactionId) {
+    if (confirm('Are you sure you want to reject this payment? The payment request will be marked as rejected.')) {
+        fetch('/admin/reject_payment/' + transactionId, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => {
+            if (response.ok) {
+                location.reload(); // Refresh page to show updated data
+            } else {
+                alert('Failed to reject payment');
+            }
+        })
+        .catch(error => {
+            console.error('Error rejecting payment:', error);
+            alert('Error rejecting payment');
+        });
+    }
+}
+
+function approveWithdrawal(withdrawalId) {
+    const form = document.getElementById('approveForm');
+    form.action = '/admin/approve_withdrawal/' + withdrawalId;
+    const modal = new bootstrap.Modal(document.getElementById('approveModal'));
+    modal.show();
+}
+
+function rejectWithdrawal(withdrawalId) {
+    if (confirm('Are you sure you want to reject this withdrawal? The money will be returned to the user\'s account.')) {
+        fetch('/admin/reject_withdrawal/' + withdrawalId, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        })
+        .then(response => {
+            if (response.ok) {
+                location.reload(); // Refresh page to show updated data
+            } else {
+                alert('Failed to reject withdrawal');
+            }
+        })
+        .catch(error => {
+            console.error('Error rejecting withdrawal:', error);
+            alert('Error rejecting withdrawal');
+        });
+    }
+}
+
+// COMMENTED OUT: Room-related JavaScript functions moved to /admin/rooms
+/*
+All room management JavaScript functions have been moved to admin_rooms.html:
+- setBlockUserRoom()
+- loadUsernameSuggestions()
+- toggleUnblockMode()
+- setBlockTeamRoom()
+- toggleTeamUnblockMode()
+- loadTeamsForRoom()
+- viewBlockedUsers()
+- quickUnblockUser()
+- quickUnblockTeam()
+- kill rewards toggle functionality
+*/
@@ -0,0 +1,302 @@
+// Block User Modal Functions
+function setBlockUserRoom(roomId, roomName) {
+    document.getElementById('blockUserRoomId').value = roomId;
+    document.getElementById('blockUserRoomName').textContent = roomName;
+    document.getElementById('blockUsername').value = '';
+    document.getElementById('blockUserReason').value = '';
+    document.getElementById('unblockInstead').checked = false;
+    toggleUnblockMode();
+
+    // Load usernames for auto-complete
+    loadUsernameSuggestions();
+}
+
+function loadUsernameSuggestions() {
+    const usernameInput = document.getElementById('blockUsername');
+    const datalist = document.getElementById('usernamesList');
+
+    // Clear existing options
+    datalist.innerHTML = '';
+
+    // Fetch usernames
+    fetch('/api/users/suggestions')
+        .then(response => response.json())
+        .then(data => {
+            if (data.usernames) {
+                // Set up the datalist for auto-complete
+                usernameInput.setAttribute('list', 'usernamesList');
+
+                // Add all usernames to datalist
+                data.usernames.forEach(username => {
+                    const option = document.createElement('option');
+                    option.value = username;
+                    datalist.appendChild(option);
+                });
+            }
+        })
+        .catch(error => {
+            console.error('Error loading usernames:', error);
+        });
+}
+
+function toggleUnblockMode() {
+    const isUnblock = document.getElementById('unblockInstead').checked;
+    const form = document.getElementById('blockUserForm');
+    const submitBtn = document.getElementById('blockUserSubmit');
+    const reasonField = document.getElementById('blockUserReason');
+
+    if (isUnblock) {
+        form.action = '/admin/unblock_user';
+        submitBtn.textContent = 'Unblock User';
+        submitBtn.className = 'btn btn-success';
+        reasonField.style.display = 'none';
+        reasonField.required = false;
+    } else {
+        form.action = '/admin/block_user';
+        submitBtn.textContent = 'Block User';
+        submitBtn.className = 'btn btn-danger';
+        reasonField.style.display = 'block';
+        reasonField.required = false;
+    }
+}
+
+// Block Team Modal Functions
+function setBlockTeamRoom(roomId, roomName) {
+    document.getElementById('blockTeamRoomId').value = roomId;
+    document.getElementById('blockTeamRoomName').textContent = roomName;
+    document.getElementById('blockTeamReason').value = '';
+    document.getElementById('unblockTeamInstead').checked = false;
+    toggleTeamUnblockMode();
+    loadTeamsForRoom(roomId);
+}
+
+function toggleTeamUnblockMode() {
+    const isUnblock = document.getElementById('unblockTeamInstead').checked;
+    const form = document.getElementById('blockTeamForm');
+    const submitBtn = document.getElementById('blockTeamSubmit');
+    const reasonField = document.getElementById('blockTeamReason');
+
+    if (isUnblock) {
+        form.action = '/admin/unblock_team';
+        submitBtn.textContent = 'Unblock Team';
+        submitBtn.className = 'btn btn-success';
+        reasonField.style.display = 'none';
+        reasonField.required = false;
+    } else {
+        form.action = '/admin/block_team';
+        submitBtn.textContent = 'Block Team';
+        submitBtn.className = 'btn btn-danger';
+        reasonField.style.display = 'block';
+        reasonField.required = false;
+    }
+}
+
+function loadTeamsForRoom(roomId) {
+    const select = document.getElementById('blockTeamSelect');
+    select.innerHTML = '<option value="">Loading teams...</option>';
+
+    // Fetch teams for this room
+    fetch(`/api/room/${roomId}/teams`)
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+            }
+            return response.json();
+        })
+        .then(data => {
+            if (data.error) {
+                throw new Error(data.error);
+            }
+
+            select.innerHTML = '<option value="">Select a team...</option>';
+
+            if (data.teams.length === 0) {
+                select.innerHTML = '<option value="">No teams available</option>';
+                return;
+            }
+
+            data.teams.forEach(team => {
+                const option = document.createElement('option');
+                option.value = team.id;
+                const enrollmentStatus = team.is_enrolled ? ' ✅ Enrolled' : ' ⏳ Not Enrolled';
+                option.textContent = `${team.name} (${team.leader})${enrollmentStatus}`;
+                select.appendChild(option);
+            });
+        })
+        .catch(error => {
+            console.error('Error loading teams:', error);
+            select.innerHTML = '<option value="">Error loading teams</option>';
+
+            // Show more detailed error in console for debugging
+            console.error('Team loading failed:', {
+                roomId: roomId,
+                error: error.message,
+                stack: error.stack
+            });
+        });
+}
+
+// View Blocked Users/Teams Modal Functions
+function viewBlockedUsers(roomId, roomName) {
+    document.getElementById('viewBlockedRoomName').textContent = roomName;
+
+    // Show loading state
+    document.getElementById('blockedUsersList').innerHTML = '<div class="text-center text-muted">Loading...</div>';
+    document.getElementById('blockedTeamsList').innerHTML = '<div class="text-center text-muted">Loading...</div>';
+
+    // Fetch blocked users and teams
+    fetch(`/api/room/${roomId}/blocked_users`)
+        .then(response => response.json())
+        .then(data => {
+            // Display blocked users
+            const usersList = document.getElementById('blockedUsersList');
+            if (data.blocked_users.length === 0) {
+                usersList.innerHTML = '<div class="list-group-item text-muted">No blocked users</div>';
+            } else {
+                usersList.innerHTML = '';
+                data.blocked_users.forEach(user => {
+                    const item = document.createElement('div');
+                    item.className = 'list-group-item';
+                    item.innerHTML = `
+                        <div class="d-flex justify-content-between align-items-start">
+                            <div>
+                                <strong>${user.username}</strong>
+                                <br><small class="text-muted">${user.reason}</small>
+                                <br><small class="text-muted">Blocked: ${user.blocked_at}</small>
+                            </div>
+                            <button class="btn btn-sm btn-outline-success" onclick="quickUnblockUser('${user.username}', ${roomId})">
+                                Unblock
+                            </button>
+                        </div>
+                    `;
+                    usersList.appendChild(item);
+                });
+            }
+
+            // Display blocked teams
+            const teamsList = document.getElementById('blockedTeamsList');
+            if (data.blocked_teams.length === 0) {
+                teamsList.innerHTML = '<div class="list-group-item text-muted">No blocked teams</div>';
+            } else {
+                teamsList.innerHTML = '';
+                data.blocked_teams.forEach(team => {
+                    const item = document.createElement('div');
+                    item.className = 'list-group-item';
+                    item.innerHTML = `
+                        <div class="d-flex justify-content-between align-items-start">
+                            <div>
+                                <strong>${team.team_name}</strong>
+                                <br><small class="text-muted">${team.reason}</small>
+                                <br><small class="text-muted">Blocked: ${team.blocked_at}</small>
+                            </div>
+                            <button class="btn btn-sm btn-outline-success" onclick="quickUnblockTeam('${team.team_name}', ${roomId})">
+                                Unblock
+                            </button>
+                        </div>
+                    `;
+                    teamsList.appendChild(item);
+                });
+            }
+        })
+        .catch(error => {
+            console.error('Error loading blocked users/teams:', error);
+            document.getElementById('blockedUsersList').innerHTML = '<div class="list-group-item text-danger">Error loading data</div>';
+            document.getElementById('blockedTeamsList').innerHTML = '<div class="list-group-item text-danger">Error loading data</div>';
+        });
+}
+
+// Quick unblock functions
+function quickUnblockUser(username, roomId) {
+    if (confirm(`Unblock user "${username}"?`)) {
+        const form = new FormData();
+        form.append('room_id', roomId);
+        form.append('username', username);
+
+        fetch('/admin/unblock_user', {
+            method: 'POST',
+            body: form
+        })
+        .then(response => {
+            if (response.ok) {
+                location.reload(); // Refresh page to show updated data
+            } else {
+                alert('Failed to unblock user');
+            }
+        })
+        .catch(error => {
+            console.error('Error unblocking user:', error);
+            alert('Error unblocking user');
+        });
+    }
+}
+
+function quickUnblockTeam(teamName, roomId) {
+    if (confirm(`Unblock team "${teamName}"?`)) {
+        // You'd need to get the team ID here - for now, show message
+        alert('Please use the "Block Team" modal to unblock teams (need team ID)');
+    }
+}
+
+// Toggle kill reward settings
+document.getElementById('enable_kill_rewards').addEventListener('change', function() {
+    const settings = document.getElementById('kill_reward_settings');
+    const inputs = settings.querySelectorAll('input');
+
+    if (this.checked) {
+        settings.style.display = 'flex';
+        inputs.forEach(input => input.required = true);
+    } else {
+        settings.style.display = 'none';
+        inputs.forEach(input => {
+            input.required = false;
+            input.value = input.placeholder.includes('Minimum') ? '5' : '10.00';
+        });
+    }
+});
+
+// Toggle custom winner reward settings
+document.getElementById('enable_custom_rewards').addEventListener('change', function() {
+    const settings = document.getElementById('custom_reward_settings');
+
+    if (this.checked) {
+        settings.style.display = 'block';
+        // Auto-fill with percentage-based values from prize pool
+        autoFillRewardValues();
+    } else {
+        settings.style.display = 'none';
+    }
+});
+
+// Auto-fill reward values based on prize pool
+function autoFillRewardValues() {
+    const prizePoolInput = document.querySelector('input[name="prize_pool"]');
+    if (!prizePoolInput || !prizePoolInput.value) return;
+
+    const prizePool = parseFloat(prizePoolInput.value);
+
+    // Auto-fill based on common tournament distributions (50%, 30%, 20%)
+    document.querySelector('input[name="first_place_base_reward"]').value = (prizePool * 0.50).toFixed(2);
+    document.querySelector('input[name="second_place_base_reward"]').value = (prizePool * 0.30).toFixed(2);
+    document.querySelector('input[name="third_place_base_reward"]').value = (prizePool * 0.20).toFixed(2);
+
+    // Set reasonable kill bonuses based on prize pool
+    const firstKillBonus = Math.max(5, prizePool * 0.01).toFixed(2);
+    const secondKillBonus = Math.max(3, prizePool * 0.0075).toFixed(2);
+    const thirdKillBonus = Math.max(2, prizePool * 0.005).toFixed(2);
+
+    document.querySelector('input[name="first_place_kill_bonus"]').value = firstKillBonus;
+    document.querySelector('input[name="second_place_kill_bonus"]').value = secondKillBonus;
+    document.querySelector('input[name="third_place_kill_bonus"]').value = thirdKillBonus;
+
+    // Set max kill bonuses (20% of base reward)
+    document.querySelector('input[name="first_place_max_kill_bonus"]').value = (prizePool * 0.50 * 0.20).toFixed(2);
+    document.querySelector('input[name="second_place_max_kill_bonus"]').value = (prizePool * 0.30 * 0.20).toFixed(2);
+    document.querySelector('input[name="third_place_max_kill_bonus"]').value = (prizePool * 0.20 * 0.20).toFixed(2);
+}
+
+// Auto-fill when prize pool changes
+document.querySelector('input[name="prize_pool"]').addEventListener('input', function() {
+    if (document.getElementById('enable_custom_rewards').checked) {
+        autoFillRewardValues();
+    }
+});
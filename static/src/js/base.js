@@ -0,0 +1,81 @@
+// Function to update coin display dynamically
+function updateCoinDisplay(newAmount) {
+    const coinElement = document.getElementById('coin-count');
+    if (coinElement && coinElement.textContent != String(newAmount)) {
+        coinElement.textContent = newAmount;
+        // Add a brief animation to highlight the change
+        coinElement.style.color = '#28a745';
+        setTimeout(() => {
+            coinElement.style.color = '';
+        }, 1000);
+    }
+}
+
+// Function to fetch current user coins from server
+async function refreshCoinBalance() {
+    try {
+        const response = await fetch('/api/user_coins');
+        if (response.ok) {
+            const data = await response.json();
+            updateCoinDisplay(data.coins);
+        }
+    } catch (error) {
+        console.error('Error fetching coin balance:', error);
+    }
+}
+
+// An EventSource that is only open while the page is visible: a hidden tab
+// gives its stream slot back so it doesn't hold a server thread. Once the
+// server refuses it (503 when busy) it stays closed on this page.
+function visibleEventSource(url, onMessage) {
+    if (!window.EventSource) {
+        return null;
+    }
+    const live = {source: null, refused: false};
+
+    function open() {
+        if (live.source || live.refused) {
+            return;
+        }
+        const source = new EventSource(url);
+        source.onmessage = onMessage;
+        source.onerror = function() {
+            if (source.readyState === EventSource.CLOSED) {
+                live.refused = true;
+                live.source = null;
+            }
+        };
+        live.source = source;
+    }
+
+    document.addEventListener('visibilitychange', function() {
+        if (document.hidden) {
+            if (live.source) {
+                live.source.close();
+                live.source = null;
+            }
+        } else {
+            open();
+        }
+    });
+    if (!document.hidden) {
+        open();
+    }
+    return live;
+}
+
+// Balance changes are pushed by the server while the page is visible
+const coinStream = document.getElementById('coin-count')
+    ? visibleEventSource('/api/user_coins/stream', function(event) {
+        updateCoinDisplay(JSON.parse(event.data).coins);
+    })
+    : null;
+
+// Without a live stream (unsupported, or refused when the server is busy)
+// refresh coins when the page becomes visible again; a reopened stream
+// starts with the current balance by itself
+document.addEventListener('visibilitychange', function() {
+    if (!document.hidden && (!coinStream || !coinStream.source)) {
+        refreshCoinBalance();
+    }
+});
@@ -0,0 +1,207 @@
+// Enhanced login page interactions
+document.addEventListener('DOMContentLoaded', function() {
+    // Create floating particles
+    function createParticles() {
+        const particlesContainer = document.querySelector('.floating-particles');
+        if (!particlesContainer) return;
+
+        for (let i = 0; i < 15; i++) {
+            setTimeout(() => {
+                const particle = document.createElement('div');
+                particle.className = 'particle';
+
+                // Random size and position
+                const size = Math.random() * 6 + 4;
+                particle.style.width = size + 'px';
+                particle.style.height = size + 'px';
+                particle.style.left = Math.random() * 100 + '%';
+                particle.style.animationDuration = (Math.random() * 4 + 6) + 's';
+                particle.style.animationDelay = Math.random() * 2 + 's';
+
+                particlesContainer.appendChild(particle);
+
+                // Remove particle after animation
+                setTimeout(() => {
+                    if (particle.parentNode) {
+                        particle.parentNode.removeChild(particle);
+                    }
+                }, 10000);
+            }, i * 500);
+        }
+    }
+
+    // Start particles and repeat
+    createParticles();
+    setInterval(createParticles, 8000);
+
+    // Enhanced form interactions
+    const inputs = document.querySelectorAll('.form-input');
+
+    inputs.forEach(input => {
+        // Focus and blur effects
+        input.addEventListener('focus', function() {
+            this.style.transform = 'scale(1.02)';
+            this.style.borderColor = '#ff6b6b';
+            this.style.boxShadow = '0 0 0 3px rgba(255, 107, 107, 0.1)';
+        });
+
+        input.addEventListener('blur', function() {
+            this.style.transform = 'scale(1)';
+            if (this.value === '') {
+                this.style.borderColor = '#e1e8ed';
+                this.style.boxShadow = 'none';
+            }
+        });
+
+        // Typing effect
+        input.addEventListener('input', function() {
+            if (this.value.length > 0) {
+                this.style.borderColor = '#4ade80';
+                this.nextElementSibling.style.color = '#4ade80';
+            } else {
+                this.style.borderColor = '#e1e8ed';
+                this.nextElementSibling.style.color = '#666';
+            }
+        });
+    });
+
+    // Enhanced button interactions
+    const loginBtn = document.querySelector('.login-btn');
+    const socialBtns = document.querySelectorAll('.social-btn');
+    const registerBtn = document.querySelector('.register-btn');
+
+    // Login button effects
+    loginBtn.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-3px) scale(1.02)';
+        this.style.boxShadow = '0 15px 30px rgba(255, 107, 107, 0.4)';
+    });
+
+    loginBtn.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0) scale(1)';
+        this.style.boxShadow = 'none';
+    });
+
+    // Social button effects
+    socialBtns.forEach(btn => {
+        btn.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-2px) scale(1.05)';
+        });
+
+        btn.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0) scale(1)';
+        });
+    });
+
+    // Register button effects
+    registerBtn.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-2px) scale(1.05)';
+        this.style.boxShadow = '0 10px 20px rgba(255, 107, 107, 0.3)';
+    });
+
+    registerBtn.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0) scale(1)';
+        this.style.boxShadow = 'none';
+    });
+
+    // Form submission animation
+    const form = document.querySelector('form');
+    form.addEventListener('submit', function(e) {
+        const btn = this.querySelector('.login-btn');
+        btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> LOGGING IN...';
+        btn.disabled = true;
+        btn.style.background = 'linear-gradient(135deg, #6b7280 0%, #9ca3af 100%)';
+    });
+
+    // Page entrance animation
+    const heroContent = document.querySelector('.hero-content');
+    const loginSection = document.querySelector('.login-section');
+    const registerSection = document.querySelector('.register-section');
+
+    // Initial state
+    heroContent.style.opacity = '0';
+    heroContent.style.transform = 'translateY(30px)';
+    loginSection.style.opacity = '0';
+    loginSection.style.transform = 'translateY(30px)';
+    registerSection.style.opacity = '0';
+    registerSection.style.transform = 'translateY(30px)';
+
+    // Animate in sequence
+    setTimeout(() => {
+        heroContent.style.transition = 'all 0.8s ease';
+        heroContent.style.opacity = '1';
+        heroContent.style.transform = 'translateY(0)';
+    }, 200);
+
+    setTimeout(() => {
+        loginSection.style.transition = 'all 0.8s ease';
+        loginSection.style.opacity = '1';
+        loginSection.style.transform = 'translateY(0)';
+    }, 400);
+
+    setTimeout(() => {
+        registerSection.style.transition = 'all 0.8s ease';
+        registerSection.style.opacity = '1';
+        registerSection.style.transform = 'translateY(0)';
+    }, 600);
+
+    // Parallax effect for hero banner
+    window.addEventListener('scroll', function() {
+        const scrolled = window.pageYOffset;
+        const heroBox = document.querySelector('.hero-banner');
+        if (heroBox) {
+            heroBox.style.transform = `translateY(${scrolled * 0.5}px)`;
+        }
+    });
+
+    // Add click ripple effect to buttons
+    function createRipple(event) {
+        const button = event.currentTarget;
+        const circle = document.createElement('span');
+        const diameter = Math.max(button.clientWidth, button.clientHeight);
+        const radius = diameter / 2;
+
+        circle.style.width = circle.style.height = `${diameter}px`;
+        circle.style.left = `${event.clientX - button.offsetLeft - radius}px`;
+        circle.style.top = `${event.clientY - button.offsetTop - radius}px`;
+        circle.classList.add('ripple');
+
+        const ripple = button.getElementsByClassName('ripple')[0];
+        if (ripple) {
+            ripple.remove();
+        }
+
+        button.appendChild(circle);
+
+        setTimeout(() => {
+            circle.remove();
+        }, 600);
+    }
+
+    // Add ripple style
+    const style = document.createElement('style');
+    style.textContent = `
+        .ripple {
+            position: absolute;
+            border-radius: 50%;
+            background-color: rgba(255, 255, 255, 0.3);
+            transform: scale(0);
+            animation: ripple-animation 0.6s linear;
+            pointer-events: none;
+        }
+
+        @keyframes ripple-animation {
+            to {
+                transform: scale(4);
+                opacity: 0;
+            }
+        }
+    `;
+    document.head.appendChild(style);
+
+    // Add ripple to all buttons
+    document.querySelectorAll('.login-btn, .register-btn, .social-btn').forEach(button => {
+        button.addEventListener('click', createRipple);
+        button.style.position = 'relative';
+        button.style.overflow = 'hidden';
+    });
+});
@@ -0,0 +1,59 @@
+let usernameCount = 1;
+
+function addPubgUsername() {
+    usernameCount++;
+    const container = document.getElementById('pubg-usernames');
+    const div = document.createElement('div');
+    div.className = 'pubg-username-item';
+    div.innerHTML = `
+        <input type="text" name="pubg_username[]" class="form-control gaming-input" placeholder="Enter PUBG username ${usernameCount}">
+        <button type="button" class="remove-username" onclick="removePubgUsername(this)" title="Remove username">
+            <i class="fas fa-times"></i>
+        </button>
+    `;
+    container.appendChild(div);
+
+    // Add animation
+    div.style.opacity = '0';
+    div.style.transform = 'translateY(-10px)';
+    setTimeout(() => {
+        div.style.transition = 'all 0.3s ease';
+        div.style.opacity = '1';
+        div.style.transform = 'translateY(0)';
+    }, 10);
+}
+
+function removePubgUsername(button) {
+    const item = button.parentElement;
+    item.style.transition = 'all 0.3s ease';
+    item.style.opacity = '0';
+    item.style.transform = 'translateY(-10px)';
+    setTimeout(() => {
+        item.remove();
+        updatePlaceholders();
+    }, 300);
+}
+
+function updatePlaceholders() {
+    const inputs = document.querySelectorAll('#pubg-usernames input');
+    inputs.forEach((input, index) => {
+        input.placeholder = `Enter PUBG username ${index + 1}`;
+    });
+    usernameCount = inputs.length;
+}
+
+// Add floating label effect
+document.addEventListener('DOMContentLoaded', function() {
+    const inputs = document.querySelectorAll('.gaming-input');
+    inputs.forEach(input => {
+        input.addEventListener('focus', function() {
+            this.parentElement.classList.add('focused');
+        });
+
+        input.addEventListener('blur', function() {
+            if (this.value === '') {
+                this.parentElement.classList.remove('focused');
+            }
+        });
+    });
+});
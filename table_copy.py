@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Table Copy Engine
+Copies tables between two MySQL servers (local MySQL <-> RDS) while the
+source stays online, and keeps the copy in sync until cutover.
+
+    python table_copy.py --target-host xxx.rds.amazonaws.com --target-password secret
+    python table_copy.py --target-host ... --incremental          # catch up, copy changed chunks only
+    python table_copy.py --target-host ... --verify-only          # compare, change nothing
+    python table_copy.py --target-host ... --tables users,transactions --workers 8
+
+The source is the MYSQL_* database, the target defaults to the RDS_*
+variables. Tables are split into primary-key ranges of --chunk-size ids. Each
+range is streamed with a server-side cursor (SSCursor), so memory stays flat
+however large the table, and written to the target in one transaction that
+first clears the range; the range then mirrors the source exactly,
+including updated and deleted rows. Afterwards the row count and a
+BIT_XOR(CRC32) checksum of the range are compared on both servers.
+
+--incremental compares the checksums first and only re-copies ranges that
+differ, so repeated passes get shorter; run a last pass with the app in
+maintenance mode right before switching MYSQL_HOST.
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pymysql
+import pymysql.cursors
+from dotenv import load_dotenv
+
+load_dotenv()
+
+INTEGER_TYPES = ('tinyint', 'smallint', 'mediumint', 'int', 'bigint')
+STREAM_BATCH = 1000
+CHUNK_RETRIES = 3
+REPORT_INTERVAL = 5
+
+print_lock = threading.Lock()
+
+
+def report(message):
+    with print_lock:
+        print(message, flush=True)
+
+
+def connect(config, **kwargs):
+    return pymysql.connect(
+        host=config['host'],
+        user=config['user'],
+        password=config['password'],
+        database=config['database'],
+        port=config['port'],
+        charset='utf8mb4',
+        **kwargs
+    )
+
+
+def source_config():
+    """The local database the app runs on (MYSQL_* variables)"""
+    return {
+        'host': os.getenv('MYSQL_HOST', 'localhost'),
+        'user': os.getenv('MYSQL_USER', 'root'),
+        'password': os.getenv('MYSQL_PASSWORD', '1111'),
+        'database': os.getenv('MYSQL_DB', 'gaming_platform'),
+        'port': int(os.getenv('MYSQL_PORT', 3306)),
+    }
+
+
+def target_config(args=None):
+    return {
+        'host': getattr(args, 'target_host', None) or os.getenv('RDS_HOST'),
+        'user': getattr(args, 'target_user', None) or os.getenv('RDS_USER', 'admin'),
+        'password': getattr(args, 'target_password', None) or os.getenv('RDS_PASSWORD', ''),
+        'database': getattr(args, 'target_database', None) or os.getenv('RDS_DB', 'gaming_platform'),
+        'port': int(getattr(args, 'target_port', None) or os.getenv('RDS_PORT', 3306)),
+    }
+
+
+def table_columns(cursor, table):
+    cursor.execute("""
+        SELECT COLUMN_NAME FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+          AND EXTRA NOT LIKE '%%GENERATED%%'
+        ORDER BY ORDINAL_POSITION
+    """, (table,))
+    return [row[0] for row in cursor.fetchall()]
+
+
+def integer_primary_key(cursor, table):
+    """The primary key column if it is a single integer column, else None"""
+    cursor.execute("""
+        SELECT k.COLUMN_NAME, c.DATA_TYPE
+        FROM information_schema.KEY_COLUMN_USAGE k
+        JOIN information_schema.COLUMNS c
+          ON c.TABLE_SCHEMA = k.TABLE_SCHEMA AND c.TABLE_NAME = k.TABLE_NAME AND c.COLUMN_NAME = k.COLUMN_NAME
+        WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s AND k.CONSTRAINT_NAME = 'PRIMARY'
+    """, (table,))
+    keys = cursor.fetchall()
+    if len(keys) == 1 and keys[0][1].lower() in INTEGER_TYPES:
+        return keys[0][0]
+    return None
+
+
+class TablePlan:
+    """Column list, key and the SQL used for every chunk of one table"""
+
+    def __init__(self, table, columns, pk):
+        self.table = table
+        self.columns = columns
+        self.pk = pk
+        column_list = ', '.join(f'`{column}`' for column in columns)
+        self.select = f"SELECT {column_list} FROM `{table}` WHERE {{where}}"
+        self.insert = f"INSERT INTO `{table}` ({column_list}) VALUES ({', '.join(['%s'] * len(columns))})"
+        # pt-table-checksum style: order independent, NULL distinct from ''
+        row = (f"CONCAT_WS('#', {column_list}, "
+               f"CONCAT({', '.join(f'ISNULL(`{column}`)' for column in columns)}))")
+        self.checksum = f"SELECT COUNT(*), COALESCE(BIT_XOR(CRC32({row})), 0) FROM `{table}` WHERE {{where}}"
+
+    def where(self, chunk):
+        """SQL condition and args for a (low, high) key range; (None, None) is the whole table"""
+        low, high = chunk
+        if low is None:
+            return '1 = 1', ()
+        return f"`{self.pk}` >= %s AND `{self.pk}` < %s", (low, high)
+
+
+class TableCopier:
+    """Copies one table chunk by chunk over its own pair of connections"""
+
+    def __init__(self, source_conf, target_conf, table, chunk_size, incremental=False, verify_only=False):
+        self.table = table
+        self.chunk_size = chunk_size
+        self.incremental = incremental
+        self.verify_only = verify_only
+        # Autocommit so every checksum sees the latest rows instead of one
+        # long-lived snapshot; chunk writes use an explicit transaction
+        self.source = connect(source_conf, autocommit=True)
+        self.target = connect(target_conf, autocommit=True)
+        self.stats = {'table': table, 'chunks': 0, 'copied': 0, 'skipped': 0, 'rows': 0, 'mismatched': []}
+
+    def close(self):
+        self.source.close()
+        self.target.close()
+
+    def chunks(self, plan):
+        if plan.pk is None:
+            return [(None, None)]
+        with self.source.cursor() as cursor:
+            cursor.execute(f"SELECT MIN(`{plan.pk}`), MAX(`{plan.pk}`) FROM `{plan.table}`")
+            low, high = cursor.fetchone()
+        if low is None:
+            return []
+        return [(start, start + self.chunk_size) for start in range(low, high + 1, self.chunk_size)]
+
+    def checksum(self, connection, plan, chunk):
+        where, args = plan.where(chunk)
+        with connection.cursor() as cursor:
+            cursor.execute(plan.checksum.format(where=where), args)
+            count, crc = cursor.fetchone()
+        return int(count), int(crc)
+
+    def copy_chunk(self, plan, chunk):
+        """Replace the target's rows in the range with a streamed copy of the source's"""
+        where, args = plan.where(chunk)
+        rows = 0
+        stream = self.source.cursor(pymysql.cursors.SSCursor)
+        try:
+            with self.target.cursor() as cursor:
+                self.target.begin()
+                cursor.execute(f"DELETE FROM `{plan.table}` WHERE {where}", args)
+                stream.execute(plan.select.format(where=where), args)
+                while True:
+                    batch = stream.fetchmany(STREAM_BATCH)
+                    if not batch:
+                        break
+                    # pymysql sends executemany on INSERT ... VALUES as multi-row statements
+                    cursor.executemany(plan.insert, batch)
+                    rows += len(batch)
+            self.target.commit()
+        except Exception:
+            self.target.rollback()
+            raise
+        finally:
+            stream.close()
+        return rows
+
+    def sync_chunk(self, plan, chunk):
+        if self.incremental or self.verify_only:
+            source_sum = self.checksum(self.source, plan, chunk)
+            if self.checksum(self.target, plan, chunk) == source_sum:
+                self.stats['skipped'] += 1
+                return source_sum[0]
+            if self.verify_only:
+                self.stats['mismatched'].append(chunk)
+                return source_sum[0]
+
+        for attempt in range(1, CHUNK_RETRIES + 1):
+            self.copy_chunk(plan, chunk)
+            target_sum = self.checksum(self.target, plan, chunk)
+            source_sum = self.checksum(self.source, plan, chunk)
+            if target_sum == source_sum:
+                self.stats['copied'] += 1
+                return target_sum[0]
+            # The source changed while the range was copied; try again
+        self.stats['mismatched'].append(chunk)
+        report(f"   ⚠️  {self.table} {chunk}: checksum still differs after {CHUNK_RETRIES} attempts "
+               f"(busy range, the next --incremental pass will pick it up)")
+        return source_sum[0]
+
+    def remove_outside(self, plan, chunks):
+        """Drop target rows whose keys no longer exist anywhere in the source range"""
+        if plan.pk is None or self.verify_only:
+            return
+        with self.target.cursor() as cursor:
+            if chunks:
+                cursor.execute(f"DELETE FROM `{plan.table}` WHERE `{plan.pk}` < %s OR `{plan.pk}` >= %s",
+                               (chunks[0][0], chunks[-1][1]))
+            else:
+                cursor.execute(f"DELETE FROM `{plan.table}`")
+
+    def run(self):
+        with self.source.cursor() as cursor:
+            plan = TablePlan(self.table, table_columns(cursor, self.table),
+                             integer_primary_key(cursor, self.table))
+        with self.target.cursor() as cursor:
+            # Parents and children arrive in parallel, not in row order
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+
+        chunks = self.chunks(plan)
+        started = last_report = time.time()
+        for number, chunk in enumerate(chunks, 1):
+            self.stats['rows'] += self.sync_chunk(plan, chunk)
+            self.stats['chunks'] += 1
+            if time.time() - last_report >= REPORT_INTERVAL:
+                rate = self.stats['rows'] / max(time.time() - started, 0.001)
+                report(f"   📦 {self.table}: chunk {number}/{len(chunks)}, "
+                       f"{self.stats['rows']:,} rows, {rate:,.0f} rows/s")
+                last_report = time.time()
+        self.remove_outside(plan, chunks)
+        self.stats['seconds'] = round(time.time() - started, 1)
+        return self.stats
+
+
+def copy_tables(source_conf, target_conf, tables, workers=4, chunk_size=10000,
+                incremental=False, verify_only=False):
+    """Copy (or verify) tables in parallel; returns the per-table stats"""
+
+    def run(table):
+        copier = TableCopier(source_conf, target_conf, table, chunk_size, incremental, verify_only)
+        try:
+            stats = copier.run()
+        finally:
+            copier.close()
+        verdict = '✅' if not stats['mismatched'] else '❌'
+        report(f"   {verdict} {table}: {stats['rows']:,} rows, {stats['copied']} chunks copied, "
+               f"{stats['skipped']} unchanged, {len(stats['mismatched'])} mismatched ({stats['seconds']}s)")
+        return stats
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, tables))
+
+
+def source_tables(source_conf):
+    connection = connect(source_conf)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SHOW FULL TABLES WHERE Table_type = 'BASE TABLE'")
+            return [row[0] for row in cursor.fetchall()]
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stream tables from the MYSQL_* database to another server')
+    parser.add_argument('--target-host')
+    parser.add_argument('--target-user')
+    parser.add_argument('--target-password')
+    parser.add_argument('--target-database')
+    parser.add_argument('--target-port', type=int)
+    parser.add_argument('--tables', help='comma separated; default every table in the source')
+    parser.add_argument('--workers', type=int, default=4, help='tables copied in parallel')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='primary-key ids per chunk')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--incremental', action='store_true', help='only copy chunks whose checksum differs')
+    mode.add_argument('--verify-only', action='store_true', help='compare checksums without copying')
+    args = parser.parse_args()
+
+    source_conf = source_config()
+    target_conf = target_config(args)
+    if not target_conf['host']:
+        parser.error('--target-host or RDS_HOST is required')
+
+    tables = args.tables.split(',') if args.tables else source_tables(source_conf)
+    action = 'Verifying' if args.verify_only else 'Catching up' if args.incremental else 'Copying'
+    print(f"🚚 {action} {len(tables)} tables: {source_conf['host']}/{source_conf['database']} → "
+          f"{target_conf['host']}/{target_conf['database']} ({args.workers} workers)")
+
+    started = time.time()
+    try:
+        results = copy_tables(source_conf, target_conf, tables, args.workers, args.chunk_size,
+                              args.incremental, args.verify_only)
+    except pymysql.MySQLError as e:
+        print(f"❌ Copy failed: {e}")
+        print("💾 Finished chunks are kept; re-run with --incremental to continue")
+        raise SystemExit(1)
+
+    rows = sum(r['rows'] for r in results)
+    mismatched = [r['table'] for r in results if r['mismatched']]
+    print(f"\n📊 {rows:,} rows in {len(results)} tables, {time.time() - started:.1f}s")
+    if mismatched:
+        print(f"❌ Checksums differ for: {', '.join(mismatched)}")
+        raise SystemExit(1)
+    print("✅ Source and target match")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Template Warmup
+Compiles every template before the first request instead of on it.
+
+Compiled templates are kept in a Jinja bytecode cache on disk
+(JINJA_CACHE_DIR, default .jinja_cache) that all workers on the host share:
+a worker that has to compile a template loads the stored bytecode instead of
+parsing the source again. Entries are keyed by the template source, so an
+edited template is simply recompiled.
+
+At import app.py compiles all of templates/ (TEMPLATE_WARMUP, on by default).
+With gunicorn's preload_app that happens once in the master and every forked
+worker inherits the compiled templates; without it each worker loads them
+from the shared bytecode cache. To fill the cache ahead of time, e.g. during
+a Docker build:
+
+    python template_warmup.py
+"""
+
+import os
+import time
+
+from jinja2 import FileSystemBytecodeCache
+
+import app_logging
+
+log = app_logging.get_logger('template_warmup')
+
+
+def template_names(app):
+    """Every template the app can render, including includes/ and partials"""
+    return sorted(name for name in app.jinja_env.list_templates()
+                  if name.endswith(('.html', '.htm', '.xml', '.txt')))
+
+
+def warmup(app):
+    """Compile (or load from the bytecode cache) every template; returns (count, seconds)"""
+    started = time.perf_counter()
+    names = template_names(app)
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names), time.perf_counter() - started
+
+
+def init_app(app):
+    """Attach the shared bytecode cache and, unless disabled, warm up every template"""
+    cache_dir = app.config.get('JINJA_CACHE_DIR')
+    if cache_dir:
+        if not os.path.isabs(cache_dir):
+            cache_dir = os.path.join(app.root_path, cache_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            pass
+        if os.access(cache_dir, os.W_OK):
+            app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        else:
+            # Jinja fails the render when it cannot write the cache, so go without it
+            log.warning("JINJA_CACHE_DIR %s is not writable, templates are compiled without it", cache_dir)
+
+    if app.config.get('TEMPLATE_WARMUP'):
+        count, seconds = warmup(app)
+        log.info("Compiled %d templates in %.0f ms", count, seconds * 1000)
+
+
+def main():
+    # Only the templates are needed, not the database
+    os.environ.setdefault('SCHEMA_CHECK', 'off')
+    os.environ['TEMPLATE_WARMUP'] = 'false'
+    from app import app
+
+    if app.jinja_env.bytecode_cache is None:
+        print("❌ No writable JINJA_CACHE_DIR, nothing to fill")
+        return 1
+    count, seconds = warmup(app)
+    print(f"✅ Compiled {count} templates into {app.jinja_env.bytecode_cache.directory} "
+          f"in {seconds * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
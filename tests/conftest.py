@@ -0,0 +1,34 @@
+"""
+Fixtures for the query budget tests. They need a MySQL database seeded with
+generate_dataset.py (QUERY_BUDGET_DB, default gaming_platform_test) and are
+skipped when it cannot be reached.
+"""
+
+import pytest
+
+
+@pytest.fixture(scope='session')
+def budget_app():
+    MySQLdb = pytest.importorskip('MySQLdb')
+    from query_budget_report import load_app, resolve_context
+
+    app, mysql = load_app()
+    try:
+        context = resolve_context(app, mysql)
+    except MySQLdb.OperationalError as e:
+        pytest.skip(f"Query budget database unavailable: {e}")
+    except LookupError as e:
+        pytest.skip(str(e))
+    return app, context
+
+
+@pytest.fixture
+def measure_route(budget_app):
+    """Run a budgeted route with every cursor statement and fetched row counted"""
+    from query_budget_report import measure_route as measure
+
+    app, context = budget_app
+
+    def run(name, budget):
+        return measure(app, name, budget, context)
+    return run
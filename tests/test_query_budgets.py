@@ -0,0 +1,22 @@
+import pytest
+
+from query_budget_report import check_budget
+from query_budgets import BUDGETS
+
+
+@pytest.mark.parametrize('name', sorted(BUDGETS))
+def test_route_within_query_budget(measure_route, name):
+    result = measure_route(name, BUDGETS[name])
+    violations = check_budget(result, BUDGETS[name])
+    assert not violations, f"{result['path']}: " + '; '.join(violations)
+
+
+def test_repeated_statement_is_reported_as_n_plus_one():
+    result = {
+        'name': 'my_teams', 'path': '/my_teams', 'endpoint': 'my_teams', 'status': 200,
+        'queries': 3, 'rows': 10,
+        'repeated': {'SELECT member_username FROM user_team_members WHERE user_team_id = %s': 3},
+    }
+    violations = check_budget(result, {'queries': 3, 'rows': 50, 'max_repeats': 1})
+    assert len(violations) == 1
+    assert 'N+1' in violations[0]
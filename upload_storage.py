@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Upload Storage
+Screenshots are stored by content: the file name is the SHA-256 of its
+bytes, under two levels of shard directories, so no directory grows past a
+few thousand entries and an identical upload is stored once.
+
+    static/uploads/3f/a9/3fa9c1...e7.png
+
+The key ('3f/a9/3fa9c1...e7.png') is what transactions, withdrawals and
+gaming_id_room_stats store, and what /uploads/<key> serves (see
+uploads.py). Files uploaded before this keep their flat names and are
+served as before.
+
+upload_files counts the rows that reference each key. add_ref() and
+release() run on the caller's cursor, inside the same transaction as the
+row that stores the key, so a rolled-back request leaves a file on disk
+with no reference. The cleanup job deletes such files once they are older
+than the grace period (a file that gets uploaded again has its mtime
+refreshed, so it is not collected while the new request is in flight):
+
+    python upload_storage.py cleanup --grace-minutes 60 [--dry-run]
+
+UploadStorage is the interface a different backend (e.g. object storage)
+would implement; LocalStorage is the one UPLOAD_STORAGE=local selects.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+CHUNK_SIZE = 64 * 1024
+KEY_PATTERN = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]{1,5})?$')
+
+
+class UploadStorage:
+    """Where uploaded files live; keys are what the database stores"""
+
+    def save(self, fileobj, extension=''):
+        """Store the file's content and return its key"""
+        raise NotImplementedError
+
+    def path(self, key):
+        """Local path of a stored key, for sendfile"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def stored(self):
+        """(key, modified timestamp) of every stored file"""
+        raise NotImplementedError
+
+
+class LocalStorage(UploadStorage):
+    """Content-addressed files in two-level shard directories under root"""
+
+    def __init__(self, root):
+        self.root = root
+
+    @staticmethod
+    def key_for(digest, extension):
+        extension = extension.lower().lstrip('.')
+        suffix = f'.{extension}' if extension else ''
+        return f'{digest[:2]}/{digest[2:4]}/{digest}{suffix}'
+
+    def path(self, key):
+        if not KEY_PATTERN.match(key):
+            raise ValueError(f"Not a storage key: {key!r}")
+        return os.path.join(self.root, *key.split('/'))
+
+    def save(self, fileobj, extension=''):
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        # Written next to the shards, so the final rename stays on one filesystem
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            key = self.key_for(digest.hexdigest(), extension)
+            path = self.path(key)
+            if os.path.exists(path):
+                # Already stored: keep it safe from the cleanup grace period
+                os.utime(path)
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return key
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self, key):
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+
+    def stored(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                key = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, '/')
+                if KEY_PATTERN.match(key):
+                    yield key, os.path.getmtime(os.path.join(dirpath, filename))
+
+
+def from_config(config):
+    """The storage backend selected by UPLOAD_STORAGE"""
+    backend = config.get('UPLOAD_STORAGE', 'local')
+    if backend != 'local':
+        raise ValueError(f"Unknown UPLOAD_STORAGE '{backend}', expected local")
+    root = config['UPLOAD_FOLDER']
+    if not os.path.isabs(root):
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), root)
+    return LocalStorage(root)
+
+
+def extension_of(filename):
+    return filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+
+
+# --- Reference counts, on the caller's cursor and transaction ---
+
+def add_ref(cur, key):
+    if key:
+        cur.execute("""
+            INSERT INTO upload_files (storage_key, ref_count) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE ref_count = ref_count + 1
+        """, (key,))
+
+
+def release(cur, key):
+    if key:
+        cur.execute("UPDATE upload_files SET ref_count = GREATEST(ref_count - 1, 0) WHERE storage_key = %s",
+                    (key,))
+
+
+# --- Cleanup ---
+
+def referenced_keys(cur, keys):
+    """The subset of keys that still have a reference"""
+    referenced = set()
+    keys = list(keys)
+    for start in range(0, len(keys), 500):
+        batch = keys[start:start + 500]
+        cur.execute(f"""
+            SELECT storage_key FROM upload_files
+            WHERE storage_key IN ({','.join(['%s'] * len(batch))}) AND ref_count > 0
+        """, batch)
+        referenced.update(row[0] for row in cur.fetchall())
+    return referenced
+
+
+def cleanup(storage, connection, grace_seconds, dry_run=False):
+    """Delete stored files nothing references that are older than the grace period; returns (files, bytes)"""
+    cutoff = time.time() - grace_seconds
+    candidates = {key: mtime for key, mtime in storage.stored() if mtime < cutoff}
+    cur = connection.cursor()
+    try:
+        orphans = sorted(set(candidates) - referenced_keys(cur, candidates))
+        removed, freed = 0, 0
+        for key in orphans:
+            path = storage.path(key)
+            try:
+                # Uploaded again since the scan: a reference may be about to commit
+                if os.path.getmtime(path) >= cutoff:
+                    continue
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+            if not dry_run:
+                storage.delete(key)
+                cur.execute("DELETE FROM upload_files WHERE storage_key = %s AND ref_count = 0", (key,))
+                connection.commit()
+            removed += 1
+            freed += size
+        return removed, freed
+    finally:
+        cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Content-addressed upload storage maintenance')
+    parser.add_argument('command', choices=['cleanup'])
+    parser.add_argument('--grace-minutes', type=int, default=60,
+                        help='leave unreferenced files younger than this alone')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    import migrate
+    load_dotenv()
+
+    storage = from_config({'UPLOAD_STORAGE': os.getenv('UPLOAD_STORAGE', 'local'),
+                           'UPLOAD_FOLDER': os.getenv('UPLOAD_FOLDER', 'static/uploads')})
+    connection = migrate.get_connection()
+    try:
+        removed, freed = cleanup(storage, connection, args.grace_minutes * 60, args.dry_run)
+    finally:
+        connection.close()
+    verb = 'Would remove' if args.dry_run else 'Removed'
+    print(f"✅ {verb} {removed} orphaned uploads ({freed / 1024 / 1024:.1f} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
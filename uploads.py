@@ -0,0 +1,113 @@
+"""
+Upload Serving
+Payment and kill screenshots are served from /uploads/<name> to the people
+allowed to see them: admins, and the user whose transaction, withdrawal or
+gaming ID the file belongs to. Old /static/uploads/<name> links redirect
+there, so the static handler no longer hands them out to anyone.
+
+The bytes never pass through Python (UPLOAD_SEND_MODE):
+
+  sendfile   (default) gunicorn streams the file with the sendfile()
+             syscall through wsgi.file_wrapper
+  x-sendfile the worker only answers with an X-Sendfile header and the
+             front server (Apache mod_xsendfile, lighttpd) sends the file
+  x-accel    nginx: the worker answers with X-Accel-Redirect to
+             UPLOAD_ACCEL_PREFIX + name, an internal location aliased to
+             UPLOAD_FOLDER
+
+    location /protected-uploads/ {
+        internal;
+        alias /app/static/uploads/;
+    }
+
+In sendfile mode responses carry an ETag and Last-Modified and answer
+conditional and Range requests (304, 206); behind a front server that is
+left to the server. Upload names are unique, so the browser may keep a
+file for UPLOAD_MAX_AGE seconds, privately.
+"""
+
+import os
+from urllib.parse import quote
+
+from flask import abort, current_app, redirect, request, url_for
+from werkzeug.utils import safe_join, send_from_directory
+
+SEND_MODES = ('sendfile', 'x-sendfile', 'x-accel')
+
+
+def can_view(cur, filename, user_id):
+    """True if the upload belongs to one of the user's transactions, withdrawals or gaming IDs"""
+    cur.execute("""
+        SELECT 1 FROM transactions WHERE payment_screenshot = %s AND user_id = %s
+        UNION ALL
+        SELECT 1 FROM withdrawals WHERE payment_screenshot = %s AND user_id = %s
+        UNION ALL
+        SELECT 1 FROM gaming_id_room_stats s
+        JOIN user_gaming_ids g ON g.id = s.user_gaming_id
+        WHERE s.screenshot_proof = %s AND g.user_id = %s
+        LIMIT 1
+    """, (filename, user_id) * 3)
+    return cur.fetchone() is not None
+
+
+def upload_folder():
+    folder = current_app.config['UPLOAD_FOLDER']
+    return folder if os.path.isabs(folder) else os.path.join(current_app.root_path, folder)
+
+
+def _private(response):
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.max_age = current_app.config['UPLOAD_MAX_AGE']
+    return response
+
+
+def send_upload(filename):
+    """Response for an upload the current user may see, sent per UPLOAD_SEND_MODE"""
+    folder = upload_folder()
+    path = safe_join(folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    mode = current_app.config['UPLOAD_SEND_MODE']
+    if mode == 'x-accel':
+        response = current_app.response_class(status=200)
+        response.headers['X-Accel-Redirect'] = current_app.config['UPLOAD_ACCEL_PREFIX'] + quote(filename)
+        # nginx sets the type from the file name unless we leave it empty
+        del response.headers['Content-Type']
+        return _private(response)
+
+    response = send_from_directory(
+        folder, filename, request.environ,
+        use_x_sendfile=(mode == 'x-sendfile'),
+        response_class=current_app.response_class,
+        max_age=current_app.config['UPLOAD_MAX_AGE'],
+    )
+    return _private(response)
+
+
+def _redirect_static_uploads():
+    """Send /static/uploads/... through the access-checked /uploads/... route"""
+    if request.endpoint != 'static':
+        return None
+    prefix = current_app.config['UPLOAD_STATIC_PREFIX']
+    filename = (request.view_args or {}).get('filename', '')
+    if prefix and filename.startswith(prefix):
+        return redirect(url_for('uploaded_file', filename=filename[len(prefix):]), code=301)
+    return None
+
+
+def init_app(app):
+    """Check UPLOAD_SEND_MODE and stop the static handler from serving uploads"""
+    if app.config['UPLOAD_SEND_MODE'] not in SEND_MODES:
+        raise ValueError(f"Unknown UPLOAD_SEND_MODE '{app.config['UPLOAD_SEND_MODE']}', "
+                         f"expected one of {', '.join(SEND_MODES)}")
+
+    # Only relevant when the upload folder lives inside static/
+    folder = os.path.realpath(os.path.join(app.root_path, app.config['UPLOAD_FOLDER']))
+    static = os.path.realpath(app.static_folder)
+    prefix = ''
+    if os.path.commonpath([folder, static]) == static and folder != static:
+        prefix = os.path.relpath(folder, static).replace(os.sep, '/') + '/'
+    app.config['UPLOAD_STATIC_PREFIX'] = prefix
+    app.before_request(_redirect_static_uploads)
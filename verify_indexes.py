@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Index Verification
+Replays the hot route queries from app.py with EXPLAIN and checks that each
+one reads its main table through the expected index without a full scan or
+filesort. Run it after `python migrate.py up`, on a database with
+realistic volume (the optimizer happily scans tiny tables):
+
+    python generate_dataset.py --scale medium
+    python verify_indexes.py --analyze
+    python verify_indexes.py --json plans.json
+
+Exits with status 1 when any query misses its index.
+"""
+
+import argparse
+import json
+import os
+
+from dotenv import load_dotenv
+import MySQLdb
+
+load_dotenv()
+
+# name, route, main table alias, expected index, SQL; 'allow_filesort' documents
+# the queries where a sort is inherent and cheap
+ROUTE_QUERIES = [
+    {
+        'name': 'open rooms', 'route': 'home', 'table': 'r', 'index': 'idx_rooms_status_created',
+        'sql': """
+            SELECT r.id, r.room_name, r.entry_fee, r.prize_pool, r.max_players, r.game_type, r.status
+            FROM rooms r
+            WHERE r.status = 'open'
+            ORDER BY r.created_at DESC
+        """,
+    },
+    {
+        'name': 'room seats taken', 'route': 'room_details', 'table': 'room_user_enrollments',
+        'index': 'idx_room_user_enrollments_room_payment',
+        'sql': """
+            SELECT COALESCE(SUM(gaming_ids_count), 0) as total_players
+            FROM room_user_enrollments
+            WHERE room_id = %(room_id)s AND payment_status = 'paid' AND is_active = TRUE
+        """,
+    },
+    {
+        'name': 'player active gaming IDs', 'route': 'join_room_with_gaming_ids', 'table': 'user_gaming_ids',
+        'index': 'idx_user_gaming_ids_user_active',
+        'sql': """
+            SELECT id, gaming_platform, gaming_username, display_name, is_primary
+            FROM user_gaming_ids
+            WHERE user_id = %(user_id)s AND is_active = TRUE
+            ORDER BY is_primary DESC, gaming_platform, display_name
+        """,
+    },
+    {
+        'name': 'pending withdrawals', 'route': 'admin_dashboard', 'table': 'w',
+        'index': 'idx_withdrawals_status_requested',
+        'sql': """
+            SELECT w.id, u.username, w.amount, w.gpay_number, w.status, w.requested_at
+            FROM withdrawals w
+            JOIN users u ON w.user_id = u.id
+            WHERE w.status = 'pending'
+            ORDER BY w.requested_at DESC
+        """,
+    },
+    {
+        'name': 'processed withdrawals', 'route': 'admin_dashboard', 'table': 'w',
+        'index': 'idx_withdrawals_processed',
+        'sql': """
+            SELECT w.id, u.username, w.amount, w.gpay_number, w.status, w.requested_at, w.processed_at
+            FROM withdrawals w
+            JOIN users u ON w.user_id = u.id
+            WHERE w.status IN ('approved', 'rejected')
+            ORDER BY w.processed_at DESC
+            LIMIT 10
+        """,
+    },
+    {
+        'name': 'withdrawal totals', 'route': 'admin_dashboard', 'table': 'withdrawals',
+        'index': 'idx_withdrawals_status_requested',
+        'sql': """
+            SELECT COUNT(*), COALESCE(SUM(amount), 0),
+                   COUNT(CASE WHEN status = 'pending' THEN 1 END),
+                   COALESCE(SUM(CASE WHEN status = 'pending' THEN amount END), 0)
+            FROM withdrawals
+        """,
+    },
+    {
+        'name': 'team entry fees collected', 'route': 'admin_dashboard', 'table': 'room_team_enrollments',
+        'index': 'idx_room_team_enrollments_payment',
+        'sql': """
+            SELECT COALESCE(SUM(total_entry_fee), 0) as total_collected
+            FROM room_team_enrollments
+            WHERE payment_status = 'paid'
+        """,
+    },
+    {
+        'name': 'transaction totals', 'route': 'admin_dashboard', 'table': 'transactions',
+        'index': 'idx_transactions_type_status_created',
+        'sql': """
+            SELECT COUNT(CASE WHEN type = 'credit' THEN 1 END),
+                   COALESCE(SUM(CASE WHEN type = 'credit' THEN amount END), 0),
+                   COUNT(CASE WHEN type = 'debit' THEN 1 END),
+                   COALESCE(SUM(CASE WHEN type = 'debit' THEN amount END), 0)
+            FROM transactions
+        """,
+    },
+    {
+        'name': 'pending payment requests', 'route': 'admin_dashboard', 'table': 't',
+        'index': 'idx_transactions_type_status_created',
+        'sql': """
+            SELECT t.id, u.username, t.amount, t.payment_screenshot, t.created_at
+            FROM transactions t
+            JOIN users u ON t.user_id = u.id
+            WHERE t.type = 'credit_pending' AND t.status = 'pending'
+            ORDER BY t.created_at DESC
+        """,
+    },
+    {
+        'name': 'player withdrawals', 'route': 'profile', 'table': 'w',
+        'index': 'idx_withdrawals_user_requested',
+        'sql': """
+            SELECT w.id, w.amount, w.gpay_number, w.status, w.requested_at, w.payment_screenshot
+            FROM withdrawals w
+            WHERE w.user_id = %(user_id)s
+            ORDER BY w.requested_at DESC
+        """,
+    },
+    {
+        'name': 'room kill leaderboard', 'route': 'manage_kills', 'table': 'gaming_id_room_stats',
+        'index': 'idx_gaming_id_room_stats_room_kills',
+        'sql': """
+            SELECT user_gaming_id, kills_count
+            FROM gaming_id_room_stats
+            WHERE room_id = %(room_id)s
+            ORDER BY kills_count DESC
+        """,
+    },
+    {
+        'name': 'room winner history', 'route': 'winner_history', 'table': 'wsh',
+        'index': 'idx_winner_history_room_time',
+        'sql': """
+            SELECT wsh.action_type, wsh.position, wsh.reward_amount, wsh.action_timestamp,
+                   wsh.details, u.username as admin_username
+            FROM winner_selection_history wsh
+            JOIN users u ON wsh.admin_user_id = u.id
+            WHERE wsh.room_id = %(room_id)s
+            ORDER BY wsh.action_timestamp DESC
+        """,
+    },
+    {
+        'name': 'room players by kills', 'route': 'room_winner_selection', 'table': 'rue',
+        'index': None,
+        'allow_filesort': 'ordered by a LEFT JOIN expression; sorts one room of players',
+        'sql': """
+            SELECT rue.user_id, u.username, ugi.gaming_username, COALESCE(girs.kills_count, 0) as kills_count
+            FROM room_user_enrollments rue
+            JOIN users u ON rue.user_id = u.id
+            JOIN room_gaming_ids rgi ON rue.id = rgi.room_user_enrollment_id
+            JOIN user_gaming_ids ugi ON rgi.user_gaming_id = ugi.id
+            LEFT JOIN gaming_id_room_stats girs ON girs.user_gaming_id = ugi.id AND girs.room_id = %(room_id)s
+            WHERE rue.room_id = %(room_id)s AND rue.payment_status = 'paid'
+            ORDER BY COALESCE(girs.kills_count, 0) DESC, u.username
+        """,
+    },
+]
+
+
+def get_connection():
+    return MySQLdb.connect(
+        host=os.getenv('MYSQL_HOST', 'localhost'),
+        user=os.getenv('MYSQL_USER', 'root'),
+        passwd=os.getenv('MYSQL_PASSWORD', '1111'),
+        db=os.getenv('MYSQL_DB', 'gaming_platform')
+    )
+
+
+def sample_params(cur):
+    """Busiest room and the player with most gaming IDs, so plans reflect real fan-out"""
+    cur.execute("""
+        SELECT room_id FROM room_user_enrollments
+        GROUP BY room_id ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    room = cur.fetchone()
+    cur.execute("""
+        SELECT user_id FROM user_gaming_ids
+        GROUP BY user_id ORDER BY COUNT(*) DESC LIMIT 1
+    """)
+    user = cur.fetchone()
+    return {'room_id': room[0] if room else 1, 'user_id': user[0] if user else 1}
+
+
+def explain(cur, sql, params):
+    cur.execute('EXPLAIN ' + sql, params)
+    columns = [col[0] for col in cur.description]
+    return [dict(zip(columns, row)) for row in cur.fetchall()]
+
+
+def check_plan(spec, plan):
+    """Return a list of problems with one query's plan"""
+    problems = []
+    main = next((row for row in plan if row.get('table') == spec['table']), None)
+    if main is None:
+        return [f"table '{spec['table']}' not in plan"]
+
+    if main.get('type') == 'ALL':
+        problems.append(f"full scan of {spec['table']} (~{main.get('rows')} rows)")
+    if spec.get('index') and main.get('key') != spec['index']:
+        problems.append(f"uses {main.get('key') or 'no index'}, expected {spec['index']}")
+    if not spec.get('allow_filesort'):
+        for row in plan:
+            if 'Using filesort' in (row.get('Extra') or ''):
+                problems.append(f"filesort on {row.get('table')}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='EXPLAIN the route queries and check their indexes')
+    parser.add_argument('--analyze', action='store_true', help='refresh table statistics first')
+    parser.add_argument('--json', help='write plans and results to this file')
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cur = conn.cursor()
+    try:
+        if args.analyze:
+            tables = sorted({'rooms', 'room_user_enrollments', 'room_team_enrollments', 'user_gaming_ids',
+                             'withdrawals', 'transactions', 'gaming_id_room_stats', 'winner_selection_history'})
+            print(f"📈 Analyzing {len(tables)} tables...")
+            cur.execute(f"ANALYZE TABLE {', '.join(tables)}")
+            cur.fetchall()
+
+        params = sample_params(cur)
+        print(f"🔍 Checking {len(ROUTE_QUERIES)} route queries (room {params['room_id']}, user {params['user_id']})\n")
+
+        results = []
+        for spec in ROUTE_QUERIES:
+            try:
+                plan = explain(cur, spec['sql'], params)
+                problems = check_plan(spec, plan)
+            except MySQLdb.Error as e:
+                plan, problems = [], [f"EXPLAIN failed: {e}"]
+
+            results.append({'name': spec['name'], 'route': spec['route'], 'problems': problems, 'plan': plan})
+            main_row = next((row for row in plan if row.get('table') == spec['table']), {})
+            status = '✅' if not problems else '❌'
+            print(f"  {status} {spec['route']:<26} {spec['name']:<28} key={main_row.get('key')} "
+                  f"type={main_row.get('type')} rows={main_row.get('rows')}")
+            for problem in problems:
+                print(f"       - {problem}")
+            if spec.get('allow_filesort') and not problems:
+                print(f"       (filesort allowed: {spec['allow_filesort']})")
+    finally:
+        cur.close()
+        conn.close()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"\n💾 Plans written to {args.json}")
+
+    failed = [r for r in results if r['problems']]
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(results)} queries do not use their index cleanly")
+        raise SystemExit(1)
+    print(f"\n✅ All {len(results)} queries use their indexes without filesort")
+
+
+if __name__ == '__main__':
+    main()